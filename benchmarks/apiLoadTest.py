@@ -0,0 +1,144 @@
+import argparse
+import asyncio
+import os
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit, urlencode
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from searchBenchmark import createDatabase, populate
+
+SEARCHES = [("last_name", "Santos"), ("first_name", "Maria"), ("program_code", "BSCS"), ("college_code", "CCS"), ("year_level", "2"), (None, "")]
+SORT_OPTIONS = [("id_number", "last_name"), ("last_name", "first_name"), ("program_code", "last_name")]
+
+def parseArgs():
+  parser = argparse.ArgumentParser(description="p50/p99 latency of paginated student searches through the HTTP API under many concurrent clients.")
+  parser.add_argument("--url", help="API to load, e.g. http://127.0.0.1:8080 (default: start one in-process on the scratch database)")
+  parser.add_argument("--students", type=int, default=100_000, help="number of synthetic students to load")
+  parser.add_argument("--database", default="lexis_benchmark", help="scratch database to create and fill (never the app database)")
+  parser.add_argument("--clients", type=int, default=500, help="concurrent keep-alive clients")
+  parser.add_argument("--requests", type=int, default=20, help="requests per client")
+  parser.add_argument("--per-page", type=int, default=50, help="rows per requested page")
+  parser.add_argument("--max-page", type=int, default=20, help="request pages 1..N")
+  parser.add_argument("--workers", type=int, help="API worker threads for the in-process server (default: DB_POOL_MAX_SIZE)")
+  parser.add_argument("--port", type=int, default=8099, help="port for the in-process server")
+  parser.add_argument("--gzip", action="store_true", help="send Accept-Encoding: gzip")
+  parser.add_argument("--skip-populate", action="store_true", help="reuse the students already in the scratch database")
+  return parser.parse_args()
+
+def startServer(port, workers):
+  from server import ApiServer, API_WORKERS
+
+  server = ApiServer(workers or API_WORKERS)
+  thread = threading.Thread(target=lambda: asyncio.run(server.serve("127.0.0.1", port)), daemon=True)
+  thread.start()
+
+  return server
+
+async def waitForServer(host, port, timeout=10):
+  deadline = time.perf_counter() + timeout
+  while True:
+    try:
+      _, writer = await asyncio.open_connection(host, port)
+      writer.close()
+      return
+    except OSError:
+      if time.perf_counter() > deadline:
+        raise
+      await asyncio.sleep(0.1)
+
+async def fetch(reader, writer, host, path, acceptGzip):
+  request = f"GET {path} HTTP/1.1\r\nHost: {host}\r\n"
+  if acceptGzip:
+    request += "Accept-Encoding: gzip\r\n"
+  writer.write((request + "\r\n").encode("latin-1"))
+  await writer.drain()
+
+  head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+  status = int(head.split(" ", 2)[1])
+  contentLength = 0
+  for line in head.split("\r\n")[1:]:
+    if line.lower().startswith("content-length:"):
+      contentLength = int(line.split(":", 1)[1])
+
+  await reader.readexactly(contentLength)
+  return status
+
+async def runClient(clientId, host, port, args, latencies, errors):
+  rng = random.Random(clientId)
+  reader, writer = await asyncio.open_connection(host, port)
+
+  try:
+    for _ in range(args.requests):
+      searchField, searchTerm = rng.choice(SEARCHES)
+      sortBy1, sortBy2 = rng.choice(SORT_OPTIONS)
+      query = {"page": rng.randint(1, args.max_page), "perPage": args.per_page, "sortBy1": sortBy1, "sortBy2": sortBy2, "sortOrder": rng.choice(["ASC", "DESC"])}
+      if searchField:
+        query.update({"searchField": searchField, "search": searchTerm})
+
+      start = time.perf_counter()
+      status = await fetch(reader, writer, host, f"/students?{urlencode(query)}", args.gzip)
+      latencies.append(time.perf_counter() - start)
+
+      if status != 200:
+        errors.append(status)
+
+  finally:
+    writer.close()
+
+def percentile(sortedValues, fraction):
+  return sortedValues[min(len(sortedValues) - 1, int(len(sortedValues) * fraction))]
+
+async def runLoad(host, port, args):
+  await waitForServer(host, port)
+
+  latencies = []
+  errors = []
+  start = time.perf_counter()
+  results = await asyncio.gather(*[runClient(clientId, host, port, args, latencies, errors) for clientId in range(args.clients)], return_exceptions=True)
+  elapsed = time.perf_counter() - start
+
+  failedClients = [result for result in results if isinstance(result, Exception)]
+  latencies.sort()
+
+  print(f"\n{args.clients} clients x {args.requests} requests, {args.per_page} rows per page")
+  print(f"{len(latencies):,} responses in {elapsed:.2f}s ({len(latencies) / elapsed:,.0f} req/s)")
+  if latencies:
+    print(f"p50 {percentile(latencies, 0.50) * 1000:.1f} ms   p90 {percentile(latencies, 0.90) * 1000:.1f} ms   p99 {percentile(latencies, 0.99) * 1000:.1f} ms   max {latencies[-1] * 1000:.1f} ms")
+  if errors:
+    print(f"{len(errors):,} non-200 responses")
+  if failedClients:
+    print(f"{len(failedClients):,} clients dropped, first error: {failedClients[0]!r}")
+
+def main():
+  args = parseArgs()
+  server = None
+
+  if args.url:
+    url = urlsplit(args.url)
+    host, port = url.hostname, url.port or 80
+  else:
+    os.environ["DB_NAME"] = args.database
+    createDatabase(args.database)
+
+    from database.db import initDatabase
+    initDatabase()
+
+    if not args.skip_populate:
+      populate(args.students)
+
+    host, port = "127.0.0.1", args.port
+    server = startServer(port, args.workers)
+
+  try:
+    asyncio.run(runLoad(host, port, args))
+  finally:
+    if server:
+      server.close()
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,123 @@
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+# Repeated pages would otherwise be served from the page cache instead of the database being measured
+os.environ.setdefault("DB_PAGE_CACHE_MB", "0")
+
+from searchBenchmark import createDatabase, populate, PROGRAMS
+
+def parseArgs():
+  parser = argparse.ArgumentParser(description="Per-query latency of the MySQL and SQLite backends on the same generated students.")
+  parser.add_argument("--students", type=int, default=100_000, help="number of synthetic students to load into each engine")
+  parser.add_argument("--database", default="lexis_benchmark", help="scratch database (and SQLite file name) to create and fill, never the app database")
+  parser.add_argument("--repeat", type=int, default=200, help="timed runs per query")
+  parser.add_argument("--max-page", type=int, default=20, help="OFFSET pages are drawn from 1..N")
+  parser.add_argument("--backends", default="mysql,sqlite", help="comma separated DB_BACKEND engines to compare")
+  parser.add_argument("--skip-populate", action="store_true", help="reuse the students already in the scratch databases")
+  return parser.parse_args()
+
+# (name, function taking a random generator); each reads or writes through the model the way the app does
+def buildQueries(args):
+  from database.queryCache import countCache
+  from model.Student import Student
+
+  def idNumber(rng):
+    i = rng.randrange(args.students)
+    return f"{1950 + i // 10000}-{i % 10000:04d}"
+
+  def keysetPage(rng):
+    first, _ = Student.getStudentRecords(page=1, perPage=50, sortBy1="last_name", sortBy2="first_name")
+    last = first[-1]
+    return Student.getStudentRecords(perPage=50, sortBy1="last_name", sortBy2="first_name", seekCursor=(last["last_name"], last["first_name"], last["id_number"]))
+
+  def searchCount(rng):
+    countCache.clear()
+    return Student.countStudentRecords("program_code", rng.choice(PROGRAMS)[0])
+
+  return [
+    ("point lookup", lambda rng: Student.getStudentRecord(idNumber(rng))),
+    ("page by id", lambda rng: Student.getStudentRecords(page=rng.randint(1, args.max_page), perPage=50)),
+    ("page by last name", lambda rng: Student.getStudentRecords(page=rng.randint(1, args.max_page), perPage=50, sortBy1="last_name", sortBy2="first_name", sortOrder=rng.choice(["ASC", "DESC"]))),
+    ("page by college", lambda rng: Student.getStudentRecords(page=rng.randint(1, args.max_page), perPage=50, sortBy1="college_code", sortBy2="last_name")),
+    ("keyset next page", keysetPage),
+    ("search program", lambda rng: Student.getStudentRecords(perPage=50, searchField="program_code", searchTerm=rng.choice(PROGRAMS)[0])),
+    ("search any", lambda rng: Student.getStudentRecords(perPage=50, searchTerm=rng.choice(["Maria Santos", "Nasayao", "BSCS Cruz"]))),
+    ("count search", searchCount),
+    ("update by id", lambda rng: Student.updateStudentRecordById(idNumber(rng), {"year_level": rng.randint(1, 5)})),
+  ]
+
+def timeQueries(args):
+  results = {}
+
+  for name, query in buildQueries(args):
+    rng = random.Random(name)
+
+    # Warms the pool, the statement caches and the engine's own page cache before the clock starts
+    for _ in range(min(20, args.repeat)):
+      query(rng)
+
+    timings = []
+    for _ in range(args.repeat):
+      start = time.perf_counter()
+      query(rng)
+      timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    results[name] = (timings[len(timings) // 2], timings[min(len(timings) - 1, int(len(timings) * 0.99))])
+
+  return results
+
+def prepareBackend(name, args):
+  from database.db import setBackend, initDatabase
+  from model.Student import Student
+
+  setBackend(name)
+
+  # Which indexes and columns exist is remembered per process, and differs between the engines
+  Student.hasSearchIndex = None
+  Student.hasCollegeColumn = None
+
+  createDatabase(args.database)
+  initDatabase()
+
+  if not args.skip_populate:
+    populate(args.students)
+
+def main():
+  args = parseArgs()
+  os.environ["DB_NAME"] = args.database
+
+  from database.db import closePool
+
+  results = {}
+  for backend in [name.strip() for name in args.backends.split(",") if name.strip()]:
+    print(f"\n== {backend} ==")
+
+    try:
+      prepareBackend(backend, args)
+    except Exception as e:
+      print(f"{backend} skipped, could not prepare the scratch database: {e}")
+      continue
+
+    results[backend] = timeQueries(args)
+    closePool()
+
+  if not results:
+    return
+
+  backends = list(results)
+  print(f"\n{'query':<20}" + "".join(f" {backend + ' p50':>12} {backend + ' p99':>12}" for backend in backends) + " (ms)")
+
+  for name in results[backends[0]]:
+    print(f"{name:<20}" + "".join(f" {results[backend][name][0]:>12.2f} {results[backend][name][1]:>12.2f}" for backend in backends))
+
+  print("\nThe \"search any\" row uses the n-gram FULLTEXT index on MySQL and LIKE on SQLite.")
+
+if __name__ == "__main__":
+  main()
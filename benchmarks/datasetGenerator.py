@@ -0,0 +1,221 @@
+import argparse
+import csv
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+# Colleges and programs of a mid-sized university, each program weighted by how many students it enrolls
+COLLEGES = [
+  ("CCS", "College of Computer Studies"),
+  ("COE", "College of Engineering"),
+  ("CSM", "College of Science and Mathematics"),
+  ("CASS", "College of Arts and Social Sciences"),
+  ("CBAA", "College of Business Administration and Accountancy"),
+  ("CED", "College of Education"),
+  ("CON", "College of Nursing"),
+  ("CHS", "College of Health Sciences"),
+]
+
+PROGRAMS = [
+  ("BSCS", "Bachelor of Science in Computer Science", "CCS", 9),
+  ("BSIT", "Bachelor of Science in Information Technology", "CCS", 11),
+  ("BSIS", "Bachelor of Science in Information Systems", "CCS", 4),
+  ("BSCA", "Bachelor of Science in Computer Applications", "CCS", 2),
+  ("BSCE", "Bachelor of Science in Civil Engineering", "COE", 8),
+  ("BSEE", "Bachelor of Science in Electrical Engineering", "COE", 5),
+  ("BSME", "Bachelor of Science in Mechanical Engineering", "COE", 5),
+  ("BSECE", "Bachelor of Science in Electronics Engineering", "COE", 4),
+  ("BSChE", "Bachelor of Science in Chemical Engineering", "COE", 3),
+  ("BSCerE", "Bachelor of Science in Ceramics Engineering", "COE", 1),
+  ("BSBio", "Bachelor of Science in Biology", "CSM", 5),
+  ("BSChem", "Bachelor of Science in Chemistry", "CSM", 2),
+  ("BSMath", "Bachelor of Science in Mathematics", "CSM", 2),
+  ("BSPhys", "Bachelor of Science in Physics", "CSM", 1),
+  ("BSStat", "Bachelor of Science in Statistics", "CSM", 1),
+  ("BAPsych", "Bachelor of Arts in Psychology", "CASS", 6),
+  ("BAEng", "Bachelor of Arts in English", "CASS", 2),
+  ("BAHist", "Bachelor of Arts in History", "CASS", 1),
+  ("BAPolSci", "Bachelor of Arts in Political Science", "CASS", 3),
+  ("BSAc", "Bachelor of Science in Accountancy", "CBAA", 7),
+  ("BSBA-MM", "Bachelor of Science in Business Administration major in Marketing Management", "CBAA", 6),
+  ("BSBA-FM", "Bachelor of Science in Business Administration major in Financial Management", "CBAA", 5),
+  ("BSHM", "Bachelor of Science in Hospitality Management", "CBAA", 4),
+  ("BEEd", "Bachelor of Elementary Education", "CED", 5),
+  ("BSEd-Math", "Bachelor of Secondary Education major in Mathematics", "CED", 3),
+  ("BSEd-Sci", "Bachelor of Secondary Education major in Science", "CED", 3),
+  ("BPEd", "Bachelor of Physical Education", "CED", 2),
+  ("BSN", "Bachelor of Science in Nursing", "CON", 9),
+  ("BSMT", "Bachelor of Science in Medical Technology", "CHS", 4),
+  ("BSPharm", "Bachelor of Science in Pharmacy", "CHS", 3),
+]
+
+# (name, weight); a few surnames and given names are far more common than the rest, as in a real registry
+FIRST_NAMES = [
+  ("Maria", 30), ("John", 18), ("Mark", 16), ("Jose", 15), ("Angel", 14), ("Juan", 12), ("Ana", 12), ("Christian", 11),
+  ("Angelica", 10), ("Michael", 10), ("Nicole", 9), ("Joshua", 9), ("Kimberly", 8), ("Gabriel", 8), ("Andrea", 8),
+  ("Paolo", 7), ("Camille", 7), ("Carlo", 7), ("Patricia", 6), ("Miguel", 6), ("Sofia", 6), ("Rafael", 6), ("Bea", 5),
+  ("Luis", 5), ("Kristine", 5), ("Jerome", 5), ("Princess", 4), ("Kenneth", 4), ("Janine", 4), ("Ramon", 3),
+  ("Trisha", 3), ("Adrian", 3), ("Czarina", 2), ("Ysabel", 2), ("Renz", 2), ("Xyra", 1), ("Quennie", 1),
+]
+
+LAST_NAMES = [
+  ("Santos", 30), ("Reyes", 26), ("Cruz", 24), ("Bautista", 18), ("Garcia", 18), ("Mendoza", 15), ("Torres", 13),
+  ("Flores", 13), ("Villanueva", 12), ("Ramos", 12), ("Gonzales", 11), ("Aquino", 10), ("Castillo", 10),
+  ("Navarro", 9), ("Dela Cruz", 9), ("Lopez", 9), ("Domingo", 8), ("Salazar", 7), ("Morales", 7), ("Fernandez", 7),
+  ("Del Rosario", 6), ("Pascual", 6), ("Mercado", 6), ("Aguilar", 5), ("Cabrera", 5), ("Dizon", 5), ("Manalo", 4),
+  ("Nasayao", 3), ("Villareal", 3), ("Macaraeg", 2), ("Pangilinan", 2), ("Dimaculangan", 1), ("Ybañez", 1),
+]
+
+GENDERS = [("Female", 50), ("Male", 48), ("Other", 2)]
+
+# First years outnumber fourth years after attrition, and few students reach a fifth year
+YEAR_LEVEL_WEIGHTS = [30, 25, 21, 19, 5]
+
+# id_number is YYYY-NNNN: the year the student enrolled and a 4-digit sequence within that year
+MAX_PER_COHORT = 9999
+
+def parseArgs():
+  parser = argparse.ArgumentParser(description="Generates realistic colleges, programs and students into a scratch database or CSV files.")
+  parser.add_argument("--students", type=int, default=100_000, help="number of students to generate")
+  parser.add_argument("--seed", type=int, default=2024, help="random seed; the same seed and count give the same dataset")
+  parser.add_argument("--base-year", type=int, default=2025, help="enrollment year of the first years")
+  parser.add_argument("--database", default="lexis_benchmark", help="scratch database to create and fill (never the app database)")
+  parser.add_argument("--csv", metavar="DIR", help="write colleges.csv, programs.csv and students.csv for the importer instead")
+  return parser.parse_args()
+
+def weightedChooser(rng, weighted):
+  values = [value for value, _ in weighted]
+  weights = [weight for _, weight in weighted]
+  return lambda count: rng.choices(values, weights, k=count)
+
+# Yields (id_number, first_name, last_name, year_level, gender, program_code) rows in batches of batchSize
+# A student's id year is the year they enrolled (base year minus their year level, plus one); a cohort that runs out
+# of 4-digit sequence numbers spills into the same year level five years earlier, so any count gets unique, valid ids
+def generateStudents(count, seed=2024, baseYear=2025, batchSize=5000):
+  rng = random.Random(seed)
+  firstNames = weightedChooser(rng, FIRST_NAMES)
+  lastNames = weightedChooser(rng, LAST_NAMES)
+  genders = weightedChooser(rng, GENDERS)
+  programs = weightedChooser(rng, [(code, weight) for code, _, _, weight in PROGRAMS])
+  yearLevels = weightedChooser(rng, list(zip(range(1, 6), YEAR_LEVEL_WEIGHTS)))
+
+  nextSequence = {}
+  generated = 0
+
+  while generated < count:
+    size = min(batchSize, count - generated)
+    batch = []
+
+    for firstName, lastName, gender, programCode, yearLevel in zip(firstNames(size), lastNames(size), genders(size), programs(size), yearLevels(size)):
+      cohort = baseYear - yearLevel + 1
+      while nextSequence.get(cohort, 1) > MAX_PER_COHORT:
+        cohort -= 5
+
+      sequence = nextSequence.get(cohort, 1)
+      nextSequence[cohort] = sequence + 1
+
+      # One in ten students carries a second given name
+      if rng.random() < 0.1:
+        firstName = f"{firstName} {rng.choice(FIRST_NAMES)[0]}"
+
+      batch.append((f"{cohort:04d}-{sequence:04d}", firstName, lastName, yearLevel, gender, programCode))
+
+    generated += size
+    yield batch
+
+# Replaces the colleges, programs and students of the connected database with a generated dataset
+# Returns the generated id numbers, for benchmarks that need real keys to update or delete
+def loadDataset(count, seed=2024, baseYear=2025, quiet=False):
+  from database.db import getConnection, getBackend
+  from database.queryCache import invalidateTable
+
+  conn = getConnection()
+  cursor = conn.cursor()
+
+  cursor.execute("DELETE FROM students")
+  cursor.execute("DELETE FROM programs")
+  cursor.execute("DELETE FROM colleges")
+  cursor.executemany("INSERT INTO colleges (college_code, college_name) VALUES (%s, %s)", COLLEGES)
+  cursor.executemany("INSERT INTO programs (program_code, program_name, college_code) VALUES (%s, %s, %s)", [(code, name, college) for code, name, college, _ in PROGRAMS])
+
+  idNumbers = []
+  start = time.perf_counter()
+
+  for batch in generateStudents(count, seed, baseYear):
+    conn.start_transaction()
+    cursor.executemany("""
+      INSERT INTO students (id_number, first_name, last_name, year_level, gender, program_code)
+      VALUES (%s, %s, %s, %s, %s, %s)
+    """, batch)
+    conn.commit()
+
+    idNumbers.extend(row[0] for row in batch)
+    if not quiet:
+      print(f"\rInserted {len(idNumbers):,} / {count:,} students", end="", flush=True)
+
+  # MySQL keeps its index statistics current by itself; SQLite plans from whatever ANALYZE last recorded
+  if getBackend().name == "sqlite":
+    cursor.execute("ANALYZE")
+
+  cursor.close()
+  conn.close()
+
+  for table in ("colleges", "programs", "students"):
+    invalidateTable(table)
+
+  if not quiet:
+    print(f"\nLoaded {count:,} students in {time.perf_counter() - start:.1f}s")
+
+  return idNumbers
+
+# Writes the dataset as the CSV files the importer reads, with the same headers the exports use
+def writeCsv(directory, count, seed=2024, baseYear=2025):
+  from model.Student import Student
+  from model.Program import Program
+  from model.College import College
+
+  directory = Path(directory)
+  directory.mkdir(parents=True, exist_ok=True)
+
+  with open(directory / "colleges.csv", "w", newline="", encoding="utf-8") as file:
+    writer = csv.writer(file)
+    writer.writerow(College.COLLEGE_HEADERS)
+    writer.writerows(COLLEGES)
+
+  with open(directory / "programs.csv", "w", newline="", encoding="utf-8") as file:
+    writer = csv.writer(file)
+    writer.writerow(Program.PROGRAM_HEADERS)
+    writer.writerows((code, name, college) for code, name, college, _ in PROGRAMS)
+
+  programColleges = {code: college for code, _, college, _ in PROGRAMS}
+
+  with open(directory / "students.csv", "w", newline="", encoding="utf-8") as file:
+    writer = csv.writer(file)
+    writer.writerow(Student.STUDENT_HEADERS)
+    for batch in generateStudents(count, seed, baseYear):
+      writer.writerows(row + (programColleges[row[5]],) for row in batch)
+
+  print(f"Wrote {len(COLLEGES)} colleges, {len(PROGRAMS)} programs and {count:,} students to {directory}")
+
+def main():
+  args = parseArgs()
+
+  if args.csv:
+    writeCsv(args.csv, args.students, args.seed, args.base_year)
+    return
+
+  os.environ["DB_NAME"] = args.database
+
+  from searchBenchmark import createDatabase
+  from database.db import initDatabase
+
+  createDatabase(args.database)
+  initDatabase()
+  loadDataset(args.students, args.seed, args.base_year)
+
+if __name__ == "__main__":
+  main()
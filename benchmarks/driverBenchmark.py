@@ -0,0 +1,102 @@
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+# Repeated pages would otherwise be served from the page cache instead of the database being measured
+os.environ.setdefault("DB_PAGE_CACHE_MB", "0")
+
+from searchBenchmark import createDatabase, populate
+
+SORT_OPTIONS = [("id_number", "last_name"), ("last_name", "first_name"), ("program_code", "last_name"), ("college_code", "last_name")]
+
+def parseArgs():
+  parser = argparse.ArgumentParser(description="Rows per second through the pure Python driver, the C extension and raw C extension rows.")
+  parser.add_argument("--students", type=int, default=100_000, help="number of synthetic students to load")
+  parser.add_argument("--database", default="lexis_benchmark", help="scratch database to create and fill (never the app database)")
+  parser.add_argument("--fetches", type=int, default=2_000, help="getStudentRecords page fetches per mode")
+  parser.add_argument("--per-page", type=int, default=50, help="rows per fetched page")
+  parser.add_argument("--max-page", type=int, default=20, help="fetch pages 1..N")
+  parser.add_argument("--scans", type=int, default=3, help="full-table scans per mode, the best one is reported")
+  parser.add_argument("--modes", default="pure,cext,raw", help="comma separated DB_DRIVER modes to compare")
+  parser.add_argument("--skip-populate", action="store_true", help="reuse the students already in the scratch database")
+  return parser.parse_args()
+
+def timePages(fetches, perPage, maxPage):
+  from model.Student import Student
+
+  random.seed(7)
+  plan = [(random.choice(SORT_OPTIONS), random.randint(1, maxPage), random.choice(["ASC", "DESC"])) for _ in range(fetches)]
+
+  # Warms the pool, the count cache and the prepared statements before the clock starts
+  for (sortBy1, sortBy2), page, sortOrder in plan[:20]:
+    Student.getStudentRecords(page=page, perPage=perPage, sortBy1=sortBy1, sortBy2=sortBy2, sortOrder=sortOrder)
+
+  rows = 0
+  start = time.perf_counter()
+
+  for (sortBy1, sortBy2), page, sortOrder in plan:
+    rows += len(Student.getStudentRecords(page=page, perPage=perPage, sortBy1=sortBy1, sortBy2=sortBy2, sortOrder=sortOrder))
+
+  return rows, time.perf_counter() - start
+
+# The same streamed SELECT a CSV export of every student runs
+def timeScan(scans):
+  from model.Student import Student
+
+  best = None
+  for _ in range(scans):
+    rows = 0
+    start = time.perf_counter()
+
+    for batch in Student.iterStudentRecords(batchSize=5000, textOnly=True):
+      rows += len(batch)
+
+    elapsed = time.perf_counter() - start
+    if best is None or elapsed < best[1]:
+      best = (rows, elapsed)
+
+  return best
+
+def main():
+  args = parseArgs()
+  os.environ["DB_NAME"] = args.database
+
+  createDatabase(args.database)
+
+  import mysql.connector
+  from database.db import initDatabase, setDriverMode
+
+  initDatabase()
+
+  if not args.skip_populate:
+    populate(args.students)
+
+  print(f"\nC extension installed: {'yes' if mysql.connector.HAVE_CEXT else 'no'}")
+  print(f"\n{'mode':<6} {'page rows/s':>12} {'scan rows/s':>12} {'scan s':>8}")
+
+  results = {}
+  for requested in [mode.strip() for mode in args.modes.split(",") if mode.strip()]:
+    mode = setDriverMode(requested)
+    if mode != requested:
+      print(f"{requested:<6} skipped, the driver resolved to {mode}")
+      continue
+
+    pageRows, pageSeconds = timePages(args.fetches, args.per_page, args.max_page)
+    scanRows, scanSeconds = timeScan(args.scans)
+    results[mode] = (pageRows / pageSeconds, scanRows / scanSeconds)
+
+    print(f"{mode:<6} {results[mode][0]:>12,.0f} {results[mode][1]:>12,.0f} {scanSeconds:>8.2f}")
+
+  if "pure" in results:
+    for mode, (pageRate, scanRate) in results.items():
+      if mode != "pure":
+        print(f"\n{mode} is {pageRate / results['pure'][0]:.2f}x pure on pages and {scanRate / results['pure'][1]:.2f}x on the full scan", end="")
+    print()
+
+if __name__ == "__main__":
+  main()
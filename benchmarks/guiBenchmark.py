@@ -0,0 +1,235 @@
+import argparse
+import json
+import os
+import platform
+import sys
+from datetime import datetime, timezone
+from itertools import count
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+# Renders into memory, so it runs on a headless machine and timings don't depend on the window manager
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6 import QtWidgets, QtCore, QtGui
+from PyQt6.QtCore import Qt
+
+from datasetGenerator import generateStudents, PROGRAMS, COLLEGES
+from modelBenchmark import timeRuns, gitRevision, compareResults, RESULTS_DIRECTORY
+
+def parseArgs():
+  parser = argparse.ArgumentParser(description="Times the student, program and college tables offscreen: page changes, row headers, a hover sweep and widget counts, saved as JSON.")
+  parser.add_argument("--sizes", default="50,200,1000", help="comma separated rows per synthetic page")
+  parser.add_argument("--tables", default="students,programs,colleges", help="comma separated tables to drive")
+  parser.add_argument("--repeat", type=int, default=20, help="timed runs per page benchmark")
+  parser.add_argument("--hover-repeat", type=int, default=5, help="timed hover sweeps per table and size")
+  parser.add_argument("--hover-step", type=int, default=2, help="pixels the pointer moves between hover events")
+  parser.add_argument("--window", default="1280x720", help="size of the offscreen window holding the table")
+  parser.add_argument("--output", help="JSON file for the results (default: benchmarks/results/gui-<timestamp>.json)")
+  parser.add_argument("--compare", metavar="BASELINE", help="a previous results file to compare this run against")
+  return parser.parse_args()
+
+# Synthetic pages shaped like the records the controllers return
+def studentPage(size):
+  programColleges = {code: college for code, _, college, _ in PROGRAMS}
+  records = []
+
+  for batch in generateStudents(size, batchSize=size):
+    for idNumber, firstName, lastName, yearLevel, gender, programCode in batch:
+      records.append({
+        "id_number": idNumber,
+        "first_name": firstName,
+        "last_name": lastName,
+        "year_level": yearLevel,
+        "gender": gender,
+        "program_code": programCode,
+        "college_code": programColleges[programCode],
+      })
+
+  return records
+
+def programPage(size):
+  return [
+    {"program_code": f"{code}-{i // len(PROGRAMS)}", "program_name": name, "college_code": college}
+    for i, (code, name, college, _) in ((i, PROGRAMS[i % len(PROGRAMS)]) for i in range(size))
+  ]
+
+def collegePage(size):
+  return [
+    {"college_code": f"{code}-{i // len(COLLEGES)}", "college_name": name}
+    for i, (code, name) in ((i, COLLEGES[i % len(COLLEGES)]) for i in range(size))
+  ]
+
+# (name, table class, method that loads the first page from the database, synthetic page builder)
+def tableClasses():
+  from views.components.StudentTable import StudentTable
+  from views.components.ProgramTable import ProgramTable
+  from views.components.CollegeTable import CollegeTable
+
+  return [
+    ("students", StudentTable, "initialStudentsToDisplay", studentPage),
+    ("programs", ProgramTable, "initialProgramsToDisplay", programPage),
+    ("colleges", CollegeTable, "initialCollegesToDisplay", collegePage),
+  ]
+
+# Counts the paint events a widget receives and the area they cover (the bounding box of each painted region)
+class PaintCounter(QtCore.QObject):
+  def __init__(self, parent=None):
+    super().__init__(parent)
+    self.reset()
+
+  def reset(self):
+    self.events = 0
+    self.pixels = 0
+
+  def eventFilter(self, obj, event):
+    if event.type() == QtCore.QEvent.Type.Paint:
+      self.events += 1
+      rect = event.region().boundingRect()
+      self.pixels += rect.width() * rect.height()
+    return False
+
+# Shows the table alone in a window, with the database load replaced so only synthetic pages are displayed
+def createTable(tableClass, initialLoad, width, height):
+  offscreenClass = type(f"Offscreen{tableClass.__name__}", (tableClass,), {initialLoad: lambda self: None})
+
+  window = QtWidgets.QWidget()
+  window.resize(width, height)
+  layout = QtWidgets.QVBoxLayout(window)
+  layout.setContentsMargins(0, 0, 0, 0)
+
+  table = offscreenClass(window)
+  layout.addWidget(table)
+
+  window.show()
+  QtWidgets.QApplication.processEvents()
+  return window, table
+
+def moveMouse(viewport, position):
+  event = QtGui.QMouseEvent(QtCore.QEvent.Type.MouseMove, QtCore.QPointF(position), QtCore.QPointF(viewport.mapToGlobal(position)), Qt.MouseButton.NoButton, Qt.MouseButton.NoButton, Qt.KeyboardModifier.NoModifier)
+  QtWidgets.QApplication.sendEvent(viewport, event)
+
+# Moves the pointer down the operations column and back out, letting Qt paint after every move like a real frame
+def hoverSweep(table, step):
+  viewport = table.viewport()
+  operationsColumn = table.model().columnCount() - 1
+  x = table.columnViewportPosition(operationsColumn) + table.columnWidth(operationsColumn) // 2
+  moves = 0
+
+  for y in range(0, viewport.height(), step):
+    moveMouse(viewport, QtCore.QPoint(x, y))
+    QtWidgets.QApplication.processEvents()
+    moves += 1
+
+  QtWidgets.QApplication.sendEvent(viewport, QtCore.QEvent(QtCore.QEvent.Type.Leave))
+  QtWidgets.QApplication.processEvents()
+  return moves
+
+def widgetCount():
+  return len(QtWidgets.QApplication.allWidgets())
+
+def benchmarkTable(name, tableClass, initialLoad, buildPage, sizes, args, record):
+  width, height = (int(value) for value in args.window.lower().split("x"))
+
+  before = widgetCount()
+  window, table = createTable(tableClass, initialLoad, width, height)
+  record(name, 0, "widgets", f"{name} widgets for an empty table", {"widgets": widgetCount() - before})
+
+  counter = PaintCounter()
+  table.viewport().installEventFilter(counter)
+  pageNumbers = count(1)
+
+  for size in sizes:
+    page = buildPage(size)
+
+    stats, _ = timeRuns(lambda: table.populateTable(page, next(pageNumbers)), args.repeat)
+    record(name, size, "populate", f"{name} populateTable", stats)
+
+    # Row numbers come from the model's headerData, so page changes relabel the vertical header as it repaints
+    header = table.verticalHeader()
+    stats, _ = timeRuns(lambda: (table.populateTable(page, next(pageNumbers)), header.viewport().repaint()), args.repeat)
+    record(name, size, "header", f"{name} populateTable + vertical header", stats)
+
+    def pageChange():
+      table.populateTable(page, next(pageNumbers))
+      QtWidgets.QApplication.processEvents()
+
+    stats, _ = timeRuns(pageChange, args.repeat)
+    record(name, size, "frame", f"{name} page change frame", stats)
+
+    widgetsBeforeHover = widgetCount()
+    hoverSweep(table, args.hover_step)
+
+    counter.reset()
+    stats, moves = timeRuns(lambda: hoverSweep(table, args.hover_step), args.hover_repeat)
+    stats.update({
+      "moves": moves,
+      "msPerMove": stats["medianMs"] / moves,
+      "paintEvents": counter.events // args.hover_repeat,
+      "paintedPixels": counter.pixels // args.hover_repeat,
+      "viewportPixels": table.viewport().width() * table.viewport().height(),
+    })
+    record(name, size, "hover", f"{name} hover sweep", stats)
+
+    record(name, size, "widgets", f"{name} widgets", {
+      "widgets": widgetCount() - before,
+      "tableWidgets": len(table.findChildren(QtWidgets.QWidget)),
+      "hoverWidgets": widgetCount() - widgetsBeforeHover,
+    })
+
+  window.close()
+  window.deleteLater()
+  QtWidgets.QApplication.processEvents()
+
+def main():
+  args = parseArgs()
+  app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+
+  sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+  tables = {name.strip() for name in args.tables.split(",") if name.strip()}
+  results = []
+
+  def record(table, size, group, name, stats):
+    results.append({"table": table, "size": size, "group": group, "name": name, **stats})
+
+    if "medianMs" in stats:
+      detail = f"{stats['medianMs']:>9.2f} ms median {stats['p95Ms']:>9.2f} ms p95"
+      if group == "hover":
+        detail += f"  {stats['msPerMove']:.3f} ms/move, {stats['paintEvents']} paints, {stats['paintedPixels'] / stats['viewportPixels']:.1f} viewports painted"
+    else:
+      detail = ", ".join(f"{key} {value}" for key, value in stats.items())
+
+    print(f"{size:>6,} {group:<9} {name:<40} {detail}")
+
+  for name, tableClass, initialLoad, buildPage in tableClasses():
+    if name in tables:
+      print(f"\n== {name} ==")
+      benchmarkTable(name, tableClass, initialLoad, buildPage, sizes, args, record)
+
+  output = Path(args.output) if args.output else RESULTS_DIRECTORY / f"gui-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+  output.parent.mkdir(parents=True, exist_ok=True)
+  output.write_text(json.dumps({
+    "meta": {
+      "revision": gitRevision(),
+      "createdAt": datetime.now(timezone.utc).isoformat(),
+      "qt": QtCore.QT_VERSION_STR,
+      "platform": app.platformName(),
+      "python": platform.python_version(),
+      "os": platform.platform(),
+      "sizes": sizes,
+      "repeat": args.repeat,
+      "hoverRepeat": args.hover_repeat,
+      "hoverStep": args.hover_step,
+      "window": args.window,
+    },
+    "results": results,
+  }, indent=2), encoding="utf-8")
+
+  print(f"\nSaved {len(results)} results to {output}")
+
+  if args.compare:
+    compareResults(args.compare, [entry for entry in results if "medianMs" in entry])
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,229 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+# Repeated pages would otherwise be served from the page cache instead of the database being measured
+os.environ.setdefault("DB_PAGE_CACHE_MB", "0")
+
+from datasetGenerator import loadDataset, PROGRAMS, COLLEGES
+
+RESULTS_DIRECTORY = Path(__file__).resolve().parent / "results"
+
+STUDENT_FIELDS = ["id_number", "first_name", "last_name", "year_level", "gender", "program_code", "college_code"]
+PROGRAM_FIELDS = ["program_code", "program_name", "college_code"]
+COLLEGE_FIELDS = ["college_code", "college_name"]
+
+# A term per search field that matches a realistic share of the generated rows
+STUDENT_SEARCH_TERMS = {"id_number": "2024-00", "first_name": "Maria", "last_name": "Cruz", "year_level": "3", "gender": "Other", "program_code": "BSCS", "college_code": "CCS", None: "Maria Santos"}
+PROGRAM_SEARCH_TERMS = {"program_code": "BSBA", "program_name": "Engineering", "college_code": "COE", None: "Science"}
+COLLEGE_SEARCH_TERMS = {"college_code": "C", "college_name": "Science", None: "College"}
+
+# A later run slower than this multiple of the baseline, and by more than timer noise, is reported as a regression
+REGRESSION_THRESHOLD = 1.2
+REGRESSION_MIN_DELTA_MS = 0.5
+
+def parseArgs():
+  parser = argparse.ArgumentParser(description="Times the model layer (pages, sorts, searches, counts and batch writes) at several dataset sizes and saves the results as JSON.")
+  parser.add_argument("--sizes", default="10000,100000,1000000", help="comma separated student counts to generate and measure")
+  parser.add_argument("--database", default="lexis_benchmark", help="scratch database to create and fill (never the app database)")
+  parser.add_argument("--repeat", type=int, default=20, help="timed runs per read benchmark")
+  parser.add_argument("--per-page", type=int, default=50, help="rows per page")
+  parser.add_argument("--batch-size", type=int, default=1000, help="students per batch update or delete")
+  parser.add_argument("--batch-repeat", type=int, default=5, help="timed batch updates and deletes per size")
+  parser.add_argument("--seed", type=int, default=2024, help="dataset seed, kept the same to compare versions")
+  parser.add_argument("--only", help="comma separated groups to run: paging, sort, search, count, batch")
+  parser.add_argument("--output", help="JSON file for the results (default: benchmarks/results/model-<timestamp>.json)")
+  parser.add_argument("--compare", metavar="BASELINE", help="a previous results file to compare this run against")
+  return parser.parse_args()
+
+def timeRuns(function, repeat):
+  timings = []
+  result = None
+
+  for _ in range(repeat):
+    start = time.perf_counter()
+    result = function()
+    timings.append((time.perf_counter() - start) * 1000)
+
+  timings.sort()
+  return {
+    "runs": repeat,
+    "minMs": timings[0],
+    "medianMs": statistics.median(timings),
+    "p95Ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+    "meanMs": statistics.fmean(timings),
+  }, result
+
+def lastPage(total, perPage):
+  return max(1, -(-total // perPage))
+
+# (group, name, function) for every read benchmark; counts are warmed first, so page timings are the page query alone
+def readBenchmarks(args):
+  from database.queryCache import countCache
+  from model.Student import Student
+  from model.Program import Program
+  from model.College import College
+
+  perPage = args.per_page
+  tables = [
+    ("students", Student.getStudentRecords, Student.countStudentRecords, STUDENT_FIELDS, STUDENT_SEARCH_TERMS),
+    ("programs", Program.getProgramRecords, Program.countProgramRecords, PROGRAM_FIELDS, PROGRAM_SEARCH_TERMS),
+    ("colleges", College.getCollegeRecords, College.countCollegeRecords, COLLEGE_FIELDS, COLLEGE_SEARCH_TERMS),
+  ]
+
+  benchmarks = []
+
+  for table, getRecords, countRecords, fields, searchTerms in tables:
+    total = countRecords()
+    pages = {"first": 1, "middle": lastPage(total, perPage) // 2 + 1, "last": lastPage(total, perPage)}
+
+    for name, page in pages.items():
+      benchmarks.append(("paging", f"{table} {name} page ({page})", lambda getRecords=getRecords, page=page: getRecords(page=page, perPage=perPage)))
+
+    for field in fields:
+      tieBreaker = fields[1] if field == fields[0] else fields[0]
+      for sortOrder in ("ASC", "DESC"):
+        benchmarks.append(("sort", f"{table} by {field} {sortOrder}", lambda getRecords=getRecords, field=field, tieBreaker=tieBreaker, sortOrder=sortOrder: getRecords(perPage=perPage, sortBy1=field, sortBy2=tieBreaker, sortOrder=sortOrder)))
+
+    for field, term in searchTerms.items():
+      countRecords(field, term)
+      benchmarks.append(("search", f"{table} {field or 'any'} ~ {term!r}", lambda getRecords=getRecords, field=field, term=term: getRecords(perPage=perPage, searchField=field, searchTerm=term)))
+
+      def count(countRecords=countRecords, field=field, term=term):
+        countCache.clear()
+        return countRecords(field, term)
+
+      benchmarks.append(("count", f"{table} count {field or 'any'} ~ {term!r}", count))
+
+    def countAll(countRecords=countRecords):
+      countCache.clear()
+      return countRecords()
+
+    benchmarks.append(("count", f"{table} count all", countAll))
+
+  return benchmarks
+
+def runBatchBenchmarks(size, idNumbers, args, record):
+  from model.Student import Student
+
+  rng = random.Random(args.seed)
+  batchSize = min(args.batch_size, len(idNumbers) // (args.batch_repeat * 2 + 1))
+  if batchSize < 1:
+    return
+
+  sample = rng.sample(idNumbers, batchSize * args.batch_repeat * 2)
+  updates, deletes = sample[:batchSize * args.batch_repeat], sample[batchSize * args.batch_repeat:]
+
+  for name, keys, run in [
+    (f"update {batchSize} students", updates, lambda chunk: Student.updateBatchStudentRecordsById(chunk, {"year_level": rng.randint(1, 5)})),
+    (f"delete {batchSize} students", deletes, Student.removeBatchStudentRecordsById),
+  ]:
+    chunks = iter([keys[start:start + batchSize] for start in range(0, len(keys), batchSize)])
+    stats, summary = timeRuns(lambda: run(next(chunks)), args.batch_repeat)
+    stats["rowsPerSecond"] = batchSize / (stats["medianMs"] / 1000)
+    stats["failed"] = len(summary["failed"])
+    record(size, "batch", name, stats)
+
+def gitRevision():
+  try:
+    return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=Path(__file__).resolve().parent, check=True).stdout.strip()
+  except Exception:
+    return None
+
+def compareResults(baselinePath, results):
+  baseline = json.loads(Path(baselinePath).read_text(encoding="utf-8"))
+  baselineTimes = {(entry["size"], entry["name"]): entry["medianMs"] for entry in baseline["results"] if "medianMs" in entry}
+
+  print(f"\nCompared with {baselinePath} ({baseline['meta'].get('revision') or 'unknown revision'}):")
+  print(f"{'size':>9} {'benchmark':<48} {'before ms':>10} {'after ms':>10} {'change':>8}")
+
+  regressions = 0
+  for entry in results:
+    before = baselineTimes.get((entry["size"], entry["name"]))
+    if before is None or before <= 0:
+      continue
+
+    ratio = entry["medianMs"] / before
+    flag = ""
+    if ratio > REGRESSION_THRESHOLD and entry["medianMs"] - before > REGRESSION_MIN_DELTA_MS:
+      flag = "  regression"
+      regressions += 1
+
+    print(f"{entry['size']:>9,} {entry['name']:<48} {before:>10.2f} {entry['medianMs']:>10.2f} {ratio:>7.2f}x{flag}")
+
+  print(f"\n{regressions} benchmark(s) more than {REGRESSION_THRESHOLD:.1f}x slower than the baseline")
+
+def main():
+  args = parseArgs()
+  os.environ["DB_NAME"] = args.database
+
+  from searchBenchmark import createDatabase
+  from database.db import initDatabase, getBackend, getDriverMode, closePool
+
+  createDatabase(args.database)
+  initDatabase()
+
+  groups = set(args.only.split(",")) if args.only else {"paging", "sort", "search", "count", "batch"}
+  sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+  results = []
+
+  def record(size, group, name, stats):
+    results.append({"size": size, "group": group, "name": name, **stats})
+    print(f"{size:>9,} {group:<7} {name:<48} {stats['medianMs']:>9.2f} ms median {stats['p95Ms']:>9.2f} ms p95")
+
+  for size in sizes:
+    print(f"\n== {size:,} students ==")
+    idNumbers = loadDataset(size, seed=args.seed)
+
+    for group, name, function in readBenchmarks(args):
+      if group not in groups:
+        continue
+
+      function()
+      stats, _ = timeRuns(function, args.repeat)
+      record(size, group, name, stats)
+
+    # Last, since it deletes students
+    if "batch" in groups:
+      runBatchBenchmarks(size, idNumbers, args, record)
+
+  closePool()
+
+  output = Path(args.output) if args.output else RESULTS_DIRECTORY / f"model-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+  output.parent.mkdir(parents=True, exist_ok=True)
+  output.write_text(json.dumps({
+    "meta": {
+      "revision": gitRevision(),
+      "createdAt": datetime.now(timezone.utc).isoformat(),
+      "backend": getBackend().name,
+      "driver": getDriverMode(),
+      "python": platform.python_version(),
+      "platform": platform.platform(),
+      "sizes": sizes,
+      "seed": args.seed,
+      "repeat": args.repeat,
+      "perPage": args.per_page,
+      "batchSize": args.batch_size,
+      "colleges": len(COLLEGES),
+      "programs": len(PROGRAMS),
+    },
+    "results": results,
+  }, indent=2), encoding="utf-8")
+
+  print(f"\nSaved {len(results)} results to {output}")
+
+  if args.compare:
+    compareResults(args.compare, results)
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,98 @@
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+# Repeated pages would otherwise be served from the page cache instead of the database being measured
+os.environ.setdefault("DB_PAGE_CACHE_MB", "0")
+
+from searchBenchmark import createDatabase, populate
+
+# Same (sortBy1, sortBy2) pairs the students table offers
+SORT_OPTIONS = [("id_number", "last_name"), ("first_name", "last_name"), ("last_name", "first_name"), ("gender", "last_name"), ("year_level", "last_name"), ("program_code", "last_name"), ("college_code", "last_name")]
+SEARCHES = [(None, ""), ("program_code", "BS"), ("last_name", "Cruz")]
+
+def parseArgs():
+  parser = argparse.ArgumentParser(description="Times student page fetches as plain text queries vs cached server-side prepared statements.")
+  parser.add_argument("--students", type=int, default=100_000, help="number of synthetic students to load")
+  parser.add_argument("--database", default="lexis_benchmark", help="scratch database to create and fill (never the app database)")
+  parser.add_argument("--fetches", type=int, default=10_000, help="page fetches per mode")
+  parser.add_argument("--max-page", type=int, default=20, help="fetch pages 1..N, kept low so OFFSET scans do not drown out parsing")
+  parser.add_argument("--skip-populate", action="store_true", help="reuse the students already in the scratch database")
+  return parser.parse_args()
+
+def sessionStatus():
+  from database.db import getConnection
+
+  conn = getConnection()
+  cursor = conn.cursor()
+  cursor.execute("SHOW SESSION STATUS WHERE Variable_name IN ('Com_select', 'Com_stmt_prepare', 'Com_stmt_execute')")
+  status = {name: int(value) for name, value in cursor.fetchall()}
+  cursor.close()
+  conn.close()
+  return status
+
+def timeFetches(fetches, maxPage, prepared):
+  from database.statementCache import statementCache
+  from model.Student import Student
+
+  statementCache.enabled = prepared
+  statementCache.resetStats()
+
+  random.seed(7)
+  plan = [(random.choice(SORT_OPTIONS), random.choice(SEARCHES), random.randint(1, maxPage), random.choice(["ASC", "DESC"])) for _ in range(fetches)]
+
+  # Counts are cached after the first fetch of each search, so the page query is what gets timed
+  for _, (searchField, searchTerm), _, _ in plan[:len(SEARCHES) * 4]:
+    Student.countStudentRecords(searchField, searchTerm)
+
+  before = sessionStatus()
+  timings = []
+
+  for (sortBy1, sortBy2), (searchField, searchTerm), page, sortOrder in plan:
+    start = time.perf_counter()
+    Student.getStudentRecords(page=page, sortBy1=sortBy1, sortBy2=sortBy2, sortOrder=sortOrder, searchField=searchField, searchTerm=searchTerm)
+    timings.append((time.perf_counter() - start) * 1000)
+
+  after = sessionStatus()
+  timings.sort()
+
+  return {
+    "total": sum(timings) / 1000,
+    "median": statistics.median(timings),
+    "p95": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+    "status": {name: after[name] - before.get(name, 0) for name in after},
+    "cache": statementCache.stats(),
+  }
+
+def main():
+  args = parseArgs()
+  os.environ["DB_NAME"] = args.database
+
+  createDatabase(args.database)
+
+  from database.db import initDatabase
+  initDatabase()
+
+  if not args.skip_populate:
+    populate(args.students)
+
+  print(f"\n{'mode':<9} {'total s':>8} {'median ms':>10} {'p95 ms':>8} {'prepares':>9} {'executes':>9} {'text selects':>13} {'hit ratio':>10}")
+
+  results = {}
+  for mode, prepared in [("text", False), ("prepared", True)]:
+    result = timeFetches(args.fetches, args.max_page, prepared)
+    results[mode] = result
+    status = result["status"]
+    print(f"{mode:<9} {result['total']:>8.2f} {result['median']:>10.3f} {result['p95']:>8.3f} {status.get('Com_stmt_prepare', 0):>9} {status.get('Com_stmt_execute', 0):>9} {status.get('Com_select', 0):>13} {result['cache']['hitRatio']:>10.1%}")
+
+  speedup = results["text"]["median"] / results["prepared"]["median"] if results["prepared"]["median"] else 0
+  print(f"\nPrepared median is {speedup:.2f}x the speed of text queries over {args.fetches:,} fetches")
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,143 @@
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+FIRST_NAMES = ["Maria", "Jose", "Juan", "Ana", "Mark", "Angel", "John", "Kim", "Gabriel", "Andrea", "Paolo", "Nicole", "Carlo", "Bea", "Miguel", "Sofia", "Rafael", "Camille", "Luis", "Patricia"]
+LAST_NAMES = ["Santos", "Reyes", "Cruz", "Bautista", "Garcia", "Mendoza", "Torres", "Flores", "Villanueva", "Ramos", "Nasayao", "Aquino", "Castillo", "Navarro", "Dela Cruz", "Gonzales", "Lopez", "Domingo", "Salazar", "Morales"]
+COLLEGES = [("CCS", "College of Computer Studies"), ("COE", "College of Engineering"), ("CAS", "College of Arts and Sciences"), ("CBA", "College of Business Administration"), ("CED", "College of Education")]
+PROGRAMS = [("BSCS", "CCS"), ("BSIT", "CCS"), ("BSIS", "CCS"), ("BSCE", "COE"), ("BSEE", "COE"), ("BSME", "COE"), ("BSBIO", "CAS"), ("BAPSY", "CAS"), ("BSA", "CBA"), ("BSBA", "CBA"), ("BEED", "CED"), ("BSED", "CED")]
+GENDERS = ["Male", "Female", "Other"]
+
+SEARCH_TERMS = ["Nasayao", "Maria Santos", "2031-0042", "BSCS", "CCS", "Gabriel", "ruz", "Kim Nasayao 3", "Villanueva BSIT"]
+
+def parseArgs():
+  parser = argparse.ArgumentParser(description="Times the \"Any\" student search with and without the FULLTEXT index.")
+  parser.add_argument("--students", type=int, default=1_000_000, help="number of synthetic students to load")
+  parser.add_argument("--database", default="lexis_benchmark", help="scratch database to create and fill (never the app database)")
+  parser.add_argument("--repeat", type=int, default=30, help="timed runs per search term")
+  parser.add_argument("--skip-populate", action="store_true", help="reuse the students already in the scratch database")
+  parser.add_argument("--skip-like", action="store_true", help="skip the LIKE baseline, which is slow at 1M rows")
+  return parser.parse_args()
+
+def createDatabase(name):
+  from database.db import getBackend
+
+  # SQLite creates its database file on the first connection
+  if getBackend().name != "mysql":
+    return
+
+  import mysql.connector
+  from database.mysqlBackend import DB_CONFIG
+
+  config = {key: value for key, value in DB_CONFIG.items() if key != "database"}
+  conn = mysql.connector.connect(**config)
+  cursor = conn.cursor()
+  cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{name}`")
+  cursor.close()
+  conn.close()
+
+def populate(count):
+  from database.db import getConnection, getBackend
+
+  conn = getConnection()
+  cursor = conn.cursor()
+
+  cursor.execute("DELETE FROM students")
+  cursor.execute("DELETE FROM programs")
+  cursor.execute("DELETE FROM colleges")
+  cursor.executemany("INSERT INTO colleges (college_code, college_name) VALUES (%s, %s)", COLLEGES)
+  cursor.executemany("INSERT INTO programs (program_code, program_name, college_code) VALUES (%s, %s, %s)", [(code, code, college) for code, college in PROGRAMS])
+
+  random.seed(151)
+  batch = []
+  start = time.perf_counter()
+
+  for i in range(count):
+    idNumber = f"{1950 + i // 10000}-{i % 10000:04d}"
+    batch.append((idNumber, random.choice(FIRST_NAMES), random.choice(LAST_NAMES), random.randint(1, 5), random.choice(GENDERS), random.choice(PROGRAMS)[0]))
+
+    if len(batch) == 5000 or i == count - 1:
+      conn.start_transaction()
+      cursor.executemany("""
+        INSERT INTO students (id_number, first_name, last_name, year_level, gender, program_code)
+        VALUES (%s, %s, %s, %s, %s, %s)
+      """, batch)
+      conn.commit()
+      batch = []
+      print(f"\rInserted {i + 1:,} / {count:,} students", end="", flush=True)
+
+  # MySQL keeps its index statistics current by itself; SQLite plans from whatever ANALYZE last recorded
+  if getBackend().name == "sqlite":
+    cursor.execute("ANALYZE")
+
+  print(f"\nPopulated in {time.perf_counter() - start:.1f}s")
+  cursor.close()
+  conn.close()
+
+def timeSearch(term, repeat, useIndex):
+  from database.db import getConnection
+  from model.Student import Student
+
+  Student.hasSearchIndex = None if useIndex else False
+  conn = getConnection()
+  cursor = conn.cursor(dictionary=True)
+  timings = []
+  matches = 0
+
+  for _ in range(repeat):
+    start = time.perf_counter()
+    searchQuery, params = Student.buildSearchQuery(None, term, cursor)
+    cursor.execute(f"""
+      SELECT s.*, c.college_code
+      FROM students s
+      LEFT JOIN programs p ON s.program_code = p.program_code
+      LEFT JOIN colleges c ON p.college_code = c.college_code
+      {searchQuery}
+      LIMIT 50
+    """, params)
+    matches = len(cursor.fetchall())
+    timings.append((time.perf_counter() - start) * 1000)
+
+  cursor.close()
+  conn.close()
+
+  timings.sort()
+  return {
+    "median": statistics.median(timings),
+    "p95": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+    "matches": matches,
+  }
+
+def main():
+  args = parseArgs()
+  os.environ["DB_NAME"] = args.database
+
+  createDatabase(args.database)
+
+  from database.db import initDatabase
+  initDatabase()
+
+  if not args.skip_populate:
+    populate(args.students)
+
+  print(f"\n{'term':<20} {'mode':<9} {'median ms':>10} {'p95 ms':>10} {'rows':>6}")
+
+  slowest = 0.0
+  for term in SEARCH_TERMS:
+    modes = [("fulltext", True)] + ([] if args.skip_like else [("like", False)])
+    for mode, useIndex in modes:
+      result = timeSearch(term, args.repeat, useIndex)
+      print(f"{term:<20} {mode:<9} {result['median']:>10.2f} {result['p95']:>10.2f} {result['matches']:>6}")
+      if useIndex:
+        slowest = max(slowest, result["median"])
+
+  print(f"\nSlowest FULLTEXT median: {slowest:.2f} ms ({'within' if slowest < 10 else 'over'} the 10 ms target)")
+
+if __name__ == "__main__":
+  main()
@@ -2,11 +2,12 @@ import sys
 
 from PyQt6.QtWidgets import QApplication
 from src.views.MainWindow import MainWindow
-from src.database.db import initDatabase
+from database.db import initDatabase, closePool
 
 if __name__ == "__main__":
   initDatabase()
   app = QApplication(sys.argv)
+  app.aboutToQuit.connect(closePool)
   window = MainWindow()
   window.show()
   sys.exit(app.exec())
\ No newline at end of file
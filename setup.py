@@ -1,4 +1,4 @@
-from setuptools import setup, find_packages
+from setuptools import setup, find_namespace_packages
 
 with open("requirements.txt") as f:
     required = [line.strip() for line in f.readlines() if not line.startswith("-e")]
@@ -6,7 +6,12 @@ with open("requirements.txt") as f:
 setup(
     name="Lexis",
     version="0.1.0",
-    packages=find_packages(where="src"),
+    # The source folders have no __init__.py files, so they are picked up as namespace packages
+    packages=find_namespace_packages(where="src", include=["controllers*", "database*", "model*", "utils*", "views*", "gui*"], exclude=["*__pycache__*"]),
     package_dir={"": "src"}, 
+    py_modules=["cli", "server"],
     install_requires=required,
+    entry_points={
+        "console_scripts": ["lexis=cli:main", "lexis-api=server:main"],
+    },
 )
@@ -0,0 +1,354 @@
+import argparse
+import contextlib
+import csv
+import importlib
+import json
+import os
+import sys
+from typing import List, Dict, Any, Iterable, Optional
+
+# Headless entry point over the controllers for scripted and scheduled work (`lexis --help`)
+# Nothing here imports PyQt6, and each command only imports the controllers it uses, so --help does not even load
+# the database driver. Diagnostics from the models go to stderr, leaving stdout to the records and summaries.
+
+# The table columns, kept here so parsing arguments does not import the models
+ENTITY_FIELDS = {
+  "students": ["id_number", "first_name", "last_name", "year_level", "gender", "program_code", "college_code"],
+  "programs": ["program_code", "program_name", "college_code"],
+  "colleges": ["college_code", "college_name"],
+}
+ENTITY_KEYS = {"students": "id_number", "programs": "program_code", "colleges": "college_code"}
+DEFAULT_SORTS = {"students": ("id_number", "last_name"), "programs": ("program_code", "program_name"), "colleges": ("college_code", "college_name")}
+
+OUTPUT_FORMATS = ["table", "csv", "ndjson"]
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_PARTIAL = 2
+
+def loadControllers(entity: str):
+  return importlib.import_module(f"controllers.{entity[:-1]}Controllers")
+
+#--------------------------------------------------------------------------
+
+def listCommand(args, out) -> int:
+  controllers = loadControllers(args.entity)
+  name = args.entity.capitalize()
+  sortBy1, sortBy2 = sortFields(args)
+  sortOrder = "DESC" if args.desc else "ASC"
+
+  if args.all:
+    batches = getattr(controllers, f"iter{name}")(sortBy1, sortBy2, sortOrder, args.field, args.search, args.batch_size)
+  else:
+    records, totalRecords = getattr(controllers, f"get{name}")(page=args.page, perPage=args.per_page, sortBy1=sortBy1, sortBy2=sortBy2, sortOrder=sortOrder, searchField=args.field, searchTerm=args.search)
+    batches = [records]
+
+    lastPage = max(1, (totalRecords + args.per_page - 1) // args.per_page)
+    print(f"Page {args.page} of {lastPage}, {totalRecords:,} {args.entity}", file=sys.stderr)
+
+  writeRecords(out, ENTITY_FIELDS[args.entity], batches, args.format)
+  return EXIT_OK
+
+# Searches stream every match unless a page is asked for
+def searchCommand(args, out) -> int:
+  args.all = args.page is None
+  args.page = args.page or 1
+  return listCommand(args, out)
+
+def importCommand(args, out) -> int:
+  importControllers = importlib.import_module("controllers.importControllers")
+  importRecords = getattr(importControllers, f"import{args.entity.capitalize()}Csv")
+
+  source = sys.stdin.buffer if args.file == "-" else args.file
+  jsonLines = {"csv": False, "ndjson": True}.get(args.input_format)
+
+  def reportProgress(progress):
+    print(f"{progress['rowsRead']:,} rows read, {progress['imported']:,} imported, {progress['rejected']:,} rejected", file=sys.stderr)
+
+  summary = importRecords(source, args.rejects, args.chunk_size, reportProgress if args.progress else None, None, jsonLines=jsonLines)
+
+  message = f"Imported {summary['imported']:,} {args.entity}, {summary['rejected']:,} rejected"
+  if summary["rejectsPath"]:
+    message += f" (written to {summary['rejectsPath']})"
+
+  writeSummary(out, summary, message, args.format)
+  return EXIT_PARTIAL if summary["rejected"] else EXIT_OK
+
+def exportCommand(args, out) -> int:
+  exportControllers = importlib.import_module("controllers.exportControllers")
+  exportRecords = getattr(exportControllers, f"export{args.entity.capitalize()}")
+  sortBy1, sortBy2 = sortFields(args)
+
+  summary = exportRecords(args.file, sortBy1, sortBy2, "DESC" if args.desc else "ASC", args.field, args.search, args.batch_size)
+
+  writeSummary(out, summary, f"Exported {summary['rowsWritten']:,} {args.entity} to {summary['filePath']}", args.format)
+  return EXIT_OK
+
+def updateCommand(args, out) -> int:
+  controllers = loadControllers("students")
+
+  if args.matching:
+    summary = controllers.updateMatchingStudents(args.field, args.search, args.expect, args.year_level, args.gender, args.program, None, False)
+    return writeMatchingSummary(out, summary, args.format)
+
+  summary = controllers.batchUpdateStudents(readKeys(args), args.year_level, args.gender, args.program, None, False, progressCallback=batchProgress(args))
+  return writeBatchSummary(out, summary, args.format)
+
+def deleteCommand(args, out) -> int:
+  controllers = loadControllers(args.entity)
+
+  if args.matching:
+    if args.entity != "students":
+      raise ValueError("--matching only applies to students")
+
+    summary = controllers.removeMatchingStudents(args.field, args.search, args.expect)
+    return writeMatchingSummary(out, summary, args.format)
+
+  summary = getattr(controllers, f"batchRemove{args.entity.capitalize()}")(readKeys(args), progressCallback=batchProgress(args))
+  return writeBatchSummary(out, summary, args.format)
+
+def migrateCommand(args, out) -> int:
+  from database.db import getConnection, getBackend, initDatabase
+
+  if not args.dry_run:
+    initDatabase()
+    print("Schema is up to date.", file=out)
+    return EXIT_OK
+
+  conn = getConnection()
+  if not conn:
+    return EXIT_ERROR
+
+  cursor = conn.cursor()
+  try:
+    pending = getBackend().migrate(cursor, dryRun=True)
+  finally:
+    cursor.close()
+    conn.close()
+
+  if not pending:
+    print("Schema is up to date.", file=out)
+
+  for version, description, statements in pending:
+    print(f"Would apply migration {version}: {description}", file=out)
+    for statement in statements:
+      print(f"  {' '.join(statement.split())};", file=out)
+
+  return EXIT_OK
+
+#--------------------------------------------------------------------------
+
+# Writes batches as they arrive, so streamed listings never hold more than one batch
+# The table format sizes its columns from the first batch
+def writeRecords(out, fields: List[str], batches: Iterable[List[Dict[str, Any]]], outputFormat: str) -> int:
+  rowsWritten = 0
+  writer = csv.writer(out) if outputFormat == "csv" else None
+  widths = None
+
+  if writer is not None:
+    writer.writerow(fields)
+
+  try:
+    for records in batches:
+      if outputFormat == "ndjson":
+        out.writelines(json.dumps({field: record.get(field) for field in fields}, default=str) + "\n" for record in records)
+
+      elif writer is not None:
+        writer.writerows([("" if record.get(field) is None else record.get(field)) for field in fields] for record in records)
+
+      else:
+        if widths is None:
+          widths = [max([len(field)] + [len(formatCell(record.get(field))) for record in records]) for field in fields]
+          out.write("  ".join(field.ljust(width) for field, width in zip(fields, widths)).rstrip() + "\n")
+
+        for record in records:
+          out.write("  ".join(formatCell(record.get(field)).ljust(width) for field, width in zip(fields, widths)).rstrip() + "\n")
+
+      rowsWritten += len(records)
+
+  finally:
+    # Hands a streamed listing's connection back even when the output pipe closes early
+    if hasattr(batches, "close"):
+      batches.close()
+
+  return rowsWritten
+
+def formatCell(value: Any) -> str:
+  return "" if value is None else str(value)
+
+def writeSummary(out, summary: Dict[str, Any], message: str, outputFormat: str) -> None:
+  if outputFormat == "ndjson":
+    out.write(json.dumps({**summary, "message": message}, default=str) + "\n")
+  else:
+    print(message, file=out)
+
+# Every failed key gets a line of its own on stderr, so the summary on stdout stays one line
+def writeBatchSummary(out, summary: Dict[str, Any], outputFormat: str) -> int:
+  writeSummary(out, summary, summary["message"], outputFormat)
+
+  if outputFormat != "ndjson":
+    for key, reason in summary["failed"].items():
+      print(f"{key}: {reason}", file=sys.stderr)
+
+  if summary["error"] or (not summary["succeeded"] and summary["total"]):
+    return EXIT_ERROR
+  return EXIT_PARTIAL if summary["failed"] or summary["pending"] else EXIT_OK
+
+def writeMatchingSummary(out, summary: Dict[str, Any], outputFormat: str) -> int:
+  writeSummary(out, summary, summary["message"], outputFormat)
+  return EXIT_ERROR if summary["error"] else EXIT_OK
+
+def batchProgress(args) -> Optional[Any]:
+  if not args.progress:
+    return None
+
+  return lambda progress: print(f"{progress['processed']:,} of {progress['total']:,} done, {progress['failed']:,} failed", file=sys.stderr)
+
+# Keys come from the command line and from --ids-from, a file (or - for stdin) with one key per line
+# Lines that are JSON objects, such as `lexis list --format ndjson` output, give their key field instead
+def readKeys(args) -> List[str]:
+  keys = list(args.keys)
+
+  if args.ids_from:
+    keyField = ENTITY_KEYS[args.entity]
+    file = sys.stdin if args.ids_from == "-" else open(args.ids_from, encoding="utf-8")
+
+    try:
+      for line in file:
+        line = line.strip()
+        if not line:
+          continue
+        keys.append(str(json.loads(line)[keyField]) if line.startswith("{") else line)
+    finally:
+      if file is not sys.stdin:
+        file.close()
+
+  if not keys:
+    raise ValueError(f"No {args.entity} given; pass their keys or --ids-from")
+
+  return keys
+
+def sortFields(args):
+  defaultSortBy1, defaultSortBy2 = DEFAULT_SORTS[args.entity]
+  sortBy1 = args.sort or defaultSortBy1
+
+  # Sorting by the default tie-breaker falls back to the key to break ties instead
+  sortBy2 = args.then or (defaultSortBy2 if defaultSortBy2 != sortBy1 else defaultSortBy1)
+  return sortBy1, sortBy2
+
+# Field names end up in the SQL, so only the entity's own columns are accepted
+def validateFields(args) -> None:
+  fields = ENTITY_FIELDS[args.entity]
+
+  for option in ("sort", "then", "field"):
+    value = getattr(args, option, None)
+    if value is not None and value not in fields:
+      raise ValueError(f"--{option} must be one of {', '.join(fields)}")
+
+#--------------------------------------------------------------------------
+
+def buildParser() -> argparse.ArgumentParser:
+  parser = argparse.ArgumentParser(prog="lexis", description="Lexis student information system from the command line.")
+  subparsers = parser.add_subparsers(dest="command", required=True)
+
+  formatOptions = argparse.ArgumentParser(add_help=False)
+  formatOptions.add_argument("--format", choices=OUTPUT_FORMATS, default="table", help="output format (default: table)")
+
+  searchOptions = argparse.ArgumentParser(add_help=False)
+  searchOptions.add_argument("--field", help="search only this column instead of every column")
+
+  sortOptions = argparse.ArgumentParser(add_help=False)
+  sortOptions.add_argument("--sort", help="column to sort by")
+  sortOptions.add_argument("--then", help="column that breaks ties")
+  sortOptions.add_argument("--desc", action="store_true", help="sort in descending order")
+  sortOptions.add_argument("--batch-size", type=int, default=1000, help="rows fetched per round trip when streaming")
+
+  batchOptions = argparse.ArgumentParser(add_help=False)
+  batchOptions.add_argument("--ids-from", metavar="FILE", help="read keys from a file, one per line or one JSON object per line; - reads stdin")
+  batchOptions.add_argument("--matching", action="store_true", help="students only: apply to every student matching --search/--field in one statement")
+  batchOptions.add_argument("--search", default="", help="search for --matching")
+  batchOptions.add_argument("--expect", type=int, help="with --matching, refuse to write unless the search matches exactly this many students")
+  batchOptions.add_argument("--progress", action="store_true", help="report progress on stderr")
+
+  entities = list(ENTITY_FIELDS)
+
+  listParser = subparsers.add_parser("list", parents=[formatOptions, searchOptions, sortOptions], help="list a page of records, or all of them")
+  listParser.add_argument("entity", choices=entities)
+  listParser.add_argument("--search", default="", help="only records matching this search")
+  listParser.add_argument("--page", type=int, default=1)
+  listParser.add_argument("--per-page", type=int, default=50)
+  listParser.add_argument("--all", action="store_true", help="stream every matching record instead of one page")
+  listParser.set_defaults(handler=listCommand)
+
+  searchParser = subparsers.add_parser("search", parents=[formatOptions, searchOptions, sortOptions], help="stream every record matching a search")
+  searchParser.add_argument("entity", choices=entities)
+  searchParser.add_argument("search")
+  searchParser.add_argument("--page", type=int, help="only this page of the matches")
+  searchParser.add_argument("--per-page", type=int, default=50)
+  searchParser.set_defaults(handler=searchCommand)
+
+  importParser = subparsers.add_parser("import", parents=[formatOptions], help="import records from a CSV or JSON Lines file, or stdin")
+  importParser.add_argument("entity", choices=entities)
+  importParser.add_argument("file", nargs="?", default="-", help="file to import, - for stdin (default)")
+  importParser.add_argument("--input-format", choices=["csv", "ndjson"], help="defaults to the file extension, or CSV for stdin")
+  importParser.add_argument("--rejects", help="where rejected rows are written")
+  importParser.add_argument("--chunk-size", type=int, default=1000, help="rows inserted per transaction")
+  importParser.add_argument("--progress", action="store_true", help="report progress on stderr")
+  importParser.set_defaults(handler=importCommand)
+
+  exportParser = subparsers.add_parser("export", parents=[formatOptions, searchOptions, sortOptions], help="export matching records to a CSV or JSON Lines file")
+  exportParser.add_argument("entity", choices=entities)
+  exportParser.add_argument("file", help="destination; .jsonl or .ndjson writes JSON Lines, anything else CSV")
+  exportParser.add_argument("--search", default="", help="only records matching this search")
+  exportParser.set_defaults(handler=exportCommand)
+
+  updateParser = subparsers.add_parser("update", parents=[formatOptions, searchOptions, batchOptions], help="batch update students")
+  updateParser.add_argument("entity", choices=["students"])
+  updateParser.add_argument("keys", nargs="*", help="ID numbers of the students to update")
+  updateParser.add_argument("--year-level", type=int)
+  updateParser.add_argument("--gender")
+  updateParser.add_argument("--program", help="new program code; the college follows from it")
+  updateParser.set_defaults(handler=updateCommand)
+
+  deleteParser = subparsers.add_parser("delete", parents=[formatOptions, searchOptions, batchOptions], help="batch delete records")
+  deleteParser.add_argument("entity", choices=entities)
+  deleteParser.add_argument("keys", nargs="*", help="keys of the records to delete")
+  deleteParser.set_defaults(handler=deleteCommand)
+
+  migrateParser = subparsers.add_parser("migrate", help="create the tables and apply pending schema migrations")
+  migrateParser.add_argument("--dry-run", action="store_true", help="print the pending statements without running them")
+  migrateParser.set_defaults(handler=migrateCommand, entity=None)
+
+  return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+  args = buildParser().parse_args(argv)
+  out = sys.stdout
+
+  try:
+    if args.entity:
+      validateFields(args)
+
+    # Anything the models print is a diagnostic, not output
+    with contextlib.redirect_stdout(sys.stderr):
+      return args.handler(args, out)
+
+  except KeyboardInterrupt:
+    print("Interrupted", file=sys.stderr)
+    return 130
+
+  except BrokenPipeError:
+    # The reader went away (e.g. `| head`); silence the flush at exit
+    os.dup2(os.open(os.devnull, os.O_WRONLY), out.fileno())
+    return EXIT_OK
+
+  except Exception as e:
+    print(f"lexis: {e}", file=sys.stderr)
+    return EXIT_ERROR
+
+  finally:
+    if "database.db" in sys.modules:
+      sys.modules["database.db"].closePool()
+
+if __name__ == "__main__":
+  sys.exit(main())
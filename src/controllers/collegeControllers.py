@@ -1,5 +1,7 @@
 from model.College import College
-from typing import List, Dict, Tuple, Any
+from database.referenceCache import referenceCache
+from database.batch import batchMessage
+from typing import List, Dict, Tuple, Any, Iterator
 from utils.inputUtils import *
 
 COLLEGE_SEARCH_FIELDS = ["college_code", "college_name"]
@@ -16,8 +18,26 @@ def addCollege(collegeCode: str, collegeName: str) -> bool:
 
   return "College added successfully." if isSuccessful else "Failed to add college."
 
-def getColleges(page=1, perPage=50, sortBy1="college_code", sortBy2="college_name", sortOrder="ASC", searchField=None, searchTerm="") -> Tuple[List[Dict[str, str]], int]:
-  return College.getCollegeRecords(page, perPage, sortBy1, sortBy2, sortOrder, searchField, searchTerm)
+def getColleges(page=1, perPage=50, sortBy1="college_code", sortBy2="college_name", sortOrder="ASC", searchField=None, searchTerm="", approximateCount=False) -> Tuple[List[Dict[str, str]], int]:
+  return College.getCollegeRecords(page, perPage, sortBy1, sortBy2, sortOrder, searchField, searchTerm, approximateCount)
+
+# Every college code, served from memory for the combo boxes
+def getCollegeCodes() -> List[str]:
+  return referenceCache.collegeCodes()
+
+# Drops the cached college and program codes so the next read loads them again
+def refreshReferenceData() -> None:
+  referenceCache.invalidate()
+
+def countColleges(searchField=None, searchTerm="") -> int:
+  return College.countCollegeRecords(searchField, searchTerm)
+
+# Batches of every college matching a search, streamed instead of paged
+def iterColleges(sortBy1="college_code", sortBy2="college_name", sortOrder="ASC", searchField=None, searchTerm="", batchSize=1000) -> Iterator[List[Dict[str, Any]]]:
+  return College.iterCollegeRecords(sortBy1, sortBy2, sortOrder, searchField, searchTerm, batchSize)
+
+def isCollegeCountExact(searchField=None, searchTerm="") -> bool:
+  return College.isCountCached(searchField, searchTerm)
 
 def updateCollege(originalCollegeCode: str, newCollegeCode: Any, newCollegeName: Any) -> bool:
 
@@ -41,7 +61,9 @@ def removeCollege(collegeCode: str) -> str:
 
   return "College removed successfully." if isSuccessful else "Failed to remove college."
 
-def batchRemoveColleges(collegeCodes: List[str]) -> str:
-  isSuccesful = College.removeBatchCollegeRecordsById(collegeCodes)
+# Returns the batch summary from the model with a "message" for the status bar
+def batchRemoveColleges(collegeCodes: List[str], progressCallback=None, cancelEvent=None) -> Dict[str, Any]:
+  summary = College.removeBatchCollegeRecordsById(collegeCodes, progressCallback=progressCallback, cancelEvent=cancelEvent)
+  summary["message"] = batchMessage(summary, "Colleges removed successfully.", "removed", "colleges")
 
-  return "Colleges removed successfully." if isSuccesful else "Failed to remove colleges."
\ No newline at end of file
+  return summary
\ No newline at end of file
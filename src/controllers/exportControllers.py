@@ -0,0 +1,76 @@
+import csv
+import json
+import os
+from typing import List, Dict, Tuple, Any, Callable, Iterator, Optional
+
+from model.Student import Student
+from model.Program import Program
+from model.College import College
+from controllers.importControllers import STUDENT_IMPORT_FIELDS, PROGRAM_IMPORT_FIELDS, COLLEGE_IMPORT_FIELDS, JSON_LINES_EXTENSIONS
+
+EXPORT_BATCH_SIZE = 1000
+
+def exportStudents(filePath: str, sortBy1="id_number", sortBy2="last_name", sortOrder="ASC", searchField=None, searchTerm="", batchSize: int = EXPORT_BATCH_SIZE, progressCallback: Optional[Callable] = None, cancelEvent: Any = None) -> Dict[str, Any]:
+  totalRows = Student.countStudentRecords(searchField, searchTerm)
+  batches = Student.iterStudentRecords(sortBy1, sortBy2, sortOrder, searchField, searchTerm, batchSize, textOnly=isCsv(filePath))
+
+  return exportRecords(filePath, STUDENT_IMPORT_FIELDS, batches, totalRows, progressCallback, cancelEvent)
+
+def exportPrograms(filePath: str, sortBy1="program_code", sortBy2="program_name", sortOrder="ASC", searchField=None, searchTerm="", batchSize: int = EXPORT_BATCH_SIZE, progressCallback: Optional[Callable] = None, cancelEvent: Any = None) -> Dict[str, Any]:
+  totalRows = Program.countProgramRecords(searchField, searchTerm)
+  batches = Program.iterProgramRecords(sortBy1, sortBy2, sortOrder, searchField, searchTerm, batchSize, textOnly=isCsv(filePath))
+
+  return exportRecords(filePath, PROGRAM_IMPORT_FIELDS, batches, totalRows, progressCallback, cancelEvent)
+
+def exportColleges(filePath: str, sortBy1="college_code", sortBy2="college_name", sortOrder="ASC", searchField=None, searchTerm="", batchSize: int = EXPORT_BATCH_SIZE, progressCallback: Optional[Callable] = None, cancelEvent: Any = None) -> Dict[str, Any]:
+  totalRows = College.countCollegeRecords(searchField, searchTerm)
+  batches = College.iterCollegeRecords(sortBy1, sortBy2, sortOrder, searchField, searchTerm, batchSize, textOnly=isCsv(filePath))
+
+  return exportRecords(filePath, COLLEGE_IMPORT_FIELDS, batches, totalRows, progressCallback, cancelEvent)
+
+# CSV cells are text anyway, so CSV exports can take rows the driver never converted to Python types
+def isCsv(filePath: str) -> bool:
+  return not filePath.lower().endswith(JSON_LINES_EXTENSIONS)
+
+# Writes batches of records as they arrive, so only one batch is ever held in memory
+# CSV files use the display headers so they can be imported again; JSON Lines keep the column names
+# The file is written next to its destination and only moved into place once complete
+def exportRecords(filePath: str, fields: List[Tuple[str, str]], batches: Iterator[List[Dict[str, Any]]], totalRows: int = 0, progressCallback: Optional[Callable] = None, cancelEvent: Any = None) -> Dict[str, Any]:
+  summary = {"rowsWritten": 0, "filePath": None, "cancelled": False}
+  partialPath = f"{filePath}.part"
+  jsonLines = not isCsv(filePath)
+  completed = False
+
+  try:
+    with open(partialPath, "w", newline="", encoding="utf-8") as file:
+      if jsonLines:
+        writeRows = lambda rows: file.writelines(json.dumps({field: record.get(field) for field, _ in fields}, default=str) + "\n" for record in rows)
+      else:
+        writer = csv.writer(file)
+        writer.writerow([header for _, header in fields])
+        writeRows = lambda rows: writer.writerows([("" if record.get(field) is None else record.get(field)) for field, _ in fields] for record in rows)
+
+      for rows in batches:
+        if cancelEvent is not None and cancelEvent.is_set():
+          summary["cancelled"] = True
+          break
+
+        writeRows(rows)
+        summary["rowsWritten"] += len(rows)
+
+        if progressCallback:
+          progressCallback({"rowsWritten": summary["rowsWritten"], "totalRows": max(totalRows, summary["rowsWritten"])})
+
+    if not summary["cancelled"]:
+      os.replace(partialPath, filePath)
+      summary["filePath"] = filePath
+      completed = True
+
+  finally:
+    # Closing the generator early hands its connection back before the partial file is dropped
+    if hasattr(batches, "close"):
+      batches.close()
+    if not completed and os.path.exists(partialPath):
+      os.remove(partialPath)
+
+  return summary
@@ -0,0 +1,278 @@
+import csv
+import io
+import json
+import os
+from typing import List, Dict, Tuple, Any, Callable, Optional
+
+from database.db import getConnection
+from model.Student import Student
+from model.Program import Program
+from model.College import College
+from utils.inputUtils import validateIdNumber, validateYearLevel, validateGender
+
+IMPORT_CHUNK_SIZE = 1000
+
+# Files ending in one of these hold one JSON object per line, anything else is CSV
+JSON_LINES_EXTENSIONS = (".jsonl", ".ndjson")
+
+# Lengths and ranges enforced by the table definitions in database/db.py
+MAX_YEAR_LEVEL = 5
+MAX_NAME_LENGTH = 255
+MAX_PROGRAM_CODE_LENGTH = 50
+MAX_COLLEGE_CODE_LENGTH = 10
+
+# (field, CSV header) pairs; the headers match what the models declare
+# A student's college column may be left out since it follows from the program
+STUDENT_IMPORT_FIELDS = list(zip(["id_number", "first_name", "last_name", "year_level", "gender", "program_code", "college_code"], Student.STUDENT_HEADERS))
+PROGRAM_IMPORT_FIELDS = list(zip(["program_code", "program_name", "college_code"], Program.PROGRAM_HEADERS))
+COLLEGE_IMPORT_FIELDS = list(zip(["college_code", "college_name"], College.COLLEGE_HEADERS))
+
+def importStudentsCsv(filePath: Any, rejectsPath: Optional[str] = None, chunkSize: int = IMPORT_CHUNK_SIZE, progressCallback: Optional[Callable] = None, cancelEvent: Any = None, jsonLines: Optional[bool] = None) -> Dict[str, Any]:
+  # Loaded once so rows are checked against memory instead of a programCodeExists query each
+  programColleges = {programCode.lower(): (programCode, collegeCode) for programCode, collegeCode in Program.getProgramCollegeCodes().items()}
+  collegeCodes = {collegeCode.lower(): collegeCode for collegeCode in College.getCollegeCodes()}
+
+  def validateRow(values: Dict[str, str]):
+    idNumber, firstName, lastName = values["id_number"], values["first_name"], values["last_name"]
+    yearLevel, gender, programCode, collegeCode = values["year_level"], values["gender"], values["program_code"], values["college_code"]
+
+    if not all([idNumber, firstName, lastName, yearLevel, gender, programCode]):
+      return "Enter all required fields"
+
+    if not validateIdNumber(idNumber):
+      return "Invalid ID Number"
+
+    if len(firstName) > MAX_NAME_LENGTH or len(lastName) > MAX_NAME_LENGTH:
+      return "Name is too long"
+
+    yearLevel = int(yearLevel) if yearLevel.isdigit() else yearLevel
+    if not validateYearLevel(yearLevel) or yearLevel > MAX_YEAR_LEVEL:
+      return f"Year Level must be between 1 and {MAX_YEAR_LEVEL}."
+
+    if not validateGender(gender):
+      return "Gender must be Male, Female, or Others."
+
+    program = programColleges.get(programCode.lower())
+    if program is None:
+      return "Program Code does not exist"
+
+    if collegeCode:
+      if collegeCode.lower() not in collegeCodes:
+        return "College Code does not exist"
+      if program[1] is None or collegeCode.lower() != program[1].lower():
+        return "College Code does not match the program's college"
+
+    return idNumber, (idNumber, firstName, lastName, yearLevel, gender.capitalize(), program[0])
+
+  return importCsv(filePath, STUDENT_IMPORT_FIELDS, validateRow, Student.findExistingIdNumbers, Student.insertStudentRows, rejectsPath, chunkSize, progressCallback, cancelEvent, optionalFields=("college_code",), jsonLines=jsonLines)
+
+def importProgramsCsv(filePath: Any, rejectsPath: Optional[str] = None, chunkSize: int = IMPORT_CHUNK_SIZE, progressCallback: Optional[Callable] = None, cancelEvent: Any = None, jsonLines: Optional[bool] = None) -> Dict[str, Any]:
+  collegeCodes = {collegeCode.lower(): collegeCode for collegeCode in College.getCollegeCodes()}
+
+  def validateRow(values: Dict[str, str]):
+    programCode, programName, collegeCode = values["program_code"], values["program_name"], values["college_code"]
+
+    if not all([programCode, programName, collegeCode]):
+      return "Enter all required fields"
+
+    if len(programCode) > MAX_PROGRAM_CODE_LENGTH or len(programName) > MAX_NAME_LENGTH:
+      return "Program Code or Name is too long"
+
+    if collegeCode.lower() not in collegeCodes:
+      return "College Code does not exist"
+
+    return programCode, (programCode, programName, collegeCodes[collegeCode.lower()])
+
+  return importCsv(filePath, PROGRAM_IMPORT_FIELDS, validateRow, Program.findExistingProgramCodes, Program.insertProgramRows, rejectsPath, chunkSize, progressCallback, cancelEvent, jsonLines=jsonLines)
+
+def importCollegesCsv(filePath: Any, rejectsPath: Optional[str] = None, chunkSize: int = IMPORT_CHUNK_SIZE, progressCallback: Optional[Callable] = None, cancelEvent: Any = None, jsonLines: Optional[bool] = None) -> Dict[str, Any]:
+  def validateRow(values: Dict[str, str]):
+    collegeCode, collegeName = values["college_code"], values["college_name"]
+
+    if not all([collegeCode, collegeName]):
+      return "Enter all required fields"
+
+    if len(collegeCode) > MAX_COLLEGE_CODE_LENGTH or len(collegeName) > MAX_NAME_LENGTH:
+      return "College Code or Name is too long"
+
+    return collegeCode, (collegeCode, collegeName)
+
+  return importCsv(filePath, COLLEGE_IMPORT_FIELDS, validateRow, College.findExistingCollegeCodes, College.insertCollegeRows, rejectsPath, chunkSize, progressCallback, cancelEvent, jsonLines=jsonLines)
+
+#--------------------------------------------------------------------------
+
+# Streams a CSV file through validation and chunked inserts, writing rejected rows (plus an Error column) to a side file
+# validateRow returns either an error message or (key, insert parameters)
+# filePath may also be an open binary stream such as stdin; jsonLines reads it as JSON Lines instead of CSV, and is
+# decided by the file extension when left out
+def importCsv(filePath: Any, fields: List[Tuple[str, str]], validateRow: Callable, findExistingKeys: Callable, insertRows: Callable, rejectsPath: Optional[str] = None, chunkSize: int = IMPORT_CHUNK_SIZE, progressCallback: Optional[Callable] = None, cancelEvent: Any = None, optionalFields: Tuple[str, ...] = (), jsonLines: Optional[bool] = None) -> Dict[str, Any]:
+  isStream = hasattr(filePath, "read")
+  if jsonLines is None:
+    jsonLines = not isStream and filePath.lower().endswith(JSON_LINES_EXTENSIONS)
+
+  rejectsPath = rejectsPath or defaultRejectsPath("stdin" if isStream else filePath)
+  summary = {"rowsRead": 0, "imported": 0, "rejected": 0, "rejectsPath": None, "cancelled": False}
+
+  # A stream's size is unknown, so its progress only counts rows
+  totalBytes = 0 if isStream else os.path.getsize(filePath)
+
+  conn = getConnection()
+  if not conn:
+    raise ConnectionError("Could not connect to the database.")
+
+  rawFile = filePath if isStream else open(filePath, "rb")
+  rejectsFile = None
+  rejectsWriter = None
+
+  try:
+    textFile = io.TextIOWrapper(rawFile, encoding="utf-8-sig", newline="")
+    reader = readJsonLines(textFile, fields) if jsonLines else csv.reader(textFile)
+    header = next(reader, None)
+    if header is None:
+      raise ValueError("The CSV file is empty.")
+
+    fieldColumns = mapHeaderToFields(header, fields, optionalFields)
+    seenKeys = set()
+
+    def reject(row, error):
+      nonlocal rejectsFile, rejectsWriter
+      if rejectsWriter is None:
+        rejectsFile = open(rejectsPath, "w", newline="", encoding="utf-8")
+        rejectsWriter = csv.writer(rejectsFile)
+        rejectsWriter.writerow(header + ["Error"])
+        summary["rejectsPath"] = rejectsPath
+
+      rejectsWriter.writerow(row + [error])
+      summary["rejected"] += 1
+
+    for chunk in readChunks(reader, chunkSize):
+      if cancelEvent is not None and cancelEvent.is_set():
+        summary["cancelled"] = True
+        break
+
+      summary["rowsRead"] += len(chunk)
+      validRows = []
+
+      for row in chunk:
+        values = {field: (row[column].strip() if column is not None and column < len(row) else "") for field, column in fieldColumns.items()}
+        result = validateRow(values)
+
+        if isinstance(result, str):
+          reject(row, result)
+          continue
+
+        key, params = result
+        if key.lower() in seenKeys:
+          reject(row, "Duplicate of an earlier row in the file")
+          continue
+
+        seenKeys.add(key.lower())
+        validRows.append((row, key, params))
+
+      # One lookup per chunk for rows that already exist in the database
+      cursor = conn.cursor()
+      try:
+        existingKeys = findExistingKeys(cursor, [key for _, key, _ in validRows])
+      finally:
+        cursor.close()
+
+      insertableRows = []
+      for row, key, params in validRows:
+        if key.lower() in existingKeys:
+          reject(row, "Already exists")
+        else:
+          insertableRows.append((row, params))
+
+      summary["imported"] += insertChunk(conn, insertableRows, insertRows, reject)
+
+      if progressCallback:
+        progressCallback({**summary, "bytesRead": rawFile.tell() if totalBytes else 0, "totalBytes": totalBytes})
+
+  finally:
+    if not isStream:
+      rawFile.close()
+    if rejectsFile:
+      rejectsFile.close()
+    conn.close()
+
+  return summary
+
+# Inserts a chunk in one transaction; if MySQL refuses it, retries row by row so only the offending rows are rejected
+def insertChunk(conn: Any, rows: List[Tuple[List[str], Tuple[Any, ...]]], insertRows: Callable, reject: Callable) -> int:
+  if not rows:
+    return 0
+
+  try:
+    return insertRows(conn, [params for _, params in rows])
+  except Exception:
+    pass
+
+  inserted = 0
+  for row, params in rows:
+    try:
+      inserted += insertRows(conn, [params])
+    except Exception as e:
+      reject(row, str(e))
+
+  return inserted
+
+# Reads JSON Lines as CSV-style rows: the field names as the header, then each object's values in that order
+# A line that is not a JSON object comes through as a row of its own text, so it is rejected instead of stopping the import
+def readJsonLines(textFile: Any, fields: List[Tuple[str, str]]):
+  yield [field for field, _ in fields]
+
+  for line in textFile:
+    if not line.strip():
+      continue
+
+    try:
+      record = json.loads(line)
+    except ValueError:
+      record = None
+
+    if not isinstance(record, dict):
+      yield [line.strip()] + [""] * (len(fields) - 1)
+      continue
+
+    yield ["" if record.get(field) is None else str(record.get(field)) for field, _ in fields]
+
+# Accepts either the display headers ("ID Number") or the column names ("id_number"), in any order and case
+def mapHeaderToFields(header: List[str], fields: List[Tuple[str, str]], optionalFields: Tuple[str, ...] = ()) -> Dict[str, Optional[int]]:
+  normalizedHeader = [normalizeHeader(column) for column in header]
+  fieldColumns = {}
+
+  for field, displayHeader in fields:
+    column = None
+    for name in (normalizeHeader(field), normalizeHeader(displayHeader)):
+      if name in normalizedHeader:
+        column = normalizedHeader.index(name)
+        break
+    fieldColumns[field] = column
+
+  missing = [displayHeader for field, displayHeader in fields if fieldColumns[field] is None and field not in optionalFields]
+  if missing:
+    raise ValueError(f"Missing CSV columns: {', '.join(missing)}")
+
+  return fieldColumns
+
+def normalizeHeader(name: str) -> str:
+  return name.strip().lower().replace("_", " ")
+
+def readChunks(reader: Any, chunkSize: int):
+  chunk = []
+  for row in reader:
+    # Blank lines are skipped rather than rejected
+    if not any(cell.strip() for cell in row):
+      continue
+
+    chunk.append(row)
+    if len(chunk) >= chunkSize:
+      yield chunk
+      chunk = []
+
+  if chunk:
+    yield chunk
+
+def defaultRejectsPath(filePath: str) -> str:
+  root, _ = os.path.splitext(filePath)
+  return f"{root}.rejects.csv"
@@ -1,6 +1,8 @@
 from model.Program import Program
 from model.College import College
-from typing import List, Dict, Tuple, Any
+from database.referenceCache import referenceCache
+from database.batch import batchMessage
+from typing import List, Dict, Tuple, Any, Iterator
 from utils.inputUtils import *
 
 PROGRAM_SEARCH_FIELDS = ["program_code", "program_name", "college_code"]
@@ -20,8 +22,22 @@ def addProgram(programCode: str, programName: str, collegeCode: str) -> bool:
 
   return "Program added successfully." if isSuccessful else "Failed to add program."
 
-def getPrograms(page=1, perPage=50, sortBy1="program_code", sortBy2="program_name", sortOrder="ASC", searchField=None, searchTerm="") -> Tuple[List[Dict[str, str]], int]:
-  return Program.getProgramRecords(page, perPage, sortBy1, sortBy2, sortOrder, searchField, searchTerm)
+def getPrograms(page=1, perPage=50, sortBy1="program_code", sortBy2="program_name", sortOrder="ASC", searchField=None, searchTerm="", approximateCount=False) -> Tuple[List[Dict[str, str]], int]:
+  return Program.getProgramRecords(page, perPage, sortBy1, sortBy2, sortOrder, searchField, searchTerm, approximateCount)
+
+# Every program code under a college, served from memory for the combo boxes
+def getProgramCodesByCollege(collegeCode: str) -> List[str]:
+  return referenceCache.programCodes(collegeCode)
+
+def countPrograms(searchField=None, searchTerm="") -> int:
+  return Program.countProgramRecords(searchField, searchTerm)
+
+# Batches of every program matching a search, streamed instead of paged
+def iterPrograms(sortBy1="program_code", sortBy2="program_name", sortOrder="ASC", searchField=None, searchTerm="", batchSize=1000) -> Iterator[List[Dict[str, Any]]]:
+  return Program.iterProgramRecords(sortBy1, sortBy2, sortOrder, searchField, searchTerm, batchSize)
+
+def isProgramCountExact(searchField=None, searchTerm="") -> bool:
+  return Program.isCountCached(searchField, searchTerm)
 
 def updateProgram(originalProgramCode: str, newProgramCode: Any, newProgramName: Any, newCollegeCode: Any) -> bool:
   
@@ -46,7 +62,9 @@ def removeProgram(programCode: str) -> str:
 
   return "Program removed successfully." if isSuccessful else "Failed to remove program." 
 
-def batchRemovePrograms(programCodes: List[str]) -> str:
-  isSuccesful = Program.removeBatchProgramRecordsById(programCodes)
+# Returns the batch summary from the model with a "message" for the status bar
+def batchRemovePrograms(programCodes: List[str], progressCallback=None, cancelEvent=None) -> Dict[str, Any]:
+  summary = Program.removeBatchProgramRecordsById(programCodes, progressCallback=progressCallback, cancelEvent=cancelEvent)
+  summary["message"] = batchMessage(summary, "Programs removed successfully.", "removed", "programs")
 
-  return "Programs removed successfully." if isSuccesful else "Failed to remove programs."
\ No newline at end of file
+  return summary
\ No newline at end of file
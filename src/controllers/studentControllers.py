@@ -1,11 +1,19 @@
 from model.Student import Student
-from model.Program import Program
-from model.College import College
-from typing import List, Dict, Tuple, Any
+from database.db import transaction
+from database.batch import batchMessage, rejectedBatch
+from typing import List, Dict, Tuple, Any, Optional, Iterator
 from utils.inputUtils import *
 
 STUDENT_SEARCH_FIELDS = ["id_number", "first_name", "last_name", "program_code", "college_code"]
 
+# MySQL error numbers for a duplicate key and a missing foreign key row
+DUPLICATE_KEY_ERROR = 1062
+MISSING_REFERENCE_ERROR = 1452
+
+# Raised inside a transaction to roll it back with a message for the user
+class StudentValidationError(Exception):
+  pass
+
 def addStudent(idNumber: str, firstName: str, lastName: str, yearLevel: str, gender: str, programCode: str, collegeCode: str) -> str:
   if not all([idNumber, firstName, lastName, gender, programCode]):
     return("Enter all required fields")
@@ -22,22 +30,35 @@ def addStudent(idNumber: str, firstName: str, lastName: str, yearLevel: str, gen
   if not validateGender(gender):
     return "Gender must be Male, Female, or Others."
   
-  if Student.idNumberExists(idNumber):
-    return "ID number already exists"
-
-  if not Program.programCodeExists(programCode):
-    return "Program Code does not exist"
-  
-  if not College.collegeCodeExists(collegeCode):
-    return "College Code does not exist"
-  
   newStudent = Student(idNumber, firstName, lastName, yearLevel, gender, programCode, collegeCode)
-  isSuccessful = Student.addStudentRecord(newStudent)
+
+  # The checks and the insert share one connection and transaction; the keys catch anything that changes in between
+  try:
+    with transaction(invalidates=("students",)) as cursor:
+      references = Student.checkStudentReferences(cursor, idNumber, programCode, collegeCode)
+      validateStudentReferences(references)
+
+      isSuccessful = Student.insertStudent(cursor, newStudent)
+
+  except StudentValidationError as e:
+    return str(e)
+  except Exception as e:
+    return constraintErrorMessage(e) or "Failed to add student."
 
   return "Student added successfully." if isSuccessful else "Failed to add student."
 
-def getStudents(page=1, perPage=50, sortBy1="id_number", sortBy2="last_name", sortOrder="ASC", searchField=None, searchTerm="") -> Tuple[List[Dict[str, str]], int]:
-  return Student.getStudentRecords(page, perPage, sortBy1, sortBy2, sortOrder, searchField, searchTerm)
+def getStudents(page=1, perPage=50, sortBy1="id_number", sortBy2="last_name", sortOrder="ASC", searchField=None, searchTerm="", seekCursor=None, seekDirection="next", approximateCount=False) -> Tuple[List[Dict[str, str]], int]:
+  return Student.getStudentRecords(page, perPage, sortBy1, sortBy2, sortOrder, searchField, searchTerm, seekCursor, seekDirection, approximateCount)
+
+def countStudents(searchField=None, searchTerm="") -> int:
+  return Student.countStudentRecords(searchField, searchTerm)
+
+# Batches of every student matching a search, streamed instead of paged
+def iterStudents(sortBy1="id_number", sortBy2="last_name", sortOrder="ASC", searchField=None, searchTerm="", batchSize=1000) -> Iterator[List[Dict[str, Any]]]:
+  return Student.iterStudentRecords(sortBy1, sortBy2, sortOrder, searchField, searchTerm, batchSize)
+
+def isStudentCountExact(searchField=None, searchTerm="") -> bool:
+  return Student.isCountCached(searchField, searchTerm)
 
 def updateStudent(originalId, newIdNumber: str, newFirstName: str, newLastName: str, newYearLevel: int, newGender: str, newProgramCode: str, newCollegeCode: str, validateParameters: bool) -> str:
   if validateParameters:
@@ -59,12 +80,6 @@ def updateStudent(originalId, newIdNumber: str, newFirstName: str, newLastName:
   if newGender and not validateGender(newGender):
     return "Gender must be Male, Female, or Other."
   
-  if newProgramCode and not Program.programCodeExists(newProgramCode):
-    return "Program Code does not exist"
-  
-  if newCollegeCode and not College.collegeCodeExists(newCollegeCode):
-    return "College Code does not exist"
-  
   updateData = {
     key: value
     for key, value in {
@@ -78,46 +93,132 @@ def updateStudent(originalId, newIdNumber: str, newFirstName: str, newLastName:
     if value is not None
   }
 
-  isSuccessful = Student.updateStudentRecordById(originalId, updateData)
+  # A new ID number only needs checking when it differs from the current one
+  newIdToCheck = newIdNumber if newIdNumber and newIdNumber != originalId else None
+
+  try:
+    with transaction(invalidates=("students",)) as cursor:
+      references = Student.checkStudentReferences(cursor, newIdToCheck, newProgramCode or None, newCollegeCode or None)
+      validateStudentReferences(references)
+
+      isSuccessful = Student.updateStudent(cursor, originalId, updateData)
+
+  except StudentValidationError as e:
+    return str(e)
+  except Exception as e:
+    return constraintErrorMessage(e) or "Failed to update student."
 
   return "Student updated successfully." if isSuccessful else "Failed to update student."
 
-def batchUpdateStudents(studentIds: List[str], newYearLevel: int, newGender: str, newProgramCode: str, newCollegeCode: str, validateParameters: bool) -> str:
+# Returns the batch summary from the model with a "message" for the status bar
+def batchUpdateStudents(studentIds: List[str], newYearLevel: int, newGender: str, newProgramCode: str, newCollegeCode: str, validateParameters: bool, progressCallback=None, cancelEvent=None) -> Dict[str, Any]:
+  updateData, error = buildBatchUpdateData(newYearLevel, newGender, newProgramCode, newCollegeCode, validateParameters)
+  if error:
+    return rejectedBatch(studentIds, error)
+
+  if not studentIds:
+    return rejectedBatch(studentIds, "Failed to update students.")
+
+  # Checked once up front; the program's foreign key catches one removed while the chunks run
+  try:
+    with transaction() as cursor:
+      references = Student.checkStudentReferences(cursor, None, newProgramCode or None, newCollegeCode or None)
+      validateStudentReferences(references)
+
+  except StudentValidationError as e:
+    return rejectedBatch(studentIds, str(e))
+  except Exception as e:
+    return rejectedBatch(studentIds, constraintErrorMessage(e) or "Failed to update students.")
+
+  summary = Student.updateBatchStudentRecordsById(studentIds, updateData, progressCallback=progressCallback, cancelEvent=cancelEvent)
+  summary["message"] = batchMessage(summary, "Students updated successfully.", "updated", "students")
+
+  return summary
+
+# Applies an update to every student matching a search with one set-based UPDATE, instead of id by id
+# expectedCount is the total the user confirmed; if the search matches a different number by now, nothing is written
+def updateMatchingStudents(searchField, searchTerm: str, expectedCount: Optional[int], newYearLevel: int, newGender: str, newProgramCode: str, newCollegeCode: str, validateParameters: bool, progressCallback=None, cancelEvent=None) -> Dict[str, Any]:
+  updateData, error = buildBatchUpdateData(newYearLevel, newGender, newProgramCode, newCollegeCode, validateParameters)
+  if error:
+    return {"affected": 0, "cancelled": False, "error": error, "message": error}
+
+  if cancelEvent is not None and cancelEvent.is_set():
+    return {"affected": 0, "cancelled": True, "error": None, "message": "Update cancelled."}
+
+  try:
+    with transaction(invalidates=("students",)) as cursor:
+      references = Student.checkStudentReferences(cursor, None, newProgramCode or None, newCollegeCode or None)
+      validateStudentReferences(references)
+
+      matchingCount = Student.fetchStudentCount(cursor, searchField, searchTerm)
+      validateMatchingCount(matchingCount, expectedCount)
+
+      Student.updateStudentRecordsBySearch(cursor, searchField, searchTerm, updateData)
+
+  except StudentValidationError as e:
+    return {"affected": 0, "cancelled": False, "error": str(e), "message": str(e)}
+  except Exception as e:
+    message = constraintErrorMessage(e) or "Failed to update students."
+    return {"affected": 0, "cancelled": False, "error": message, "message": message}
+
+  # MySQL only counts rows whose values changed, so the matching count is reported instead
+  return {"affected": matchingCount, "cancelled": False, "error": None, "message": f"Updated {matchingCount:,} students."}
+
+# Deletes every student matching a search with one DELETE; expectedCount works as in updateMatchingStudents
+def removeMatchingStudents(searchField, searchTerm: str, expectedCount: Optional[int], progressCallback=None, cancelEvent=None) -> Dict[str, Any]:
+  if cancelEvent is not None and cancelEvent.is_set():
+    return {"affected": 0, "cancelled": True, "error": None, "message": "Removal cancelled."}
+
+  try:
+    with transaction(invalidates=("students",)) as cursor:
+      validateMatchingCount(Student.fetchStudentCount(cursor, searchField, searchTerm), expectedCount)
+
+      removedCount = Student.deleteStudentRecordsBySearch(cursor, searchField, searchTerm)
+
+  except StudentValidationError as e:
+    return {"affected": 0, "cancelled": False, "error": str(e), "message": str(e)}
+  except Exception as e:
+    message = constraintErrorMessage(e) or "Failed to remove students."
+    return {"affected": 0, "cancelled": False, "error": message, "message": message}
+
+  return {"affected": removedCount, "cancelled": False, "error": None, "message": f"Removed {removedCount:,} students."}
+
+# Validates the fields of a batch update and returns (updateData, error message)
+def buildBatchUpdateData(newYearLevel: int, newGender: str, newProgramCode: str, newCollegeCode: str, validateParameters: bool) -> Tuple[Dict[str, Any], Optional[str]]:
   if validateParameters:
     if newProgramCode is None:
-      return "Select a Valid Program Code"
+      return {}, "Select a Valid Program Code"
     if newCollegeCode is None:
-      return "Select a Valid College Code"
+      return {}, "Select a Valid College Code"
 
   if isinstance(newYearLevel, str) and newYearLevel.isdigit():
     newYearLevel = int(newYearLevel)
 
   if newYearLevel and not validateYearLevel(newYearLevel):
-    return "Year Level must be a positive integer."
+    return {}, "Year Level must be a positive integer."
 
   if newGender and not validateGender(newGender):
-    return "Gender must be Male, Female, or Other."
-
-  if newProgramCode and not Program.programCodeExists(newProgramCode):
-    return "Program Code does not exist"
-
-  if newCollegeCode and not College.collegeCodeExists(newCollegeCode):
-    return "College Code does not exist"
+    return {}, "Gender must be Male, Female, or Other."
 
+  # The college follows from the program, so it is only validated
   updateData = {
     key: value
     for key, value in {
       "year_level": newYearLevel,
       "gender": newGender,
       "program_code": newProgramCode,
-      "college_code": newCollegeCode
     }.items()
     if value is not None 
   }
 
-  isSuccessful = Student.updateBatchStudentRecordsById(studentIds, updateData)
+  if not updateData:
+    return {}, "Failed to update students."
+
+  return updateData, None
 
-  return "Students updated successfully." if isSuccessful else "Failed to update students."
+def validateMatchingCount(matchingCount: int, expectedCount: Optional[int]) -> None:
+  if expectedCount is not None and matchingCount != expectedCount:
+    raise StudentValidationError(f"The search now matches {matchingCount:,} students instead of {expectedCount:,}. Refresh and try again.")
 
 def removeStudent(idNumber: str) -> str:
   if not validateIdNumber(idNumber):
@@ -127,7 +228,33 @@ def removeStudent(idNumber: str) -> str:
 
   return "Student removed successfully." if isSuccessful else "Failed to remove student."
 
-def batchRemoveStudents(idNumbers: List[str]) -> str:
-  isSuccesful = Student.removeBatchStudentRecordsById(idNumbers)
+# Returns the batch summary from the model with a "message" for the status bar
+def batchRemoveStudents(idNumbers: List[str], progressCallback=None, cancelEvent=None) -> Dict[str, Any]:
+  summary = Student.removeBatchStudentRecordsById(idNumbers, progressCallback=progressCallback, cancelEvent=cancelEvent)
+  summary["message"] = batchMessage(summary, "Students removed successfully.", "removed", "students")
+
+  return summary
+
+# Turns failed reference checks into the message shown to the user
+def validateStudentReferences(references: Dict[str, Any]) -> None:
+  if references["idNumberExists"]:
+    raise StudentValidationError("ID number already exists")
+
+  if references["programCodeExists"] is False:
+    raise StudentValidationError("Program Code does not exist")
+
+  if references["collegeCodeExists"] is False:
+    raise StudentValidationError("College Code does not exist")
+
+# Messages for key violations that slipped past the checks because another write landed first
+def constraintErrorMessage(error: Exception) -> Optional[str]:
+  errorNumber = getattr(error, "errno", None)
+
+  if errorNumber == DUPLICATE_KEY_ERROR:
+    return "ID number already exists"
+
+  if errorNumber == MISSING_REFERENCE_ERROR:
+    return "Program Code does not exist"
 
-  return "Students removed successfully." if isSuccesful else "Failed to remove students."
\ No newline at end of file
+  print(f"Student Controller Error: {error}")
+  return None
@@ -0,0 +1,63 @@
+import os
+from typing import List, Tuple, Any, Optional
+
+# The storage engine under the models; both engines hand out connections that behave like mysql-connector's
+# (cursor(dictionary=True), %s placeholders, start_transaction, commit, rollback), so the model SQL is shared
+# and only the differences below are asked of the backend
+BACKENDS = ["mysql", "sqlite"]
+
+class StorageBackend:
+  name = ""
+
+  # Exceptions the engine raises when it cannot hand out a connection
+  errorTypes: Tuple[type, ...] = ()
+
+  # Appended to the SELECT that locks the rows a batch chunk is about to write
+  lockClause = ""
+
+  # Whether UPDATE and DELETE can join other tables (the student source without its own college column needs it)
+  joinedWrites = False
+
+  # Columns whose sort order is not their text order, as (comparison expression, value expression) for keyset seeks
+  seekOrdinalExpressions = {}
+
+  def connect(self) -> Any:
+    raise NotImplementedError
+
+  # Creates the base tables; indexes and later changes come from migrate()
+  def createTables(self, cursor: Any) -> None:
+    raise NotImplementedError
+
+  # Applies (or with dryRun only plans) the pending migrations; returns (version, description, statements) for each
+  def migrate(self, cursor: Any, dryRun: bool = False) -> List[Tuple[int, str, List[str]]]:
+    raise NotImplementedError
+
+  def indexExists(self, cursor: Any, table: str, indexName: str) -> bool:
+    raise NotImplementedError
+
+  def columnExists(self, cursor: Any, table: str, column: str) -> bool:
+    raise NotImplementedError
+
+  # A cheap, possibly stale row count, or None when the engine has none to offer
+  def estimateRowCount(self, cursor: Any, table: str) -> Optional[int]:
+    return None
+
+def resolveBackendName(requested: str) -> str:
+  requested = (requested or "mysql").lower()
+
+  if requested not in BACKENDS:
+    print(f"Unknown DB_BACKEND {requested!r}, expected one of {', '.join(BACKENDS)}; using mysql")
+    return "mysql"
+
+  return requested
+
+# Each engine is imported only when chosen, so running on SQLite never touches the MySQL driver and vice versa
+def createBackend(name: str) -> StorageBackend:
+  if resolveBackendName(name) == "sqlite":
+    from database.sqliteBackend import SQLiteBackend
+    return SQLiteBackend()
+
+  from database.mysqlBackend import MySQLBackend
+  return MySQLBackend()
+
+DB_BACKEND = resolveBackendName(os.getenv("DB_BACKEND", "mysql"))
@@ -0,0 +1,173 @@
+import os
+from typing import List, Dict, Any, Callable, Iterator, Optional, Sequence, Tuple
+
+from database.db import transaction, getBackend
+
+BATCH_CHUNK_SIZE = int(os.getenv("DB_BATCH_CHUNK_SIZE", "500"))
+
+class BatchCancelled(Exception):
+  pass
+
+# Runs a write over a list of keys chunkSize keys at a time, so no statement carries more than chunkSize placeholders
+# and row locks are only held on one chunk at a time
+# applyChunk(cursor, keys) writes the keys of a chunk that exist; each chunk first locks its rows and reads back which
+# keys are there, so every key ends up in succeeded, failed (with a reason) or pending
+# By default each chunk commits on its own: a cancelled or interrupted batch keeps the chunks already written and lists
+# the keys it never reached under pending, so running it again with those resumes it. With singleTransaction the
+# whole batch commits or rolls back together.
+# A chunk MySQL refuses is retried key by key, so only the offending keys fail
+def runBatch(table: str, keyColumn: str, keys: Sequence[Any], applyChunk: Callable, chunkSize: int = BATCH_CHUNK_SIZE, singleTransaction: bool = False, progressCallback: Optional[Callable] = None, cancelEvent: Any = None) -> Dict[str, Any]:
+  keys = uniqueKeys(keys)
+  summary = {"total": len(keys), "processed": 0, "succeeded": [], "failed": {}, "pending": [], "cancelled": False, "error": None}
+  chunks = list(chunkKeys(keys, max(1, chunkSize)))
+
+  def reportProgress():
+    if progressCallback:
+      progressCallback({"processed": summary["processed"], "total": summary["total"], "succeeded": len(summary["succeeded"]), "failed": len(summary["failed"])})
+
+  if singleTransaction:
+    return runSingleTransaction(table, keyColumn, chunks, applyChunk, summary, reportProgress, cancelEvent)
+
+  for index, chunk in enumerate(chunks):
+    if cancelEvent is not None and cancelEvent.is_set():
+      summary["cancelled"] = True
+      summary["pending"] = [key for remaining in chunks[index:] for key in remaining]
+      break
+
+    try:
+      with transaction(invalidates=(table,)) as cursor:
+        succeeded, missing = applyLockedChunk(cursor, table, keyColumn, chunk, applyChunk)
+
+    except ConnectionError as e:
+      summary["error"] = str(e)
+      summary["pending"] = [key for remaining in chunks[index:] for key in remaining]
+      break
+
+    except Exception:
+      succeeded, missing = applyKeyByKey(table, keyColumn, chunk, applyChunk, summary)
+
+    summary["succeeded"] += succeeded
+    summary["failed"].update({key: "Not found" for key in missing})
+    summary["processed"] += len(chunk)
+    reportProgress()
+
+  return summary
+
+# All chunks share one transaction; any failure or a cancel rolls every chunk back
+def runSingleTransaction(table: str, keyColumn: str, chunks: List[List[Any]], applyChunk: Callable, summary: Dict[str, Any], reportProgress: Callable, cancelEvent: Any) -> Dict[str, Any]:
+  keys = [key for chunk in chunks for key in chunk]
+  succeeded = []
+  failed = {}
+
+  try:
+    with transaction(invalidates=(table,)) as cursor:
+      for chunk in chunks:
+        if cancelEvent is not None and cancelEvent.is_set():
+          raise BatchCancelled()
+
+        try:
+          chunkSucceeded, missing = applyLockedChunk(cursor, table, keyColumn, chunk, applyChunk)
+        except ConnectionError:
+          raise
+        except Exception:
+          # A failed statement only undoes itself, so the keys can still be tried one by one inside the transaction
+          chunkSucceeded, missing = [], []
+          for key in chunk:
+            try:
+              keySucceeded, keyMissing = applyLockedChunk(cursor, table, keyColumn, [key], applyChunk)
+              chunkSucceeded += keySucceeded
+              missing += keyMissing
+            except Exception as e:
+              failed[key] = str(e)
+
+        succeeded += chunkSucceeded
+        failed.update({key: "Not found" for key in missing})
+        summary["processed"] += len(chunk)
+        summary["failed"] = failed
+        reportProgress()
+
+      if failed:
+        raise BatchCancelled()
+
+  except BatchCancelled:
+    if not failed:
+      summary.update({"processed": 0, "cancelled": True, "pending": keys, "failed": {}})
+      return summary
+
+    summary["failed"] = {key: failed.get(key, "Rolled back with the rest of the batch") for key in keys}
+    return summary
+
+  except ConnectionError as e:
+    summary.update({"processed": 0, "pending": keys, "failed": {}, "error": str(e)})
+    return summary
+
+  summary["succeeded"] = succeeded
+  return summary
+
+# Gives each key of a refused chunk its own transaction so the rest of the chunk still commits
+def applyKeyByKey(table: str, keyColumn: str, chunk: List[Any], applyChunk: Callable, summary: Dict[str, Any]) -> Tuple[List[Any], List[Any]]:
+  succeeded = []
+  missing = []
+
+  for key in chunk:
+    try:
+      with transaction(invalidates=(table,)) as cursor:
+        keySucceeded, keyMissing = applyLockedChunk(cursor, table, keyColumn, [key], applyChunk)
+      succeeded += keySucceeded
+      missing += keyMissing
+    except Exception as e:
+      summary["failed"][key] = str(e)
+
+  return succeeded, missing
+
+# Locks the rows of the chunk that exist and applies the write to them; returns (written keys, missing keys)
+def applyLockedChunk(cursor: Any, table: str, keyColumn: str, chunk: List[Any], applyChunk: Callable) -> Tuple[List[Any], List[Any]]:
+  placeholders = ", ".join(["%s"] * len(chunk))
+  cursor.execute(f"SELECT {keyColumn} FROM {table} WHERE {keyColumn} IN ({placeholders}){getBackend().lockClause}", tuple(chunk))
+
+  # Keys compare case-insensitively, like the table collation does
+  existingKeys = {str(row[keyColumn] if isinstance(row, dict) else row[0]).lower() for row in cursor.fetchall()}
+
+  found = [key for key in chunk if str(key).lower() in existingKeys]
+  missing = [key for key in chunk if str(key).lower() not in existingKeys]
+
+  if found:
+    applyChunk(cursor, found)
+
+  return found, missing
+
+def chunkKeys(keys: List[Any], chunkSize: int) -> Iterator[List[Any]]:
+  for start in range(0, len(keys), chunkSize):
+    yield keys[start:start + chunkSize]
+
+def uniqueKeys(keys: Sequence[Any]) -> List[Any]:
+  seenKeys = set()
+  unique = []
+
+  for key in keys:
+    if str(key).lower() not in seenKeys:
+      seenKeys.add(str(key).lower())
+      unique.append(key)
+
+  return unique
+
+# A summary for a batch rejected before it started, with every key failed for the same reason
+def rejectedBatch(keys: Sequence[Any], message: str) -> Dict[str, Any]:
+  keys = uniqueKeys(keys)
+  return {"total": len(keys), "processed": 0, "succeeded": [], "failed": {key: message for key in keys}, "pending": [], "cancelled": False, "error": None, "message": message}
+
+# The status bar message for a finished batch, e.g. "Removed 480 of 500 students, 20 failed."
+def batchMessage(summary: Dict[str, Any], successMessage: str, verb: str, noun: str) -> str:
+  if summary.get("error"):
+    return f"{verb.capitalize()} {len(summary['succeeded']):,} of {summary['total']:,} {noun} before an error: {summary['error']}"
+
+  if not summary["failed"] and not summary["pending"]:
+    return successMessage
+
+  message = f"{verb.capitalize()} {len(summary['succeeded']):,} of {summary['total']:,} {noun}"
+  if summary["failed"]:
+    message += f", {len(summary['failed']):,} failed"
+  if summary["cancelled"]:
+    message += f", cancelled with {len(summary['pending']):,} left"
+
+  return f"{message}."
@@ -1,59 +1,184 @@
+import os
+import threading
+from contextlib import contextmanager
+
 from dotenv import load_dotenv
-import mysql.connector
+
+from database.pool import ConnectionPool, PoolError
+from database.queryCache import invalidateTable
+from database.backend import StorageBackend, DB_BACKEND, createBackend, resolveBackendName
 
 load_dotenv()
 
+# MySQL by default; DB_BACKEND=sqlite runs on an embedded database file instead (see database/backend.py)
+_backend = createBackend(DB_BACKEND)
+
+# Pool settings can be tuned through the environment (or .env)
+POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+POOL_IDLE_TIMEOUT = float(os.getenv("DB_POOL_IDLE_TIMEOUT", "300"))
+POOL_CHECKOUT_TIMEOUT = float(os.getenv("DB_POOL_CHECKOUT_TIMEOUT", "10"))
+POOL_PING_INTERVAL = float(os.getenv("DB_POOL_PING_INTERVAL", "5"))
+
+_pool = None
+_poolLock = threading.Lock()
+
+def _connect():
+  return _backend.connect()
+
+def getPool() -> ConnectionPool:
+  global _pool
+
+  with _poolLock:
+    if _pool is None:
+      _pool = ConnectionPool(
+        _connect,
+        minSize=POOL_MIN_SIZE,
+        maxSize=POOL_MAX_SIZE,
+        idleTimeout=POOL_IDLE_TIMEOUT,
+        checkoutTimeout=POOL_CHECKOUT_TIMEOUT,
+        pingInterval=POOL_PING_INTERVAL,
+      )
+      _pool.prefill()
+
+    return _pool
+
+# Checks a connection out of the pool; calling close() on it hands it back
 def getConnection():
   try:
-    conn = mysql.connector.connect(
-      host="localhost", 
-      user="root",
-      password="Threepoint14.",
-      database="lexis_db",
-      use_pure=True
-    )
-    return conn
-  except mysql.connector.Error as e:
+    return getPool().acquire()
+  except _backend.errorTypes + (PoolError,) as e:
     print(f"Error: {e}")
     return None
 
+def getPoolStats():
+  return getPool().stats() if _pool is not None else {}
+
+def getBackend() -> StorageBackend:
+  return _backend
+
+# Switches the storage engine for every connection opened from now on; connections already in the pool are closed
+# and every cached count is dropped, since it was counted on the other engine
+def setBackend(name: str) -> str:
+  global _backend
+
+  closePool()
+  _backend = createBackend(resolveBackendName(name))
+
+  for table in ("colleges", "programs", "students"):
+    invalidateTable(table)
+
+  return _backend.name
+
+# The mysql-connector driver mode, or None on an engine other than MySQL
+def getDriverMode():
+  return getattr(_backend, "driverMode", None)
+
+# Switches the driver for every connection opened from now on; connections already in the pool are closed
+def setDriverMode(mode: str):
+  if not hasattr(_backend, "setDriverMode"):
+    print(f"DB_DRIVER only applies to the MySQL backend, not {_backend.name}")
+    return None
+
+  driverMode = _backend.setDriverMode(mode)
+  closePool()
+  return driverMode
+
+def closePool():
+  global _pool
+
+  with _poolLock:
+    if _pool is not None:
+      _pool.close()
+      _pool = None
+
+# Runs a block of statements on one connection in one transaction: commits if the block finishes, rolls back if it raises
+# The listed tables are invalidated in the query caches only once the commit has gone through
+@contextmanager
+def transaction(invalidates=()):
+  conn = getConnection()
+  if not conn:
+    raise ConnectionError("Could not connect to the database.")
+
+  cursor = conn.cursor(dictionary=True)
+
+  try:
+    conn.start_transaction()
+    yield cursor
+    conn.commit()
+  except BaseException:
+    conn.rollback()
+    raise
+  finally:
+    cursor.close()
+    conn.close()
+
+  for table in invalidates:
+    invalidateTable(table)
+
+# Streams a SELECT on an unbuffered cursor in lists of up to batchSize rows, so memory stays flat however many rows match
+# buildQuery(cursor) returns (query, params) and may run its own lookups on the cursor first
+# With textOnly, every value comes back as a string in the "raw" driver mode, which skips the driver's type conversion
+def streamQuery(buildQuery, batchSize=1000, textOnly=False):
+  conn = getConnection()
+  if not conn:
+    raise ConnectionError("Could not connect to the database.")
+
+  cursor = conn.cursor(dictionary=True)
+  finished = False
+
+  try:
+    query, params = buildQuery(cursor)
+
+    raw = textOnly and getDriverMode() == "raw"
+    if raw:
+      cursor.close()
+      cursor = conn.cursor(raw=True)
+
+    cursor.execute(query, params)
+
+    while True:
+      rows = cursor.fetchmany(batchSize)
+      if not rows:
+        break
+
+      if raw:
+        columns = cursor.column_names
+        rows = [dict(zip(columns, [value.decode() if isinstance(value, (bytes, bytearray)) else value for value in row])) for row in rows]
+
+      yield rows
+
+    finished = True
+  finally:
+    # Returning a half-read connection would mean reading the rest of the result first
+    if finished:
+      cursor.close()
+      conn.close()
+    else:
+      conn.discard()
+
+# Row count estimate from table statistics; cheap but only approximate
+def estimateRowCount(cursor, table: str):
+  try:
+    return _backend.estimateRowCount(cursor, table)
+  except Exception as e:
+    print(f"Error estimating row count for {table}: {e}")
+    return None
+
 def initDatabase():
   conn = getConnection()
   cursor = conn.cursor()
 
-  cursor.execute("""
-    CREATE TABLE IF NOT EXISTS colleges (
-      college_code VARCHAR(10) PRIMARY KEY NOT NULL, 
-      college_name VARCHAR(255) NOT NULL
-      )
-  """)
-  
-  cursor.execute("""
-    CREATE TABLE IF NOT EXISTS programs (
-      program_code VARCHAR(50) PRIMARY KEY NOT NULL, 
-      program_name VARCHAR(255) NOT NULL,
-      college_code VARCHAR(10),
-      FOREIGN KEY (college_code) REFERENCES colleges(college_code) 
-        ON DELETE SET NULL 
-        ON UPDATE CASCADE
-      )
-  """)
-
-  cursor.execute("""
-    CREATE TABLE IF NOT EXISTS students (
-      id_number VARCHAR(9) NOT NULL PRIMARY KEY CHECK (id_number REGEXP '^[0-9]{4}-[0-9]{4}$'),
-      first_name VARCHAR(255) NOT NULL,
-      last_name VARCHAR(255) NOT NULL,
-      year_level INT CHECK (year_level BETWEEN 1 AND 5) NOT NULL,
-      gender ENUM('Male', 'Female', 'Other') NOT NULL,
-      program_code VARCHAR(50),
-      FOREIGN KEY (program_code) REFERENCES programs(program_code) 
-        ON DELETE SET NULL 
-        ON UPDATE CASCADE
-      )
-  """)
+  _backend.createTables(cursor)
+
+  # Indexes and later schema changes are versioned in database/migrations.py
+  try:
+    for version, description, _ in _backend.migrate(cursor):
+      print(f"Applied migration {version}: {description}")
+  except Exception as e:
+    print(f"Error migrating database: {e}")
 
   conn.commit()
   conn.close()
   
-  print("Database connection successful!")
\ No newline at end of file
+  print("Database connection successful!")
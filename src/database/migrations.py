@@ -0,0 +1,209 @@
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Tuple, Callable, Any
+
+# Versioned schema changes applied on top of the tables initDatabase creates
+# Each migration plans its statements from what is already in the database, so re-running one is harmless
+# MySQL commits DDL implicitly, so a migration that fails halfway is finished by running it again
+
+def indexExists(cursor, table: str, indexName: str) -> bool:
+  cursor.execute("""
+    SELECT 1 FROM information_schema.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+    LIMIT 1
+  """, (table, indexName))
+  return cursor.fetchone() is not None
+
+def tableExists(cursor, table: str) -> bool:
+  cursor.execute("""
+    SELECT 1 FROM information_schema.TABLES
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+    LIMIT 1
+  """, (table,))
+  return cursor.fetchone() is not None
+
+def columnExists(cursor, table: str, column: str) -> bool:
+  cursor.execute("""
+    SELECT 1 FROM information_schema.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+    LIMIT 1
+  """, (table, column))
+  return cursor.fetchone() is not None
+
+def constraintExists(cursor, table: str, constraintName: str) -> bool:
+  cursor.execute("""
+    SELECT 1 FROM information_schema.TABLE_CONSTRAINTS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND CONSTRAINT_NAME = %s
+    LIMIT 1
+  """, (table, constraintName))
+  return cursor.fetchone() is not None
+
+def triggerExists(cursor, triggerName: str) -> bool:
+  cursor.execute("""
+    SELECT 1 FROM information_schema.TRIGGERS
+    WHERE TRIGGER_SCHEMA = DATABASE() AND TRIGGER_NAME = %s
+    LIMIT 1
+  """, (triggerName,))
+  return cursor.fetchone() is not None
+
+# Plans CREATE INDEX statements for whichever of the (table, index name, columns) entries are missing
+def createIndexes(indexes: List[Tuple[str, str, str]]) -> Callable[[Any], List[str]]:
+  def plan(cursor) -> List[str]:
+    return [f"CREATE INDEX {indexName} ON {table} ({columns})" for table, indexName, columns in indexes if not indexExists(cursor, table, indexName)]
+
+  return plan
+
+# The n-gram FULLTEXT index that serves the "Any" student search
+def createStudentSearchIndex(cursor) -> List[str]:
+  if indexExists(cursor, "students", "ft_students_search"):
+    return []
+
+  return [
+    # The default stopword list would drop every n-gram containing a letter like "a" or "i"
+    "SET SESSION innodb_ft_enable_stopword = OFF",
+    """CREATE FULLTEXT INDEX ft_students_search
+    ON students (id_number, first_name, last_name, program_code)
+    WITH PARSER ngram""",
+  ]
+
+# One index per sort option of the tables, (sort field, tie-breaker); InnoDB appends the primary key, which the
+# keyset pages use as their last tie-breaker. Every searchable column leads one of these or is a primary key,
+# so exact and prefix matches on it are range scans too.
+# Sorting students by college is indexed once migration 3 gives students a college column of their own.
+SORT_INDEXES = [
+  ("students", "idx_students_first_last", "first_name, last_name"),
+  ("students", "idx_students_last_first", "last_name, first_name"),
+  ("students", "idx_students_gender_last", "gender, last_name"),
+  ("students", "idx_students_year_last", "year_level, last_name"),
+  ("students", "idx_students_program_last", "program_code, last_name"),
+  ("programs", "idx_programs_name_college", "program_name, college_code"),
+  ("programs", "idx_programs_college_name", "college_code, program_name"),
+  ("colleges", "idx_colleges_name", "college_name"),
+]
+
+# Copies each student's college onto students.college_code so listings need no join to programs and colleges
+# Student writes fill it from the program through triggers, and so do changes to a program's college.
+# Renaming or deleting a college reaches it through its own foreign key, since cascades do not fire triggers.
+STUDENT_COLLEGE_TRIGGERS = [
+  ("trg_students_college_insert", """CREATE TRIGGER trg_students_college_insert BEFORE INSERT ON students FOR EACH ROW
+    SET NEW.college_code = (SELECT college_code FROM programs WHERE program_code = NEW.program_code)"""),
+  ("trg_students_college_update", """CREATE TRIGGER trg_students_college_update BEFORE UPDATE ON students FOR EACH ROW
+    BEGIN
+      IF NOT (NEW.program_code <=> OLD.program_code) THEN
+        SET NEW.college_code = (SELECT college_code FROM programs WHERE program_code = NEW.program_code);
+      END IF;
+    END"""),
+  ("trg_programs_college_update", """CREATE TRIGGER trg_programs_college_update AFTER UPDATE ON programs FOR EACH ROW
+    BEGIN
+      IF NOT (NEW.college_code <=> OLD.college_code) THEN
+        UPDATE students SET college_code = NEW.college_code WHERE program_code = NEW.program_code;
+      END IF;
+    END"""),
+  ("trg_programs_college_delete", """CREATE TRIGGER trg_programs_college_delete BEFORE DELETE ON programs FOR EACH ROW
+    UPDATE students SET college_code = NULL WHERE program_code = OLD.program_code"""),
+]
+
+def addStudentCollegeColumn(cursor) -> List[str]:
+  statements = []
+
+  if not columnExists(cursor, "students", "college_code"):
+    statements.append("ALTER TABLE students ADD COLUMN college_code VARCHAR(10) NULL AFTER program_code")
+
+  # Created before the foreign key so the key uses it instead of adding an index of its own
+  statements += createIndexes([("students", "idx_students_college_last", "college_code, last_name")])(cursor)
+
+  if not constraintExists(cursor, "students", "fk_students_college"):
+    statements.append("""ALTER TABLE students ADD CONSTRAINT fk_students_college
+    FOREIGN KEY (college_code) REFERENCES colleges(college_code)
+    ON DELETE SET NULL
+    ON UPDATE CASCADE""")
+
+  statements += [createTrigger for triggerName, createTrigger in STUDENT_COLLEGE_TRIGGERS if not triggerExists(cursor, triggerName)]
+
+  # Backfilled after the triggers exist, so students written in between are not missed
+  statements.append("""UPDATE students s
+    LEFT JOIN programs p ON s.program_code = p.program_code
+    SET s.college_code = p.college_code
+    WHERE NOT (s.college_code <=> p.college_code)""")
+
+  return statements
+
+# (version, description, plan); versions are applied in order and never renumbered
+MIGRATIONS = [
+  (1, "Composite indexes for the table sort orders", createIndexes(SORT_INDEXES)),
+  (2, "n-gram FULLTEXT index for the student search", createStudentSearchIndex),
+  (3, "Denormalized students.college_code kept in sync by triggers", addStudentCollegeColumn),
+]
+
+def currentSchemaVersion(cursor) -> int:
+  if not tableExists(cursor, "schema_version"):
+    return 0
+
+  cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+  row = cursor.fetchone()
+  return int(row[0] if not isinstance(row, dict) else list(row.values())[0])
+
+# Applies every migration newer than the recorded schema version and returns (version, description, statements)
+# for each one; with dryRun the statements are only planned and nothing is written
+def migrate(cursor, dryRun=False) -> List[Tuple[int, str, List[str]]]:
+  return applyMigrations(cursor, MIGRATIONS, currentSchemaVersion(cursor), dryRun)
+
+# Runs the plans of a migration list newer than currentVersion and records each one in schema_version
+# Shared by the engines, which each keep their own list under the same version numbers
+def applyMigrations(cursor, migrations, currentVersion: int, dryRun=False) -> List[Tuple[int, str, List[str]]]:
+  applied = []
+
+  if not dryRun:
+    cursor.execute("""
+      CREATE TABLE IF NOT EXISTS schema_version (
+        version INT PRIMARY KEY NOT NULL,
+        description VARCHAR(255) NOT NULL,
+        applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+  for version, description, plan in migrations:
+    if version <= currentVersion:
+      continue
+
+    statements = plan(cursor)
+    applied.append((version, description, statements))
+
+    if dryRun:
+      continue
+
+    for statement in statements:
+      cursor.execute(statement)
+
+    cursor.execute("INSERT INTO schema_version (version, description) VALUES (%s, %s)", (version, description))
+
+  return applied
+
+if __name__ == "__main__":
+  sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+  parser = argparse.ArgumentParser(description="Brings the Lexis database schema up to date.")
+  parser.add_argument("--dry-run", action="store_true", help="print the pending statements without running them")
+  args = parser.parse_args()
+
+  from database.db import getConnection, getBackend
+
+  conn = getConnection()
+  if not conn:
+    sys.exit(1)
+
+  cursor = conn.cursor()
+  try:
+    pending = getBackend().migrate(cursor, dryRun=args.dry_run)
+  finally:
+    cursor.close()
+    conn.close()
+
+  if not pending:
+    print("Schema is up to date.")
+
+  for version, description, statements in pending:
+    print(f"{'Would apply' if args.dry_run else 'Applied'} migration {version}: {description}")
+    for statement in statements:
+      print(f"  {' '.join(statement.split())};")
@@ -0,0 +1,119 @@
+import os
+from typing import List, Tuple, Any, Optional
+
+from dotenv import load_dotenv
+import mysql.connector
+
+from database.backend import StorageBackend
+from database import migrations
+
+load_dotenv()
+
+# "pure" is mysql-connector's Python protocol code, "cext" its C extension, "auto" the C extension when it is
+# installed; "raw" is the C extension plus undecoded rows for streamed CSV exports, which only need text anyway
+DRIVER_MODES = ["auto", "cext", "pure", "raw"]
+
+def resolveDriverMode(requested: str) -> str:
+  requested = (requested or "auto").lower()
+
+  if requested not in DRIVER_MODES:
+    print(f"Unknown DB_DRIVER {requested!r}, expected one of {', '.join(DRIVER_MODES)}; using auto")
+    requested = "auto"
+
+  if requested == "auto":
+    return "cext" if mysql.connector.HAVE_CEXT else "pure"
+
+  if requested in ("cext", "raw") and not mysql.connector.HAVE_CEXT:
+    print(f"The mysql-connector C extension is not installed; DB_DRIVER={requested} falls back to the pure Python driver")
+    return "pure"
+
+  return requested
+
+DRIVER_MODE = resolveDriverMode(os.getenv("DB_DRIVER", "auto"))
+
+DB_CONFIG = {
+  "host": os.getenv("DB_HOST", "localhost"),
+  "user": os.getenv("DB_USER", "root"),
+  "password": os.getenv("DB_PASSWORD", "Threepoint14."),
+  "database": os.getenv("DB_NAME", "lexis_db"),
+  "use_pure": DRIVER_MODE == "pure",
+  "autocommit": True,
+}
+
+class MySQLBackend(StorageBackend):
+  name = "mysql"
+  errorTypes = (mysql.connector.Error,)
+  lockClause = " FOR UPDATE"
+  joinedWrites = True
+
+  # ENUM columns sort by declaration order, so seeking compares their ordinals instead of their text
+  seekOrdinalExpressions = {"gender": ("(s.gender + 0)", "FIELD(%s, 'Male', 'Female', 'Other')")}
+
+  def __init__(self):
+    self.driverMode = DRIVER_MODE
+
+  def connect(self) -> Any:
+    return mysql.connector.connect(**DB_CONFIG)
+
+  # Applies to connections opened from now on
+  def setDriverMode(self, mode: str) -> str:
+    self.driverMode = resolveDriverMode(mode)
+    DB_CONFIG["use_pure"] = self.driverMode == "pure"
+    return self.driverMode
+
+  def createTables(self, cursor: Any) -> None:
+    cursor.execute("""
+      CREATE TABLE IF NOT EXISTS colleges (
+        college_code VARCHAR(10) PRIMARY KEY NOT NULL,
+        college_name VARCHAR(255) NOT NULL
+        )
+    """)
+
+    cursor.execute("""
+      CREATE TABLE IF NOT EXISTS programs (
+        program_code VARCHAR(50) PRIMARY KEY NOT NULL,
+        program_name VARCHAR(255) NOT NULL,
+        college_code VARCHAR(10),
+        FOREIGN KEY (college_code) REFERENCES colleges(college_code)
+          ON DELETE SET NULL
+          ON UPDATE CASCADE
+        )
+    """)
+
+    cursor.execute("""
+      CREATE TABLE IF NOT EXISTS students (
+        id_number VARCHAR(9) NOT NULL PRIMARY KEY CHECK (id_number REGEXP '^[0-9]{4}-[0-9]{4}$'),
+        first_name VARCHAR(255) NOT NULL,
+        last_name VARCHAR(255) NOT NULL,
+        year_level INT CHECK (year_level BETWEEN 1 AND 5) NOT NULL,
+        gender ENUM('Male', 'Female', 'Other') NOT NULL,
+        program_code VARCHAR(50),
+        FOREIGN KEY (program_code) REFERENCES programs(program_code)
+          ON DELETE SET NULL
+          ON UPDATE CASCADE
+        )
+    """)
+
+  def migrate(self, cursor: Any, dryRun: bool = False) -> List[Tuple[int, str, List[str]]]:
+    return migrations.migrate(cursor, dryRun)
+
+  def indexExists(self, cursor: Any, table: str, indexName: str) -> bool:
+    return migrations.indexExists(cursor, table, indexName)
+
+  def columnExists(self, cursor: Any, table: str, column: str) -> bool:
+    return migrations.columnExists(cursor, table, column)
+
+  # Row count estimate from table statistics; cheap but only approximate for InnoDB
+  def estimateRowCount(self, cursor: Any, table: str) -> Optional[int]:
+    cursor.execute("""
+      SELECT TABLE_ROWS AS estimate
+      FROM information_schema.TABLES
+      WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+    """, (table,))
+    row = cursor.fetchone()
+
+    if not row:
+      return None
+
+    estimate = row["estimate"] if isinstance(row, dict) else row[0]
+    return int(estimate) if estimate is not None else None
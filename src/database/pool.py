@@ -0,0 +1,271 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+class PoolError(Exception):
+  pass
+
+class PoolExhaustedError(PoolError):
+  pass
+
+# Wraps a driver connection so that close() returns it to the pool instead of dropping it
+class PooledConnection:
+  def __init__(self, pool: "ConnectionPool", conn: Any, waitTime: float):
+    self._pool = pool
+    self._conn = conn
+    self._released = False
+    self.waitTime = waitTime
+    self.checkedOutAt = time.perf_counter()
+
+  def __getattr__(self, name: str) -> Any:
+    return getattr(self._conn, name)
+
+  @property
+  def rawConnection(self) -> Any:
+    return self._conn
+
+  def close(self) -> None:
+    if self._released:
+      return
+
+    self._released = True
+    self._pool.release(self)
+
+  # Closes the connection instead of returning it, for when resetting it would cost more than a new one
+  # (e.g. a streaming result abandoned halfway, which release() would have to read to the end)
+  def discard(self) -> None:
+    if self._released:
+      return
+
+    self._released = True
+    self._pool.release(self, discard=True)
+
+  def __enter__(self) -> "PooledConnection":
+    return self
+
+  def __exit__(self, excType, excValue, traceback) -> None:
+    self.close()
+
+class ConnectionPool:
+  def __init__(self, connectFactory: Callable[[], Any], minSize: int = 1, maxSize: int = 10, idleTimeout: float = 300.0, checkoutTimeout: float = 10.0, pingInterval: float = 5.0):
+    if minSize < 0 or maxSize < 1 or minSize > maxSize:
+      raise ValueError(f"Invalid pool size (min={minSize}, max={maxSize})")
+
+    self.connectFactory = connectFactory
+    self.minSize = minSize
+    self.maxSize = maxSize
+    self.idleTimeout = idleTimeout
+    self.checkoutTimeout = checkoutTimeout
+    self.pingInterval = pingInterval
+
+    # Idle connections as (connection, lastReleasedAt), most recently used on the right
+    self._idle: Deque[Tuple[Any, float]] = deque()
+    self._size = 0
+    self._closed = False
+    self._lock = threading.Condition()
+
+    self._metrics = {
+      "checkouts": 0,
+      "reused": 0,
+      "created": 0,
+      "healthCheckFailures": 0,
+      "evicted": 0,
+      "discarded": 0,
+      "waits": 0,
+      "timeouts": 0,
+      "totalWaitTime": 0.0,
+      "maxWaitTime": 0.0,
+      "totalHoldTime": 0.0,
+      "maxHoldTime": 0.0,
+    }
+
+  # Opens connections until the pool holds at least minSize of them
+  def prefill(self) -> None:
+    while True:
+      with self._lock:
+        if self._closed or self._size >= self.minSize:
+          return
+        self._size += 1
+
+      try:
+        conn = self.connectFactory()
+      except Exception:
+        with self._lock:
+          self._size -= 1
+          self._lock.notify()
+        raise
+
+      with self._lock:
+        self._metrics["created"] += 1
+        self._idle.append((conn, time.monotonic()))
+        self._lock.notify()
+
+  # Checks out a healthy connection, opening a new one if the pool has room
+  def acquire(self) -> PooledConnection:
+    start = time.perf_counter()
+    deadline = time.monotonic() + self.checkoutTimeout
+    waited = False
+
+    while True:
+      conn = None
+      idleSince = 0.0
+      shouldCreate = False
+
+      with self._lock:
+        if self._closed:
+          raise PoolError("Connection pool is closed")
+
+        self._evictIdle()
+
+        if self._idle:
+          conn, idleSince = self._idle.pop()
+        elif self._size < self.maxSize:
+          self._size += 1
+          shouldCreate = True
+        else:
+          remaining = deadline - time.monotonic()
+          if remaining <= 0:
+            self._metrics["timeouts"] += 1
+            raise PoolExhaustedError(f"No connection available after {self.checkoutTimeout}s (pool size {self.maxSize})")
+
+          if not waited:
+            self._metrics["waits"] += 1
+            waited = True
+
+          self._lock.wait(remaining)
+          continue
+
+      if shouldCreate:
+        try:
+          conn = self.connectFactory()
+        except Exception:
+          with self._lock:
+            self._size -= 1
+            self._lock.notify()
+          raise
+
+        with self._lock:
+          self._metrics["created"] += 1
+
+        return self._checkout(conn, start, reused=False)
+
+      if self._isHealthy(conn, idleSince):
+        return self._checkout(conn, start, reused=True)
+
+      self._discard(conn, healthCheckFailed=True)
+
+  # Returns a connection to the pool, resetting any state the caller left behind
+  def release(self, pooled: PooledConnection, discard: bool = False) -> None:
+    conn = pooled.rawConnection
+    holdTime = time.perf_counter() - pooled.checkedOutAt
+
+    with self._lock:
+      self._metrics["totalHoldTime"] += holdTime
+      self._metrics["maxHoldTime"] = max(self._metrics["maxHoldTime"], holdTime)
+
+    if discard:
+      self._discard(conn)
+      return
+
+    try:
+      if getattr(conn, "unread_result", False):
+        conn.consume_results()
+      if getattr(conn, "in_transaction", False):
+        conn.rollback()
+    except Exception:
+      self._discard(conn)
+      return
+
+    with self._lock:
+      if self._closed:
+        self._size -= 1
+        self._safeClose(conn)
+        return
+
+      self._idle.append((conn, time.monotonic()))
+      self._lock.notify()
+
+  # Closes every idle connection and refuses further checkouts
+  def close(self) -> None:
+    with self._lock:
+      self._closed = True
+      while self._idle:
+        conn, _ = self._idle.pop()
+        self._size -= 1
+        self._safeClose(conn)
+      self._lock.notify_all()
+
+  def stats(self) -> Dict[str, Any]:
+    with self._lock:
+      stats = dict(self._metrics)
+      stats["size"] = self._size
+      stats["idle"] = len(self._idle)
+      stats["inUse"] = self._size - len(self._idle)
+
+    checkouts = stats["checkouts"]
+    stats["avgWaitTime"] = stats["totalWaitTime"] / checkouts if checkouts else 0.0
+    stats["avgHoldTime"] = stats["totalHoldTime"] / checkouts if checkouts else 0.0
+    stats["reuseRatio"] = stats["reused"] / checkouts if checkouts else 0.0
+
+    return stats
+
+  #----------------------------------------------------------
+
+  def _checkout(self, conn: Any, start: float, reused: bool) -> PooledConnection:
+    waitTime = time.perf_counter() - start
+
+    with self._lock:
+      self._metrics["checkouts"] += 1
+      self._metrics["totalWaitTime"] += waitTime
+      self._metrics["maxWaitTime"] = max(self._metrics["maxWaitTime"], waitTime)
+      if reused:
+        self._metrics["reused"] += 1
+
+    return PooledConnection(self, conn, waitTime)
+
+  # Only pings connections that have been idle for a while; recently used ones are trusted
+  def _isHealthy(self, conn: Any, idleSince: float) -> bool:
+    if time.monotonic() - idleSince < self.pingInterval:
+      return True
+
+    try:
+      conn.ping(reconnect=False)
+      return True
+    except Exception:
+      return False
+
+  # Must be called with the lock held
+  def _evictIdle(self) -> None:
+    if self.idleTimeout <= 0:
+      return
+
+    now = time.monotonic()
+
+    # Oldest connections sit on the left
+    while self._idle and self._size > self.minSize:
+      conn, idleSince = self._idle[0]
+      if now - idleSince < self.idleTimeout:
+        break
+
+      self._idle.popleft()
+      self._size -= 1
+      self._metrics["evicted"] += 1
+      self._safeClose(conn)
+
+  def _discard(self, conn: Any, healthCheckFailed: bool = False) -> None:
+    self._safeClose(conn)
+
+    with self._lock:
+      self._size -= 1
+      self._metrics["discarded"] += 1
+      if healthCheckFailed:
+        self._metrics["healthCheckFailures"] += 1
+      self._lock.notify()
+
+  @staticmethod
+  def _safeClose(conn: Any) -> None:
+    try:
+      conn.close()
+    except Exception:
+      pass
@@ -0,0 +1,205 @@
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+PAGE_CACHE_MB = float(os.getenv("DB_PAGE_CACHE_MB", "32"))
+PAGE_CACHE_TTL = float(os.getenv("DB_PAGE_CACHE_TTL", "300"))
+PAGE_CACHE_DEBUG = os.getenv("DB_PAGE_CACHE_DEBUG", "0") != "0"
+
+# Cached results for a table also depend on the tables it joins or cascades from
+TABLE_DEPENDENTS = {
+  "colleges": ["programs", "students"],
+  "programs": ["students"],
+  "students": [],
+}
+
+# Caches COUNT(*) totals per (table, searchField, searchTerm) until a write touches the table
+class CountCache:
+  def __init__(self):
+    self._counts: Dict[Tuple[str, Optional[str], str], int] = {}
+    self._generations: Dict[str, int] = {}
+    self._lock = threading.Lock()
+    self.hits = 0
+    self.misses = 0
+
+  def get(self, table: str, searchField: Optional[str], searchTerm: str) -> Optional[int]:
+    with self._lock:
+      count = self._counts.get((table, searchField, searchTerm))
+      if count is None:
+        self.misses += 1
+      else:
+        self.hits += 1
+      return count
+
+  def contains(self, table: str, searchField: Optional[str], searchTerm: str) -> bool:
+    with self._lock:
+      return (table, searchField, searchTerm) in self._counts
+
+  # Counts computed before a write finished are dropped instead of cached
+  def set(self, table: str, searchField: Optional[str], searchTerm: str, count: int, generation: Optional[int] = None) -> None:
+    with self._lock:
+      if generation is not None and generation != self._generations.get(table, 0):
+        return
+      self._counts[(table, searchField, searchTerm)] = count
+
+  def generation(self, table: str) -> int:
+    with self._lock:
+      return self._generations.get(table, 0)
+
+  def invalidate(self, table: str) -> None:
+    tables = [table] + TABLE_DEPENDENTS.get(table, [])
+
+    with self._lock:
+      for name in tables:
+        self._generations[name] = self._generations.get(name, 0) + 1
+      self._counts = {key: count for key, count in self._counts.items() if key[0] not in tables}
+
+  def clear(self) -> None:
+    with self._lock:
+      self._counts.clear()
+
+# Rough bytes held by a page of records: the list, each dict, and each value
+def estimatePageSize(records: List[Dict[str, Any]]) -> int:
+  return sys.getsizeof(records) + sum(sys.getsizeof(record) + sum(sys.getsizeof(value) for value in record.values()) for record in records)
+
+# Caches pages of records per (table, full query signature), least recently used first out once over the memory budget
+# Entries expire after the TTL, so writes made outside this process (another client, the mysql shell) show up eventually
+class PageCache:
+  def __init__(self, maxBytes: int = int(PAGE_CACHE_MB * 1024 * 1024), ttl: float = PAGE_CACHE_TTL, debug: bool = PAGE_CACHE_DEBUG):
+    self.maxBytes = maxBytes
+    self.ttl = ttl
+    self.debug = debug
+
+    # (table, signature) -> (records, size, expiresAt)
+    self._pages: "OrderedDict[Tuple[str, Hashable], Tuple[List[Dict[str, Any]], int, float]]" = OrderedDict()
+    self._generations: Dict[str, int] = {}
+    self._lock = threading.Lock()
+    self.bytes = 0
+
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+    self.expirations = 0
+    self.invalidations = 0
+    self._tableLookups: Dict[str, List[int]] = {}
+
+  @property
+  def enabled(self) -> bool:
+    return self.maxBytes > 0
+
+  # Returns a copy of the cached page, so callers can change the records freely, or None
+  def get(self, table: str, signature: Hashable) -> Optional[List[Dict[str, Any]]]:
+    if not self.enabled:
+      return None
+
+    key = (table, signature)
+
+    with self._lock:
+      entry = self._pages.get(key)
+
+      if entry is not None and entry[2] <= time.monotonic():
+        self._drop(key)
+        self.expirations += 1
+        entry = None
+
+      if entry is not None:
+        self._pages.move_to_end(key)
+
+      self._record(table, entry is not None)
+      return None if entry is None else [record.copy() for record in entry[0]]
+
+  # Pages read before a write finished are dropped instead of cached
+  def set(self, table: str, signature: Hashable, records: List[Dict[str, Any]], generation: Optional[int] = None) -> None:
+    if not self.enabled:
+      return
+
+    records = [record.copy() for record in records]
+    size = estimatePageSize(records)
+    if size > self.maxBytes:
+      return
+
+    key = (table, signature)
+
+    with self._lock:
+      if generation is not None and generation != self._generations.get(table, 0):
+        return
+
+      if key in self._pages:
+        self._drop(key)
+
+      self._pages[key] = (records, size, time.monotonic() + self.ttl)
+      self.bytes += size
+
+      while self.bytes > self.maxBytes:
+        self._drop(next(iter(self._pages)))
+        self.evictions += 1
+
+  def generation(self, table: str) -> int:
+    with self._lock:
+      return self._generations.get(table, 0)
+
+  def invalidate(self, table: str) -> None:
+    tables = [table] + TABLE_DEPENDENTS.get(table, [])
+
+    with self._lock:
+      for name in tables:
+        self._generations[name] = self._generations.get(name, 0) + 1
+
+      for key in [key for key in self._pages if key[0] in tables]:
+        self._drop(key)
+        self.invalidations += 1
+
+  def clear(self) -> None:
+    with self._lock:
+      self._pages.clear()
+      self.bytes = 0
+
+  def stats(self) -> Dict[str, Any]:
+    with self._lock:
+      lookups = self.hits + self.misses
+      return {
+        "entries": len(self._pages),
+        "bytes": self.bytes,
+        "maxBytes": self.maxBytes,
+        "hits": self.hits,
+        "misses": self.misses,
+        "hitRatio": self.hits / lookups if lookups else 0.0,
+        "evictions": self.evictions,
+        "expirations": self.expirations,
+        "invalidations": self.invalidations,
+        "tables": {table: {"hits": hits, "lookups": total, "hitRatio": hits / total} for table, (hits, total) in self._tableLookups.items()},
+      }
+
+  def resetStats(self) -> None:
+    with self._lock:
+      self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+      self._tableLookups.clear()
+
+  # Both are called with the lock held
+  def _drop(self, key: Tuple[str, Hashable]) -> None:
+    _, size, _ = self._pages.pop(key)
+    self.bytes -= size
+
+  def _record(self, table: str, hit: bool) -> None:
+    if hit:
+      self.hits += 1
+    else:
+      self.misses += 1
+
+    counts = self._tableLookups.setdefault(table, [0, 0])
+    counts[0] += hit
+    counts[1] += 1
+
+    if self.debug:
+      print(f"Page cache {'hit' if hit else 'miss'} on {table}: {counts[0]}/{counts[1]} {table} hits ({counts[0] / counts[1]:.0%}), {self.hits}/{self.hits + self.misses} overall, {len(self._pages)} pages in {self.bytes / 1024:.0f} KB")
+
+countCache = CountCache()
+pageCache = PageCache()
+
+# Called by the model write paths after a successful commit
+def invalidateTable(table: str) -> None:
+  countCache.invalidate(table)
+  pageCache.invalidate(table)
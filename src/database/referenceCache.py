@@ -0,0 +1,75 @@
+import threading
+from typing import List, Dict, Optional, Tuple
+
+from database.db import getConnection
+from database.queryCache import countCache
+
+# Every college code and the programs under each, kept in memory for the college and program combo boxes
+# Writes bump the table generations in queryCache, and a changed generation makes the next read load everything again
+class ReferenceCache:
+  def __init__(self):
+    self._collegeCodes: List[str] = []
+    self._programCodes: List[str] = []
+    self._programCodesByCollege: Dict[str, List[str]] = {}
+    self._generations: Optional[Tuple[int, int]] = None
+    self._lock = threading.Lock()
+    self.loads = 0
+
+  def collegeCodes(self) -> List[str]:
+    with self._lock:
+      self._ensureLoaded()
+      return list(self._collegeCodes)
+
+  # Codes are matched case-insensitively, like the database collation does; no college means every program
+  def programCodes(self, collegeCode: Optional[str] = None) -> List[str]:
+    with self._lock:
+      self._ensureLoaded()
+      if not collegeCode:
+        return list(self._programCodes)
+      return list(self._programCodesByCollege.get(collegeCode.lower(), []))
+
+  def invalidate(self) -> None:
+    with self._lock:
+      self._generations = None
+
+  def _currentGenerations(self) -> Tuple[int, int]:
+    return countCache.generation("colleges"), countCache.generation("programs")
+
+  def _ensureLoaded(self) -> None:
+    generations = self._currentGenerations()
+    if self._generations == generations:
+      return
+
+    conn = getConnection()
+    if not conn:
+      return
+
+    cursor = conn.cursor()
+
+    try:
+      cursor.execute("SELECT college_code FROM colleges ORDER BY college_code")
+      collegeCodes = [collegeCode for (collegeCode,) in cursor.fetchall()]
+
+      cursor.execute("SELECT program_code, college_code FROM programs ORDER BY program_code")
+      programCodes = []
+      programCodesByCollege = {}
+      for programCode, collegeCode in cursor.fetchall():
+        programCodes.append(programCode)
+        if collegeCode is not None:
+          programCodesByCollege.setdefault(collegeCode.lower(), []).append(programCode)
+
+    except Exception as e:
+      print(f"Error loading reference data: {e}")
+      return
+
+    finally:
+      cursor.close()
+      conn.close()
+
+    self._collegeCodes = collegeCodes
+    self._programCodes = programCodes
+    self._programCodesByCollege = programCodesByCollege
+    self._generations = generations
+    self.loads += 1
+
+referenceCache = ReferenceCache()
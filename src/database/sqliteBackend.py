@@ -0,0 +1,294 @@
+import os
+import re
+import sqlite3
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Dict, Tuple, Any, Optional, Sequence
+
+from database.backend import StorageBackend
+from database.migrations import applyMigrations, SORT_INDEXES
+
+# An embedded database file, so the app and the benchmarks run without a MySQL server
+SQLITE_PATH = Path(os.getenv("DB_SQLITE_PATH", str(Path(__file__).resolve().parent.parent.parent / "data" / f"{os.getenv('DB_NAME', 'lexis_db')}.db")))
+SQLITE_BUSY_TIMEOUT = int(os.getenv("DB_SQLITE_BUSY_TIMEOUT", "10000"))
+SQLITE_CACHE_MB = int(os.getenv("DB_SQLITE_CACHE_MB", "64"))
+
+# WAL lets readers run while a write commits, and with it synchronous=NORMAL only syncs at checkpoints
+# foreign_keys is off by default in SQLite and has to be turned on for every connection
+PRAGMAS = [
+  "PRAGMA journal_mode = WAL",
+  "PRAGMA synchronous = NORMAL",
+  "PRAGMA foreign_keys = ON",
+  f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT}",
+  f"PRAGMA cache_size = -{SQLITE_CACHE_MB * 1024}",
+  "PRAGMA temp_store = MEMORY",
+  "PRAGMA mmap_size = 268435456",
+]
+
+# mysql-connector error numbers the controllers tell apart, for the SQLite constraint failures that mean the same
+SQLITE_ERRNOS = {
+  1555: 1062,  # SQLITE_CONSTRAINT_PRIMARYKEY, duplicate key
+  2067: 1062,  # SQLITE_CONSTRAINT_UNIQUE
+  787: 1452,   # SQLITE_CONSTRAINT_FOREIGNKEY, missing reference
+  275: 3819,   # SQLITE_CONSTRAINT_CHECK
+}
+
+# The placeholders are the only syntax the shared model SQL needs rewritten
+@lru_cache(maxsize=512)
+def translateQuery(query: str) -> str:
+  return re.sub(r"%[s%]", lambda match: "?" if match.group() == "%s" else "%", query)
+
+# A sqlite3 cursor with the parts of mysql-connector's cursor interface the models use
+class SQLiteCursor:
+  def __init__(self, cursor: sqlite3.Cursor, dictionary: bool = False):
+    self._cursor = cursor
+    self.dictionary = dictionary
+
+  @property
+  def rowcount(self) -> int:
+    return self._cursor.rowcount
+
+  @property
+  def lastrowid(self) -> Optional[int]:
+    return self._cursor.lastrowid
+
+  @property
+  def column_names(self) -> Tuple[str, ...]:
+    return tuple(column[0] for column in self._cursor.description or ())
+
+  def execute(self, query: str, params: Sequence[Any] = ()) -> None:
+    try:
+      self._cursor.execute(translateQuery(query), tuple(params or ()))
+    except sqlite3.Error as e:
+      raise withErrno(e)
+
+  def executemany(self, query: str, paramRows: Sequence[Sequence[Any]]) -> None:
+    try:
+      self._cursor.executemany(translateQuery(query), [tuple(params) for params in paramRows])
+    except sqlite3.Error as e:
+      raise withErrno(e)
+
+  def fetchone(self) -> Any:
+    row = self._cursor.fetchone()
+    return self._toDict(row) if row is not None and self.dictionary else row
+
+  def fetchmany(self, size: int = 1) -> List[Any]:
+    return self._rows(self._cursor.fetchmany(size))
+
+  def fetchall(self) -> List[Any]:
+    return self._rows(self._cursor.fetchall())
+
+  def close(self) -> None:
+    self._cursor.close()
+
+  def _rows(self, rows: List[Tuple[Any, ...]]) -> List[Any]:
+    if not self.dictionary:
+      return rows
+
+    columns = self.column_names
+    return [dict(zip(columns, row)) for row in rows]
+
+  def _toDict(self, row: Tuple[Any, ...]) -> Dict[str, Any]:
+    return dict(zip(self.column_names, row))
+
+# A sqlite3 connection with the parts of mysql-connector's connection interface the pool and models use
+# It runs in autocommit mode like the MySQL connections do; start_transaction opens an explicit one
+class SQLiteConnection:
+  def __init__(self, path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # The pool hands a connection to one thread at a time, but not always the thread that opened it
+    self._conn = sqlite3.connect(str(path), isolation_level=None, check_same_thread=False, cached_statements=256)
+    for pragma in PRAGMAS:
+      self._conn.execute(pragma)
+
+  @property
+  def in_transaction(self) -> bool:
+    return self._conn.in_transaction
+
+  # Results are read into Python as they are fetched, so there is never a result to drain before reuse
+  @property
+  def unread_result(self) -> bool:
+    return False
+
+  def consume_results(self) -> None:
+    pass
+
+  # sqlite3 keeps its own cache of prepared statements per connection, so prepared and raw cursors are plain ones
+  def cursor(self, dictionary: bool = False, prepared: bool = False, raw: bool = False, buffered: bool = False) -> SQLiteCursor:
+    return SQLiteCursor(self._conn.cursor(), dictionary)
+
+  # Takes the write lock up front, which is what the FOR UPDATE row locks do on MySQL
+  def start_transaction(self) -> None:
+    self._conn.execute("BEGIN IMMEDIATE")
+
+  def commit(self) -> None:
+    if self._conn.in_transaction:
+      self._conn.execute("COMMIT")
+
+  def rollback(self) -> None:
+    if self._conn.in_transaction:
+      self._conn.execute("ROLLBACK")
+
+  def ping(self, reconnect: bool = False) -> None:
+    self._conn.execute("SELECT 1").fetchone()
+
+  # Refreshes the planner statistics where they have gone stale, as SQLite recommends before closing
+  def close(self) -> None:
+    try:
+      self._conn.execute("PRAGMA optimize")
+    except sqlite3.Error:
+      pass
+
+    self._conn.close()
+
+def withErrno(error: sqlite3.Error) -> sqlite3.Error:
+  error.errno = SQLITE_ERRNOS.get(getattr(error, "sqlite_errorcode", None))
+  return error
+
+#--------------------------------------------------------------------------
+
+def indexExists(cursor: Any, table: str, indexName: str) -> bool:
+  cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND tbl_name = %s AND name = %s LIMIT 1", (table, indexName))
+  return cursor.fetchone() is not None
+
+def tableExists(cursor: Any, table: str) -> bool:
+  cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s LIMIT 1", (table,))
+  return cursor.fetchone() is not None
+
+def columnExists(cursor: Any, table: str, column: str) -> bool:
+  cursor.execute("SELECT 1 FROM pragma_table_info(%s) WHERE name = %s LIMIT 1", (table, column))
+  return cursor.fetchone() is not None
+
+def triggerExists(cursor: Any, triggerName: str) -> bool:
+  cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = %s LIMIT 1", (triggerName,))
+  return cursor.fetchone() is not None
+
+# The same sort indexes as MySQL's migration 1; the tables are WITHOUT ROWID, so like InnoDB every index already ends
+# in the primary key the keyset pages break ties on
+def createSortIndexes(cursor: Any) -> List[str]:
+  return [f"CREATE INDEX {indexName} ON {table} ({columns})" for table, indexName, columns in SORT_INDEXES if not indexExists(cursor, table, indexName)]
+
+# A trigger cannot assign NEW in SQLite, so the college is written back onto the row after the insert or update
+STUDENT_COLLEGE_TRIGGERS = [
+  ("trg_students_college_insert", """CREATE TRIGGER trg_students_college_insert AFTER INSERT ON students FOR EACH ROW
+    BEGIN
+      UPDATE students SET college_code = (SELECT college_code FROM programs WHERE program_code = NEW.program_code)
+      WHERE id_number = NEW.id_number;
+    END"""),
+  ("trg_students_college_update", """CREATE TRIGGER trg_students_college_update AFTER UPDATE OF program_code ON students FOR EACH ROW
+    WHEN NEW.program_code IS NOT OLD.program_code
+    BEGIN
+      UPDATE students SET college_code = (SELECT college_code FROM programs WHERE program_code = NEW.program_code)
+      WHERE id_number = NEW.id_number;
+    END"""),
+  ("trg_programs_college_update", """CREATE TRIGGER trg_programs_college_update AFTER UPDATE OF college_code ON programs FOR EACH ROW
+    WHEN NEW.college_code IS NOT OLD.college_code
+    BEGIN
+      UPDATE students SET college_code = NEW.college_code WHERE program_code = NEW.program_code;
+    END"""),
+  ("trg_programs_college_delete", """CREATE TRIGGER trg_programs_college_delete BEFORE DELETE ON programs FOR EACH ROW
+    BEGIN
+      UPDATE students SET college_code = NULL WHERE program_code = OLD.program_code;
+    END"""),
+]
+
+def addStudentCollegeColumn(cursor: Any) -> List[str]:
+  statements = []
+
+  if not columnExists(cursor, "students", "college_code"):
+    statements.append("""ALTER TABLE students ADD COLUMN college_code VARCHAR(10) COLLATE NOCASE
+    REFERENCES colleges(college_code)
+    ON DELETE SET NULL
+    ON UPDATE CASCADE""")
+
+  if not indexExists(cursor, "students", "idx_students_college_last"):
+    statements.append("CREATE INDEX idx_students_college_last ON students (college_code, last_name)")
+
+  statements += [createTrigger for triggerName, createTrigger in STUDENT_COLLEGE_TRIGGERS if not triggerExists(cursor, triggerName)]
+
+  statements.append("""UPDATE students
+    SET college_code = (SELECT college_code FROM programs WHERE programs.program_code = students.program_code)
+    WHERE college_code IS NOT (SELECT college_code FROM programs WHERE programs.program_code = students.program_code)""")
+
+  return statements
+
+# Versions match MIGRATIONS in database/migrations.py so schema_version reads the same on either engine
+SQLITE_MIGRATIONS = [
+  (1, "Composite indexes for the table sort orders", createSortIndexes),
+  (2, "n-gram FULLTEXT index for the student search (MySQL only; SQLite searches with LIKE)", lambda cursor: []),
+  (3, "Denormalized students.college_code kept in sync by triggers", addStudentCollegeColumn),
+]
+
+class SQLiteBackend(StorageBackend):
+  name = "sqlite"
+  errorTypes = (sqlite3.Error,)
+
+  def __init__(self, path: Path = SQLITE_PATH):
+    self.path = Path(path)
+
+  def connect(self) -> SQLiteConnection:
+    return SQLiteConnection(self.path)
+
+  # The MySQL schema with its collation: keys and text compare case-insensitively, and an ENUM becomes a CHECK
+  # WITHOUT ROWID clusters each table on its primary key, like InnoDB does
+  def createTables(self, cursor: Any) -> None:
+    cursor.execute("""
+      CREATE TABLE IF NOT EXISTS colleges (
+        college_code VARCHAR(10) COLLATE NOCASE PRIMARY KEY NOT NULL,
+        college_name VARCHAR(255) COLLATE NOCASE NOT NULL
+        ) WITHOUT ROWID
+    """)
+
+    cursor.execute("""
+      CREATE TABLE IF NOT EXISTS programs (
+        program_code VARCHAR(50) COLLATE NOCASE PRIMARY KEY NOT NULL,
+        program_name VARCHAR(255) COLLATE NOCASE NOT NULL,
+        college_code VARCHAR(10) COLLATE NOCASE,
+        FOREIGN KEY (college_code) REFERENCES colleges(college_code)
+          ON DELETE SET NULL
+          ON UPDATE CASCADE
+        ) WITHOUT ROWID
+    """)
+
+    cursor.execute("""
+      CREATE TABLE IF NOT EXISTS students (
+        id_number VARCHAR(9) COLLATE NOCASE NOT NULL PRIMARY KEY CHECK (id_number GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9][0-9][0-9]'),
+        first_name VARCHAR(255) COLLATE NOCASE NOT NULL,
+        last_name VARCHAR(255) COLLATE NOCASE NOT NULL,
+        year_level INTEGER CHECK (year_level BETWEEN 1 AND 5) NOT NULL,
+        gender VARCHAR(6) COLLATE NOCASE NOT NULL CHECK (gender IN ('Male', 'Female', 'Other')),
+        program_code VARCHAR(50) COLLATE NOCASE,
+        FOREIGN KEY (program_code) REFERENCES programs(program_code)
+          ON DELETE SET NULL
+          ON UPDATE CASCADE
+        ) WITHOUT ROWID
+    """)
+
+  def migrate(self, cursor: Any, dryRun: bool = False) -> List[Tuple[int, str, List[str]]]:
+    currentVersion = 0
+    if tableExists(cursor, "schema_version"):
+      cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+      currentVersion = int(cursor.fetchone()[0])
+
+    return applyMigrations(cursor, SQLITE_MIGRATIONS, currentVersion, dryRun)
+
+  def indexExists(self, cursor: Any, table: str, indexName: str) -> bool:
+    return indexExists(cursor, table, indexName)
+
+  def columnExists(self, cursor: Any, table: str, column: str) -> bool:
+    return columnExists(cursor, table, column)
+
+  # The row count ANALYZE (or PRAGMA optimize) last recorded, which leads the stat column of sqlite_stat1
+  def estimateRowCount(self, cursor: Any, table: str) -> Optional[int]:
+    if not tableExists(cursor, "sqlite_stat1"):
+      return None
+
+    cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", (table,))
+    row = cursor.fetchone()
+
+    if not row:
+      return None
+
+    stat = row["stat"] if isinstance(row, dict) else row[0]
+    return int(stat.split()[0]) if stat else None
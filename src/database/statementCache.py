@@ -0,0 +1,129 @@
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, List, Sequence
+
+PREPARED_STATEMENTS_ENABLED = os.getenv("DB_PREPARED_STATEMENTS", "1") != "0"
+MAX_PREPARED_STATEMENTS = int(os.getenv("DB_MAX_PREPARED_STATEMENTS", "64"))
+
+# Server-side prepared statements, kept per pooled connection and keyed by query text, so each query shape
+# (a sort order, a search field) is parsed by MySQL once per connection instead of on every page flip
+# mysql-connector only skips re-preparing when a prepared cursor is handed the very same string object it ran
+# last, so every shape keeps its own cursor and the string it was prepared from
+class StatementCache:
+  def __init__(self, maxPerConnection: int = MAX_PREPARED_STATEMENTS, enabled: bool = PREPARED_STATEMENTS_ENABLED):
+    self.maxPerConnection = maxPerConnection
+    self.enabled = enabled
+
+    # Cursors only hold a weak proxy to their connection, so entries go away with the connection
+    self._statements: "weakref.WeakKeyDictionary[Any, OrderedDict]" = weakref.WeakKeyDictionary()
+    self._unpreparable = set()
+    self._lock = threading.Lock()
+
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+    self.fallbacks = 0
+
+  # Runs a query and returns all of its rows, through the connection's prepared statement for it when possible
+  def fetchAll(self, conn: Any, query: str, params: Sequence[Any] = (), dictionary: bool = True) -> List[Any]:
+    if not self.enabled or query in self._unpreparable:
+      return self._fetchAllUnprepared(conn, query, params, dictionary)
+
+    rawConnection = getattr(conn, "rawConnection", conn)
+    statements = self._statementsFor(rawConnection)
+    key = (query, dictionary)
+    entry = statements.get(key)
+
+    if entry is not None:
+      statements.move_to_end(key)
+      self._count("hits")
+      operation, cursor = entry
+
+      try:
+        cursor.execute(operation, params)
+        return cursor.fetchall()
+      except Exception:
+        self._forget(statements, key)
+        raise
+
+    self._count("misses")
+
+    cursor = rawConnection.cursor(prepared=True, dictionary=dictionary)
+
+    try:
+      cursor.execute(query, params)
+      rows = cursor.fetchall()
+    except Exception as e:
+      # Some statements cannot be prepared; they run as plain queries from now on
+      print(f"Prepared statement fallback: {e}")
+      self._closeCursor(cursor)
+      with self._lock:
+        self._unpreparable.add(query)
+        self.fallbacks += 1
+      return self._fetchAllUnprepared(conn, query, params, dictionary)
+
+    statements[key] = (query, cursor)
+
+    while len(statements) > self.maxPerConnection:
+      _, (_, evictedCursor) = statements.popitem(last=False)
+      self._closeCursor(evictedCursor)
+      self._count("evictions")
+
+    return rows
+
+  def stats(self) -> Dict[str, Any]:
+    with self._lock:
+      lookups = self.hits + self.misses
+      return {
+        "hits": self.hits,
+        "misses": self.misses,
+        "evictions": self.evictions,
+        "fallbacks": self.fallbacks,
+        "hitRatio": self.hits / lookups if lookups else 0.0,
+        "connections": len(self._statements),
+        "statements": sum(len(statements) for statements in self._statements.values()),
+      }
+
+  def resetStats(self) -> None:
+    with self._lock:
+      self.hits = self.misses = self.evictions = self.fallbacks = 0
+
+  #----------------------------------------------------------
+
+  # A connection is only ever used by the thread that checked it out, so its own statements need no lock
+  def _statementsFor(self, rawConnection: Any) -> OrderedDict:
+    with self._lock:
+      statements = self._statements.get(rawConnection)
+      if statements is None:
+        statements = OrderedDict()
+        self._statements[rawConnection] = statements
+      return statements
+
+  def _forget(self, statements: OrderedDict, key: Any) -> None:
+    entry = statements.pop(key, None)
+    if entry is not None:
+      self._closeCursor(entry[1])
+
+  def _count(self, counter: str) -> None:
+    with self._lock:
+      setattr(self, counter, getattr(self, counter) + 1)
+
+  @staticmethod
+  def _fetchAllUnprepared(conn: Any, query: str, params: Sequence[Any], dictionary: bool) -> List[Any]:
+    cursor = conn.cursor(dictionary=dictionary)
+    try:
+      cursor.execute(query, params)
+      return cursor.fetchall()
+    finally:
+      cursor.close()
+
+  @staticmethod
+  def _closeCursor(cursor: Any) -> None:
+    try:
+      cursor.close()
+    except Exception:
+      pass
+
+statementCache = StatementCache()
@@ -1,7 +1,10 @@
-from typing import List, Dict, Tuple, Any
+from typing import List, Dict, Set, Tuple, Any, Iterator
 from pathlib import Path
 
-from database.db import getConnection
+from database.db import getConnection, estimateRowCount, streamQuery
+from database.queryCache import countCache, pageCache, invalidateTable
+from database.statementCache import statementCache
+from database.batch import runBatch, BATCH_CHUNK_SIZE
 
 class College:
   COLLEGE_CSV_FILEPATH = Path(__file__).parent.parent.parent / "data" / "colleges.csv"
@@ -56,6 +59,7 @@ class College:
       try:
         cursor.execute(query, (newCollege["College Code"], newCollege["College Name"]))
         conn.commit()
+        invalidateTable("colleges")
 
         return cursor.rowcount > 0
       
@@ -66,6 +70,57 @@ class College:
         cursor.close()
         conn.close()
   
+  @staticmethod
+  def getCollegeCodes() -> List[str]:
+    conn = getConnection()
+
+    if not conn:
+      return []
+
+    try:
+      cursor = conn.cursor()
+      cursor.execute("SELECT college_code FROM colleges")
+      return [collegeCode for (collegeCode,) in cursor.fetchall()]
+
+    except Exception as e:
+      print(f"College Model Error fetching college codes: {e}")
+      return []
+
+    finally:
+      cursor.close()
+      conn.close()
+
+  # Returns which of the given college codes are already taken, in a single query
+  @staticmethod
+  def findExistingCollegeCodes(cursor: Any, collegeCodes: List[str]) -> Set[str]:
+    if not collegeCodes:
+      return set()
+
+    cursor.execute(f"SELECT college_code FROM colleges WHERE college_code IN ({', '.join(['%s'] * len(collegeCodes))})", list(collegeCodes))
+    return {(row["college_code"] if isinstance(row, dict) else row[0]).lower() for row in cursor.fetchall()}
+
+  # Inserts already validated (code, name) rows as one multi-row INSERT in one transaction
+  # Errors are raised so the caller can tell which rows were rejected
+  @staticmethod
+  def insertCollegeRows(conn: Any, rows: List[Tuple[Any, ...]]) -> int:
+    cursor = conn.cursor()
+
+    try:
+      conn.start_transaction()
+      cursor.executemany("""
+        INSERT INTO colleges (college_code, college_name)
+        VALUES (%s, %s)
+      """, rows)
+      conn.commit()
+    except Exception:
+      conn.rollback()
+      raise
+    finally:
+      cursor.close()
+
+    invalidateTable("colleges")
+    return len(rows)
+
   # Get college record
   @staticmethod
   def getCollegeRecordByCode(collegeCode: str) -> Dict[str, str]:
@@ -120,20 +175,10 @@ class College:
     
     return college
   
-  # Get all college records
+  # Builds the WHERE clause shared by the paginated queries
   @staticmethod
-  def getCollegeRecords(page=1, perPage=50, sortBy1="college_code", sortBy2="college_name", sortOrder="ASC", searchField=None, searchTerm="") -> Tuple[List[Dict[str, str]], int]:
-    conn = getConnection()
-
-    if not conn:
-      return [], 0
-    
-    cursor = conn.cursor(dictionary=True)
-    
+  def buildSearchQuery(searchField=None, searchTerm="") -> Tuple[str, List[Any]]:
     params = []
-    colleges = []
-    offset = (page - 1) * perPage
-    searchTerms = searchTerm.split()
     searchQuery = "WHERE ("
 
     
@@ -153,6 +198,14 @@ class College:
 
     searchQuery += ")"
 
+    return searchQuery, params
+
+  # Runs the exact COUNT(*) for a search on an open cursor and caches it
+  @staticmethod
+  def fetchCollegeCount(cursor: Any, searchField=None, searchTerm="") -> int:
+    generation = countCache.generation("colleges")
+    searchQuery, params = College.buildSearchQuery(searchField, searchTerm)
+
     # Query to get the total count of matching records
     countQuery = f"""
       SELECT COUNT(*) as total 
@@ -165,7 +218,72 @@ class College:
       totalRecords = cursor.fetchone()["total"]
     except Exception as e:
       print(f"College Model Error fetching colleges: {e}")
-      totalRecords = 0
+      return 0
+
+    countCache.set("colleges", searchField, searchTerm, totalRecords, generation)
+    return totalRecords
+
+  # Gets the exact number of colleges matching a search
+  @staticmethod
+  def countCollegeRecords(searchField=None, searchTerm="") -> int:
+    totalRecords = countCache.get("colleges", searchField, searchTerm)
+    if totalRecords is not None:
+      return totalRecords
+
+    conn = getConnection()
+
+    if not conn:
+      return 0
+
+    cursor = conn.cursor(dictionary=True)
+
+    try:
+      return College.fetchCollegeCount(cursor, searchField, searchTerm)
+    finally:
+      cursor.close()
+      conn.close()
+
+  # Checks if the total for a search is already known exactly
+  @staticmethod
+  def isCountCached(searchField=None, searchTerm="") -> bool:
+    return countCache.contains("colleges", searchField, searchTerm)
+
+  # Get all college records
+  @staticmethod
+  def getCollegeRecords(page=1, perPage=50, sortBy1="college_code", sortBy2="college_name", sortOrder="ASC", searchField=None, searchTerm="", approximateCount=False) -> Tuple[List[Dict[str, str]], int]:
+    # Pages are cached by their whole query until a write touches colleges
+    pageKey = (page, perPage, sortBy1, sortBy2, sortOrder, searchField, searchTerm)
+    colleges = pageCache.get("colleges", pageKey)
+
+    # Totals are cached per search until a write touches the colleges table
+    totalRecords = countCache.get("colleges", searchField, searchTerm)
+
+    if colleges is not None and totalRecords is not None:
+      return colleges, totalRecords
+
+    conn = getConnection()
+
+    if not conn:
+      return [], 0
+    
+    cursor = conn.cursor(dictionary=True)
+    
+    offset = (page - 1) * perPage
+    searchQuery, params = College.buildSearchQuery(searchField, searchTerm)
+
+    if totalRecords is None and approximateCount and not searchTerm:
+      totalRecords = estimateRowCount(cursor, "colleges")
+
+    if totalRecords is None:
+      totalRecords = College.fetchCollegeCount(cursor, searchField, searchTerm)
+
+    if colleges is not None:
+      cursor.close()
+      conn.close()
+      return colleges, totalRecords
+
+    colleges = []
+    generation = pageCache.generation("colleges")
 
     query = f"""
       SELECT * 
@@ -178,8 +296,9 @@ class College:
     params.extend([perPage, offset])
 
     try:
-      cursor.execute(query, params)
-      colleges = cursor.fetchall()
+      # Page queries come in a handful of shapes, so each is prepared once per connection and reused
+      colleges = statementCache.fetchAll(conn, query, params)
+      pageCache.set("colleges", pageKey, colleges, generation)
     except Exception as e:
       print(f"College Model Error fetching colleges: {e}")
     finally:
@@ -188,6 +307,22 @@ class College:
     
     return colleges, totalRecords
 
+  # Streams every college matching a search in table order, for exports
+  @staticmethod
+  def iterCollegeRecords(sortBy1="college_code", sortBy2="college_name", sortOrder="ASC", searchField=None, searchTerm="", batchSize=1000, textOnly=False) -> Iterator[List[Dict[str, Any]]]:
+    def buildQuery(cursor):
+      searchQuery, params = College.buildSearchQuery(searchField, searchTerm)
+
+      query = f"""
+        SELECT * 
+        FROM colleges 
+        {searchQuery}
+        ORDER BY {sortBy1} {sortOrder}, {sortBy2} ASC
+      """
+      return query, params
+
+    return streamQuery(buildQuery, batchSize, textOnly)
+
   # Get program record
   @staticmethod
   def updateCollegeRecord(collegeCode: str, updateData: Dict[str, str]) -> bool:
@@ -210,6 +345,7 @@ class College:
     try:
       cursor.execute(query, values)
       conn.commit()
+      invalidateTable("colleges")
 
       return cursor.rowcount >= 0
 
@@ -238,6 +374,7 @@ class College:
     try:
       cursor.execute(query, (collegeCode,))
       conn.commit()
+      invalidateTable("colleges")
 
       return cursor.rowcount > 0
 
@@ -249,35 +386,19 @@ class College:
       cursor.close()
       conn.close()
   
-  # Batch Removes college records
+  # Batch Removes college records in chunks; returns which colleges were removed, failed or never reached
   @staticmethod
-  def removeBatchCollegeRecordsById(collegeCodes: List[str]) -> bool:
-    conn = getConnection()
-    
-    if not conn:
-      return False
-    
-    cursor = conn.cursor(dictionary=True)
+  def removeBatchCollegeRecordsById(collegeCodes: List[str], chunkSize: int = BATCH_CHUNK_SIZE, singleTransaction: bool = False, progressCallback=None, cancelEvent=None) -> Dict[str, Any]:
+    return runBatch("colleges", "college_code", collegeCodes, College.deleteColleges, chunkSize, singleTransaction, progressCallback, cancelEvent)
 
-    idNumberPlaceholders = ", ".join(["%s"] * len(collegeCodes))
-    whereClause = f"WHERE college_code IN ({idNumberPlaceholders})"
-    values = tuple(collegeCodes)
+  # Deletes many colleges on an open cursor with one statement
+  @staticmethod
+  def deleteColleges(cursor: Any, collegeCodes: List[str]) -> int:
+    placeholders = ", ".join(["%s"] * len(collegeCodes))
 
-    query = f"""
+    cursor.execute(f"""
       DELETE FROM colleges
-      {whereClause}
-    """
-
-    try:
-      cursor.execute(query, values)
-      conn.commit()
-
-      return cursor.rowcount > 0
+      WHERE college_code IN ({placeholders})
+    """, tuple(collegeCodes))
 
-    except Exception as e:
-      print(f"College Model Error batch deleting colleges: {e}")
-      return False
-    
-    finally:
-      cursor.close()
-      conn.close()
\ No newline at end of file
+    return cursor.rowcount
@@ -1,7 +1,10 @@
-from typing import List, Dict, Tuple, Any
+from typing import List, Dict, Set, Tuple, Any, Iterator
 from pathlib import Path
 
-from database.db import getConnection
+from database.db import getConnection, estimateRowCount, streamQuery
+from database.queryCache import countCache, pageCache, invalidateTable
+from database.statementCache import statementCache
+from database.batch import runBatch, BATCH_CHUNK_SIZE
 
 class Program:
   PROGRAM_CSV_FILEPATH = Path(__file__).parent.parent.parent / "data" / "programs.csv"
@@ -60,6 +63,7 @@ class Program:
       try:
         cursor.execute(query, (newProgram["Program Code"], newProgram["Program Name"], newProgram["College Code"]))
         conn.commit()
+        invalidateTable("programs")
 
         return cursor.rowcount > 0
       
@@ -70,19 +74,62 @@ class Program:
         cursor.close()
         conn.close()
 
-  # Get student records with page, search value, and sorting order
+  # Every program code mapped to its college code, for validating many rows without a query per row
   @staticmethod
-  def getProgramRecords(page=1, perPage=50, sortBy1="program_code", sortBy2="program_name", sortOrder="ASC", searchField=None, searchTerm="") -> Tuple[List[Dict[str, str]], int]:
+  def getProgramCollegeCodes() -> Dict[str, str]:
     conn = getConnection()
 
     if not conn:
-      return [], 0
-    
-    cursor = conn.cursor(dictionary=True)
-    
+      return {}
+
+    try:
+      cursor = conn.cursor()
+      cursor.execute("SELECT program_code, college_code FROM programs")
+      return {programCode: collegeCode for programCode, collegeCode in cursor.fetchall()}
+
+    except Exception as e:
+      print(f"Program Model Error fetching program codes: {e}")
+      return {}
+
+    finally:
+      cursor.close()
+      conn.close()
+
+  # Returns which of the given program codes are already taken, in a single query
+  @staticmethod
+  def findExistingProgramCodes(cursor: Any, programCodes: List[str]) -> Set[str]:
+    if not programCodes:
+      return set()
+
+    cursor.execute(f"SELECT program_code FROM programs WHERE program_code IN ({', '.join(['%s'] * len(programCodes))})", list(programCodes))
+    return {(row["program_code"] if isinstance(row, dict) else row[0]).lower() for row in cursor.fetchall()}
+
+  # Inserts already validated (code, name, college) rows as one multi-row INSERT in one transaction
+  # Errors are raised so the caller can tell which rows were rejected
+  @staticmethod
+  def insertProgramRows(conn: Any, rows: List[Tuple[Any, ...]]) -> int:
+    cursor = conn.cursor()
+
+    try:
+      conn.start_transaction()
+      cursor.executemany("""
+        INSERT INTO programs (program_code, program_name, college_code)
+        VALUES (%s, %s, %s)
+      """, rows)
+      conn.commit()
+    except Exception:
+      conn.rollback()
+      raise
+    finally:
+      cursor.close()
+
+    invalidateTable("programs")
+    return len(rows)
+
+  # Builds the WHERE clause shared by the paginated queries
+  @staticmethod
+  def buildSearchQuery(searchField=None, searchTerm="") -> Tuple[str, List[Any]]:
     params = []
-    programs = []
-    offset = (page - 1) * perPage
     searchQuery = "WHERE ("
 
     if searchField:
@@ -102,10 +149,18 @@ class Program:
 
     searchQuery += ")"
 
+    return searchQuery, params
+
+  # Runs the exact COUNT(*) for a search on an open cursor and caches it
+  @staticmethod
+  def fetchProgramCount(cursor: Any, searchField=None, searchTerm="") -> int:
+    generation = countCache.generation("programs")
+    searchQuery, params = Program.buildSearchQuery(searchField, searchTerm)
+
     # Query to get the total count of matching records
     countQuery = f"""
       SELECT COUNT(*) as total 
-      FROM programs p 
+      FROM programs p
       {searchQuery}
     """
 
@@ -114,7 +169,72 @@ class Program:
       totalRecords = cursor.fetchone()["total"]
     except Exception as e:
       print(f"Program Model Error fetching program: {e}")
-      totalRecords = 0
+      return 0
+
+    countCache.set("programs", searchField, searchTerm, totalRecords, generation)
+    return totalRecords
+
+  # Gets the exact number of programs matching a search
+  @staticmethod
+  def countProgramRecords(searchField=None, searchTerm="") -> int:
+    totalRecords = countCache.get("programs", searchField, searchTerm)
+    if totalRecords is not None:
+      return totalRecords
+
+    conn = getConnection()
+
+    if not conn:
+      return 0
+
+    cursor = conn.cursor(dictionary=True)
+
+    try:
+      return Program.fetchProgramCount(cursor, searchField, searchTerm)
+    finally:
+      cursor.close()
+      conn.close()
+
+  # Checks if the total for a search is already known exactly
+  @staticmethod
+  def isCountCached(searchField=None, searchTerm="") -> bool:
+    return countCache.contains("programs", searchField, searchTerm)
+
+  # Get student records with page, search value, and sorting order
+  @staticmethod
+  def getProgramRecords(page=1, perPage=50, sortBy1="program_code", sortBy2="program_name", sortOrder="ASC", searchField=None, searchTerm="", approximateCount=False) -> Tuple[List[Dict[str, str]], int]:
+    # Pages are cached by their whole query until a write touches programs or the colleges they show
+    pageKey = (page, perPage, sortBy1, sortBy2, sortOrder, searchField, searchTerm)
+    programs = pageCache.get("programs", pageKey)
+
+    # Totals are cached per search until a write touches the programs table
+    totalRecords = countCache.get("programs", searchField, searchTerm)
+
+    if programs is not None and totalRecords is not None:
+      return programs, totalRecords
+
+    conn = getConnection()
+
+    if not conn:
+      return [], 0
+    
+    cursor = conn.cursor(dictionary=True)
+    
+    offset = (page - 1) * perPage
+    searchQuery, params = Program.buildSearchQuery(searchField, searchTerm)
+
+    if totalRecords is None and approximateCount and not searchTerm:
+      totalRecords = estimateRowCount(cursor, "programs")
+
+    if totalRecords is None:
+      totalRecords = Program.fetchProgramCount(cursor, searchField, searchTerm)
+
+    if programs is not None:
+      cursor.close()
+      conn.close()
+      return programs, totalRecords
+
+    programs = []
+    generation = pageCache.generation("programs")
 
     query = f"""
       SELECT * 
@@ -127,8 +247,9 @@ class Program:
     params.extend([perPage, offset])
     
     try:
-      cursor.execute(query, params)
-      programs = cursor.fetchall()
+      # Page queries come in a handful of shapes, so each is prepared once per connection and reused
+      programs = statementCache.fetchAll(conn, query, params)
+      pageCache.set("programs", pageKey, programs, generation)
     except Exception as e:
       print(f"Program Model Error fetching programs: {e}")
     finally:
@@ -137,6 +258,22 @@ class Program:
     
     return programs, totalRecords
 
+  # Streams every program matching a search in table order, for exports
+  @staticmethod
+  def iterProgramRecords(sortBy1="program_code", sortBy2="program_name", sortOrder="ASC", searchField=None, searchTerm="", batchSize=1000, textOnly=False) -> Iterator[List[Dict[str, Any]]]:
+    def buildQuery(cursor):
+      searchQuery, params = Program.buildSearchQuery(searchField, searchTerm)
+
+      query = f"""
+        SELECT * 
+        FROM programs
+        {searchQuery}
+        ORDER BY {sortBy1} {sortOrder}, {sortBy2} ASC
+      """
+      return query, params
+
+    return streamQuery(buildQuery, batchSize, textOnly)
+
   # Get program record by code
   @staticmethod
   def getProgramRecordByCode(programCode: str) -> Dict[str, str]:
@@ -240,6 +377,7 @@ class Program:
     try:
       cursor.execute(query, values)
       conn.commit()
+      invalidateTable("programs")
 
       return cursor.rowcount >= 0
 
@@ -268,6 +406,7 @@ class Program:
     try:
       cursor.execute(query, (programCode,))
       conn.commit()
+      invalidateTable("programs")
 
       return cursor.rowcount > 0
 
@@ -279,35 +418,19 @@ class Program:
       cursor.close()
       conn.close()
   
-  # Batch Removes program records
+  # Batch Removes program records in chunks; returns which programs were removed, failed or never reached
   @staticmethod
-  def removeBatchProgramRecordsById(programCodes: List[str]) -> bool:
-    conn = getConnection()
-    
-    if not conn:
-      return False
-    
-    cursor = conn.cursor(dictionary=True)
+  def removeBatchProgramRecordsById(programCodes: List[str], chunkSize: int = BATCH_CHUNK_SIZE, singleTransaction: bool = False, progressCallback=None, cancelEvent=None) -> Dict[str, Any]:
+    return runBatch("programs", "program_code", programCodes, Program.deletePrograms, chunkSize, singleTransaction, progressCallback, cancelEvent)
 
-    idNumberPlaceholders = ", ".join(["%s"] * len(programCodes))
-    whereClause = f"WHERE program_code IN ({idNumberPlaceholders})"
-    values = tuple(programCodes)
+  # Deletes many programs on an open cursor with one statement
+  @staticmethod
+  def deletePrograms(cursor: Any, programCodes: List[str]) -> int:
+    placeholders = ", ".join(["%s"] * len(programCodes))
 
-    query = f"""
+    cursor.execute(f"""
       DELETE FROM programs
-      {whereClause}
-    """
+      WHERE program_code IN ({placeholders})
+    """, tuple(programCodes))
 
-    try:
-      cursor.execute(query, values)
-      conn.commit()
-
-      return cursor.rowcount > 0
-
-    except Exception as e:
-      print(f"Program Model Error batch deleting programs: {e}")
-      return False
-    
-    finally:
-      cursor.close()
-      conn.close()
\ No newline at end of file
+    return cursor.rowcount
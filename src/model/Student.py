@@ -1,12 +1,31 @@
-from typing import List, Dict, Tuple, Any
+from typing import List, Dict, Set, Tuple, Any, Iterator
 from pathlib import Path
 
-from database.db import getConnection
+from database.db import getConnection, getBackend, estimateRowCount, streamQuery
+from database.queryCache import countCache, pageCache, invalidateTable
+from database.statementCache import statementCache
+from database.batch import runBatch, BATCH_CHUNK_SIZE
 
 class Student:  
   STUDENT_CSV_FILEPATH = Path(__file__).parent.parent.parent / "data" / "students.csv"
   STUDENT_HEADERS = ["ID Number", "First Name", "Last Name", "Year Level", "Gender", "Program Code", "College Code"]
 
+  # Set once it is known whether migration 3 has given students their own college_code column
+  hasCollegeColumn = None
+
+  # Reaching the college without that column takes two joins
+  COLLEGE_JOINS = """
+    LEFT JOIN programs p ON s.program_code = p.program_code
+    LEFT JOIN colleges c ON p.college_code = c.college_code
+  """
+
+  GENDERS = ["Male", "Female", "Other"]
+
+  # Columns covered by the ft_students_search FULLTEXT index and the n-gram size it was built with
+  SEARCH_INDEX_COLUMNS = "s.id_number, s.first_name, s.last_name, s.program_code"
+  SEARCH_INDEX_MIN_TOKEN_LENGTH = 2
+  hasSearchIndex = None
+
   def __init__(self, idNumber: str, firstName: str, lastName: str, yearLevel: int, gender: str, programCode: str, collegeCode: str):
     self.idNumber = idNumber
     self.firstName = firstName
@@ -57,17 +76,13 @@ class Student:
 
     if conn:
       cursor = conn.cursor(dictionary=True)
-      query = """
-        INSERT INTO students (id_number, first_name, last_name, year_level, gender, program_code)
-        VALUES (%s, %s, %s, %s, %s, %s);
-      """
-      newStudent = student.toDict()
 
       try:
-        cursor.execute(query, (newStudent["ID Number"], newStudent["First Name"], newStudent["Last Name"], newStudent["Year Level"], newStudent["Gender"], newStudent["Program Code"]))
+        isInserted = Student.insertStudent(cursor, student)
         conn.commit()
+        invalidateTable("students")
 
-        return cursor.rowcount > 0
+        return isInserted
       
       except Exception as e:
         print(f"Student Model Error inserting student: {e}")
@@ -76,6 +91,65 @@ class Student:
         cursor.close()
         conn.close()
   
+  # Inserts a student on an open cursor, so the insert can share a transaction with its checks
+  @staticmethod
+  def insertStudent(cursor: Any, student: Any) -> bool:
+    newStudent = student.toDict()
+    cursor.execute("""
+      INSERT INTO students (id_number, first_name, last_name, year_level, gender, program_code)
+      VALUES (%s, %s, %s, %s, %s, %s);
+    """, (newStudent["ID Number"], newStudent["First Name"], newStudent["Last Name"], newStudent["Year Level"], newStudent["Gender"], newStudent["Program Code"]))
+
+    return cursor.rowcount > 0
+
+  # Answers every existence check a student write needs in one round trip; arguments left as None are not checked
+  @staticmethod
+  def checkStudentReferences(cursor: Any, idNumber=None, programCode=None, collegeCode=None) -> Dict[str, Any]:
+    cursor.execute("""
+      SELECT
+        EXISTS(SELECT 1 FROM students WHERE id_number = %s) AS idNumberExists,
+        EXISTS(SELECT 1 FROM programs WHERE program_code = %s) AS programCodeExists,
+        EXISTS(SELECT 1 FROM colleges WHERE college_code = %s) AS collegeCodeExists
+    """, (idNumber, programCode, collegeCode))
+    row = cursor.fetchone()
+
+    return {
+      "idNumberExists": bool(row["idNumberExists"]) if idNumber is not None else None,
+      "programCodeExists": bool(row["programCodeExists"]) if programCode is not None else None,
+      "collegeCodeExists": bool(row["collegeCodeExists"]) if collegeCode is not None else None,
+    }
+
+  # Returns which of the given ID numbers are already taken, in a single query
+  @staticmethod
+  def findExistingIdNumbers(cursor: Any, idNumbers: List[str]) -> Set[str]:
+    if not idNumbers:
+      return set()
+
+    cursor.execute(f"SELECT id_number FROM students WHERE id_number IN ({', '.join(['%s'] * len(idNumbers))})", list(idNumbers))
+    return {(row["id_number"] if isinstance(row, dict) else row[0]).lower() for row in cursor.fetchall()}
+
+  # Inserts already validated (id, first, last, year, gender, program) rows as one multi-row INSERT in one transaction
+  # Errors are raised so the caller can tell which rows were rejected
+  @staticmethod
+  def insertStudentRows(conn: Any, rows: List[Tuple[Any, ...]]) -> int:
+    cursor = conn.cursor()
+
+    try:
+      conn.start_transaction()
+      cursor.executemany("""
+        INSERT INTO students (id_number, first_name, last_name, year_level, gender, program_code)
+        VALUES (%s, %s, %s, %s, %s, %s)
+      """, rows)
+      conn.commit()
+    except Exception:
+      conn.rollback()
+      raise
+    finally:
+      cursor.close()
+
+    invalidateTable("students")
+    return len(rows)
+
   # Gets a student record
   @staticmethod
   def getStudentRecord(studentId: str) -> Dict[str, str]:
@@ -101,46 +175,177 @@ class Student:
     
     return student
   
-  # Get student records with page, search value, and sorting order
+  # Builds the WHERE clause shared by the paginated queries
+  # The "Any" search needs the open cursor to use the FULLTEXT index
   @staticmethod
-  def getStudentRecords(page=1, perPage=50, sortBy1="id_number", sortBy2="last_name", sortOrder="ASC", searchField=None, searchTerm="") -> Tuple[List[Dict[str, str]], int]:
-    conn = getConnection()
-
-    if not conn:
-      return [], 0
-    
-    cursor = conn.cursor(dictionary=True)
-    
+  def buildSearchQuery(searchField=None, searchTerm="", cursor=None) -> Tuple[str, List[Any]]:
     params = []
-    programs = []
-    offset = (page - 1) * perPage
-    searchTerms = searchTerm.split()
     searchQuery = "WHERE ("
 
+    # Decided before any column expression is built, so they all agree with buildStudentSource
+    if cursor is not None:
+      Student.collegeColumnAvailable(cursor)
+
     if searchField:
-      searchQuery += f"s.{searchField} LIKE %s" if searchField != "college_code" else f"c.{searchField} LIKE %s"
+      searchQuery += f"{Student.columnExpression(searchField)} LIKE %s"
       params.append(f"%{searchTerm}%")
     else:
-      searchQuery += """
-        s.id_number LIKE %s 
-        OR s.first_name LIKE %s
-        OR s.last_name LIKE %s
-        OR s.year_level LIKE %s
-        OR s.gender LIKE %s
-        OR s.program_code LIKE %s
-        OR c.college_code LIKE %s
-        OR CONCAT(s.first_name, ' ', s.last_name) LIKE %s
-      """
-      params.extend([f"%{searchTerm}%"] * 8)
+      anyQuery, anyParams = Student.buildAnySearchQuery(searchTerm.split(), cursor)
+      searchQuery += anyQuery
+      params.extend(anyParams)
 
     searchQuery += ")"
 
+    return searchQuery, params
+
+  # Every search term has to match at least one field; terms long enough for the n-gram index are matched through it
+  @staticmethod
+  def buildAnySearchQuery(searchTerms: List[str], cursor=None) -> Tuple[str, List[Any]]:
+    conditions = []
+    params = []
+    booleanTerms = []
+    useIndex = cursor is not None and Student.searchIndexAvailable(cursor)
+
+    for term in searchTerms:
+      term = term.replace('"', "")
+      if not term:
+        continue
+
+      if not useIndex or len(term) < Student.SEARCH_INDEX_MIN_TOKEN_LENGTH:
+        conditions.append(f"""(
+          s.id_number LIKE %s
+          OR s.first_name LIKE %s
+          OR s.last_name LIKE %s
+          OR s.year_level LIKE %s
+          OR s.gender LIKE %s
+          OR s.program_code LIKE %s
+          OR {Student.columnExpression("college_code")} LIKE %s
+        )""")
+        params.extend([f"%{term}%"] * 7)
+        continue
+
+      # College codes are not in the index, so a term naming a college also accepts that college's programs
+      alternatives = [term] + Student.getProgramCodesOfMatchingColleges(cursor, term)
+      booleanTerm = "+(" + " ".join(f'"{alternative}"' for alternative in alternatives) + ")"
+
+      # Gender is an ENUM and cannot be indexed, so terms that could name one need their own condition
+      genders = [gender for gender in Student.GENDERS if term.lower() in gender.lower()]
+      if genders:
+        conditions.append(f"(MATCH({Student.SEARCH_INDEX_COLUMNS}) AGAINST (%s IN BOOLEAN MODE) OR s.gender IN ({', '.join(['%s'] * len(genders))}))")
+        params.append(booleanTerm)
+        params.extend(genders)
+      else:
+        booleanTerms.append(booleanTerm)
+
+    # All plain terms share a single MATCH so the index does the intersection
+    if booleanTerms:
+      conditions.insert(0, f"MATCH({Student.SEARCH_INDEX_COLUMNS}) AGAINST (%s IN BOOLEAN MODE)")
+      params.insert(0, " ".join(booleanTerms))
+
+    if not conditions:
+      return "TRUE", []
+
+    return " AND ".join(conditions), params
+
+  # Checks once whether initDatabase managed to create the FULLTEXT index
+  @staticmethod
+  def searchIndexAvailable(cursor: Any) -> bool:
+    if Student.hasSearchIndex is None:
+      try:
+        Student.hasSearchIndex = getBackend().indexExists(cursor, "students", "ft_students_search")
+      except Exception as e:
+        print(f"Student Model Error checking for search index: {e}")
+        return False
+
+    return Student.hasSearchIndex
+
+  # Checks once whether migration 3 has added students.college_code
+  @staticmethod
+  def collegeColumnAvailable(cursor: Any) -> bool:
+    if Student.hasCollegeColumn is None:
+      try:
+        Student.hasCollegeColumn = getBackend().columnExists(cursor, "students", "college_code")
+      except Exception as e:
+        print(f"Student Model Error checking for college column: {e}")
+        return False
+
+    return Student.hasCollegeColumn
+
+  # The column list and FROM clause of a student listing, joining for the college only when students lack the column
+  @staticmethod
+  def buildStudentSource(cursor: Any) -> Tuple[str, str]:
+    if Student.collegeColumnAvailable(cursor):
+      return "s.*", "students s"
+
+    return "s.*, c.college_code", f"students s {Student.COLLEGE_JOINS}"
+
+  @staticmethod
+  def columnExpression(field: str) -> str:
+    if field == "college_code" and not Student.hasCollegeColumn:
+      return "c.college_code"
+
+    return f"s.{field}"
+
+  @staticmethod
+  def getProgramCodesOfMatchingColleges(cursor: Any, term: str) -> List[str]:
+    try:
+      cursor.execute("SELECT program_code FROM programs WHERE college_code LIKE %s", (f"%{term}%",))
+      rows = cursor.fetchall()
+    except Exception as e:
+      print(f"Student Model Error fetching programs of colleges: {e}")
+      return []
+
+    return [(row["program_code"] if isinstance(row, dict) else row[0]).replace('"', "") for row in rows]
+
+  # Builds the seek predicate that selects rows strictly after (or before) a (sortBy1, sortBy2, id_number) cursor
+  @staticmethod
+  def buildSeekQuery(sortColumns: List[Tuple[str, str]], seekCursor: Tuple[Any, ...], seekDirection="next") -> Tuple[str, List[Any]]:
+    columns = list(zip(sortColumns, seekCursor))
+    conditions = []
+    params = []
+
+    for i, ((field, order), value) in enumerate(columns):
+      terms = []
+
+      # Every earlier sort column has to be tied with the cursor
+      for (prevField, _), prevValue in columns[:i]:
+        if prevValue is None:
+          terms.append(f"{Student.columnExpression(prevField)} IS NULL")
+        else:
+          terms.append(f"{Student.columnExpression(prevField)} = %s")
+          params.append(prevValue)
+
+      # Going backwards is the same seek with every column's direction flipped
+      ascending = (order == "ASC") == (seekDirection == "next")
+      expression = Student.columnExpression(field)
+      comparisonExpression, valueExpression = getBackend().seekOrdinalExpressions.get(field, (expression, "%s"))
+
+      # NULLs sort first in ascending order and last in descending order
+      if value is None:
+        terms.append(f"{expression} IS NOT NULL" if ascending else "FALSE")
+      elif ascending:
+        terms.append(f"{comparisonExpression} > {valueExpression}")
+        params.append(value)
+      else:
+        terms.append(f"({comparisonExpression} < {valueExpression} OR {expression} IS NULL)")
+        params.append(value)
+
+      conditions.append("(" + " AND ".join(terms) + ")")
+
+    return "(" + " OR ".join(conditions) + ")", params
+
+  # Runs the exact COUNT(*) for a search on an open cursor and caches it
+  @staticmethod
+  def fetchStudentCount(cursor: Any, searchField=None, searchTerm="") -> int:
+    generation = countCache.generation("students")
+    searchQuery, params = Student.buildSearchQuery(searchField, searchTerm, cursor)
+
     # Query to get the total count of matching records
+    _, source = Student.buildStudentSource(cursor)
+
     countQuery = f"""
       SELECT COUNT(*) as total 
-      FROM students s 
-      LEFT JOIN programs p ON s.program_code = p.program_code
-      LEFT JOIN colleges c ON p.college_code = c.college_code
+      FROM {source}
       {searchQuery}
     """
 
@@ -149,30 +354,140 @@ class Student:
       totalRecords = cursor.fetchone()["total"]
     except Exception as e:
       print(f"Student Model Error fetching student count: {e}")
-      totalRecords = 0
+      return 0
+
+    countCache.set("students", searchField, searchTerm, totalRecords, generation)
+    return totalRecords
+
+  # Gets the exact number of students matching a search
+  @staticmethod
+  def countStudentRecords(searchField=None, searchTerm="") -> int:
+    totalRecords = countCache.get("students", searchField, searchTerm)
+    if totalRecords is not None:
+      return totalRecords
+
+    conn = getConnection()
+
+    if not conn:
+      return 0
+
+    cursor = conn.cursor(dictionary=True)
+
+    try:
+      return Student.fetchStudentCount(cursor, searchField, searchTerm)
+    finally:
+      cursor.close()
+      conn.close()
+
+  # Checks if the total for a search is already known exactly
+  @staticmethod
+  def isCountCached(searchField=None, searchTerm="") -> bool:
+    return countCache.contains("students", searchField, searchTerm)
+
+  # Get student records with page, search value, and sorting order
+  # approximateCount lets an unfiltered listing report the table statistics estimate instead of running COUNT(*)
+  # Passing seekCursor (the sortBy1, sortBy2, id_number values of the last or first row seen) fetches the next or previous page by keyset instead of OFFSET
+  @staticmethod
+  def getStudentRecords(page=1, perPage=50, sortBy1="id_number", sortBy2="last_name", sortOrder="ASC", searchField=None, searchTerm="", seekCursor=None, seekDirection="next", approximateCount=False) -> Tuple[List[Dict[str, str]], int]:
+    # Pages are cached by their whole query until a write touches students or the programs and colleges they show
+    pageKey = (page, perPage, sortBy1, sortBy2, sortOrder, searchField, searchTerm, None if seekCursor is None else tuple(seekCursor), seekDirection)
+    students = pageCache.get("students", pageKey)
+
+    # Totals are cached per search until a write touches the students table
+    totalRecords = countCache.get("students", searchField, searchTerm)
+
+    if students is not None and totalRecords is not None:
+      return students, totalRecords
+
+    conn = getConnection()
+
+    if not conn:
+      return [], 0
+    
+    cursor = conn.cursor(dictionary=True)
+    
+    offset = (page - 1) * perPage
+    searchQuery, params = Student.buildSearchQuery(searchField, searchTerm, cursor)
+
+    if totalRecords is None and approximateCount and not searchTerm:
+      totalRecords = estimateRowCount(cursor, "students")
+
+    if totalRecords is None:
+      totalRecords = Student.fetchStudentCount(cursor, searchField, searchTerm)
+
+    if students is not None:
+      cursor.close()
+      conn.close()
+      return students, totalRecords
+
+    students = []
+    generation = pageCache.generation("students")
+
+    # id_number breaks ties so every row has a unique position to seek from
+    sortColumns = [(sortBy1, sortOrder), (sortBy2, "ASC"), ("id_number", "ASC")]
+
+    if seekCursor is not None:
+      seekQuery, seekParams = Student.buildSeekQuery(sortColumns, seekCursor, seekDirection)
+      searchQuery += f" AND {seekQuery}"
+      params.extend(seekParams)
+
+    # Previous pages are read in reverse order and flipped back afterwards
+    reverse = seekCursor is not None and seekDirection == "prev"
+    orderBy = Student.buildOrderBy(sortColumns, reverse)
+
+    columns, source = Student.buildStudentSource(cursor)
 
     query = f"""
-      SELECT s.*, c.college_code 
-      FROM students s 
-      LEFT JOIN programs p ON s.program_code = p.program_code
-      LEFT JOIN colleges c ON p.college_code = c.college_code
+      SELECT {columns}
+      FROM {source}
       {searchQuery}
-      ORDER BY {sortBy1} {sortOrder}, {sortBy2} ASC
-      LIMIT %s OFFSET %s
+      ORDER BY {orderBy}
+      LIMIT %s {"OFFSET %s" if seekCursor is None else ""}
     """
 
-    params.extend([perPage, offset])
+    params.append(perPage)
+    if seekCursor is None:
+      params.append(offset)
 
     try:
-      cursor.execute(query, params)
-      programs = cursor.fetchall()
+      # Page queries come in a handful of shapes, so each is prepared once per connection and reused
+      students = statementCache.fetchAll(conn, query, params)
+      if reverse:
+        students.reverse()
+      pageCache.set("students", pageKey, students, generation)
     except Exception as e:
       print(f"Student Model Error fetching students: {e}")
     finally:
       cursor.close()
       conn.close()
     
-    return programs, totalRecords
+    return students, totalRecords
+
+  @staticmethod
+  def buildOrderBy(sortColumns: List[Tuple[str, str]], reverse=False) -> str:
+    return ", ".join(
+      f"{Student.columnExpression(field)} {order if not reverse else ('DESC' if order == 'ASC' else 'ASC')}"
+      for field, order in sortColumns
+    )
+
+  # Streams every student matching a search in table order, for exports that cannot hold the result in memory
+  @staticmethod
+  def iterStudentRecords(sortBy1="id_number", sortBy2="last_name", sortOrder="ASC", searchField=None, searchTerm="", batchSize=1000, textOnly=False) -> Iterator[List[Dict[str, Any]]]:
+    def buildQuery(cursor):
+      searchQuery, params = Student.buildSearchQuery(searchField, searchTerm, cursor)
+      orderBy = Student.buildOrderBy([(sortBy1, sortOrder), (sortBy2, "ASC"), ("id_number", "ASC")])
+
+      columns, source = Student.buildStudentSource(cursor)
+
+      query = f"""
+        SELECT {columns}
+        FROM {source}
+        {searchQuery}
+        ORDER BY {orderBy}
+      """
+      return query, params
+
+    return streamQuery(buildQuery, batchSize, textOnly)
 
   # Get all student records by first name
   @staticmethod
@@ -182,12 +497,11 @@ class Student:
 
     if conn:
       cursor = conn.cursor(dictionary=True)
-      query = """
-        SELECT s.*, c.college_code 
-        FROM students s 
-        LEFT JOIN programs p ON s.program_code = p.program_code
-        LEFT JOIN colleges c ON p.college_code = c.college_code
-        WHERE first_name = %s
+      columns, source = Student.buildStudentSource(cursor)
+      query = f"""
+        SELECT {columns}
+        FROM {source}
+        WHERE s.first_name = %s
         ORDER BY id_number;
       """
 
@@ -212,12 +526,11 @@ class Student:
 
     if conn:
       cursor = conn.cursor(dictionary=True)
-      query = """
-        SELECT s.*, c.college_code 
-        FROM students s 
-        LEFT JOIN programs p ON s.program_code = p.program_code
-        LEFT JOIN colleges c ON p.college_code = c.college_code
-        WHERE last_name = %s
+      columns, source = Student.buildStudentSource(cursor)
+      query = f"""
+        SELECT {columns}
+        FROM {source}
+        WHERE s.last_name = %s
         ORDER BY id_number;
       """
 
@@ -242,12 +555,11 @@ class Student:
 
     if conn:
       cursor = conn.cursor(dictionary=True)
-      query = """
-        SELECT s.*, c.college_code 
-        FROM students s 
-        LEFT JOIN programs p ON s.program_code = p.program_code
-        LEFT JOIN colleges c ON p.college_code = c.college_code
-        WHERE year_level = %s
+      columns, source = Student.buildStudentSource(cursor)
+      query = f"""
+        SELECT {columns}
+        FROM {source}
+        WHERE s.year_level = %s
         ORDER BY id_number;
       """
 
@@ -272,12 +584,11 @@ class Student:
 
     if conn:
       cursor = conn.cursor(dictionary=True)
-      query = """
-        SELECT s.*, c.college_code 
-        FROM students s 
-        LEFT JOIN programs p ON s.program_code = p.program_code
-        LEFT JOIN colleges c ON p.college_code = c.college_code
-        WHERE gender = %s
+      columns, source = Student.buildStudentSource(cursor)
+      query = f"""
+        SELECT {columns}
+        FROM {source}
+        WHERE s.gender = %s
         ORDER BY id_number;
       """
 
@@ -302,12 +613,11 @@ class Student:
 
     if conn:
       cursor = conn.cursor(dictionary=True)
-      query = """
-        SELECT s.*, c.college_code 
-        FROM students s 
-        LEFT JOIN programs p ON s.program_code = p.program_code
-        LEFT JOIN colleges c ON p.college_code = c.college_code
-        WHERE program_code = %s
+      columns, source = Student.buildStudentSource(cursor)
+      query = f"""
+        SELECT {columns}
+        FROM {source}
+        WHERE s.program_code = %s
         ORDER BY id_number;
       """
 
@@ -332,12 +642,11 @@ class Student:
 
     if conn:
       cursor = conn.cursor(dictionary=True)
-      query = """
-        SELECT s.id_number, s.first_name, s.last_name, s.year_level, s.gender p.program_code, c.college_code
-        FROM students s
-        LEFT JOIN programs p ON s.program_code = p.program_code
-        LEFT JOIN colleges c ON p.college_code = c.college_code
-        WHERE c.college_code = %s
+      columns, source = Student.buildStudentSource(cursor)
+      query = f"""
+        SELECT {columns}
+        FROM {source}
+        WHERE {Student.columnExpression("college_code")} = %s
         ORDER BY id_number;
       """
 
@@ -364,20 +673,12 @@ class Student:
     
     cursor = conn.cursor(dictionary=True)
 
-    setClause = ", ".join(f'{key} = %s' for key in updateData.keys())
-    values = tuple(updateData.values()) + (studentId,)
-
-    query = f"""
-      UPDATE students
-      SET {setClause}
-      WHERE id_number = %s;
-    """
-
     try:
-      cursor.execute(query, values)
+      isUpdated = Student.updateStudent(cursor, studentId, updateData)
       conn.commit()
+      invalidateTable("students")
 
-      return cursor.rowcount >= 0
+      return isUpdated
 
     except Exception as e:
       print(f"Student Model Error updating student: {e}")
@@ -387,45 +688,73 @@ class Student:
       cursor.close()
       conn.close()
   
-  # Batch updates student information
+  # Batch updates student information in chunks; returns which students were updated, failed or never reached
   @staticmethod
-  def updateBatchStudentRecordsById(studentIds: List[str], updateData: Dict[str, str]) -> bool:
-    conn = getConnection()
-    
-    if not studentIds:
-      return False
-    
-    if not conn:
-      return False
-    
-    cursor = conn.cursor(dictionary=True)
+  def updateBatchStudentRecordsById(studentIds: List[str], updateData: Dict[str, str], chunkSize: int = BATCH_CHUNK_SIZE, singleTransaction: bool = False, progressCallback=None, cancelEvent=None) -> Dict[str, Any]:
+    applyChunk = lambda cursor, chunk: Student.updateStudents(cursor, chunk, updateData)
+    return runBatch("students", "id_number", studentIds, applyChunk, chunkSize, singleTransaction, progressCallback, cancelEvent)
 
+  # Updates a student on an open cursor, so the update can share a transaction with its checks
+  @staticmethod
+  def updateStudent(cursor: Any, studentId: str, updateData: Dict[str, str]) -> bool:
     setClause = ", ".join(f'{key} = %s' for key in updateData.keys())
-    values = tuple(updateData.values())
+    values = tuple(updateData.values()) + (studentId,)
 
+    cursor.execute(f"""
+      UPDATE students
+      SET {setClause}
+      WHERE id_number = %s;
+    """, values)
+
+    return cursor.rowcount >= 0
+
+  # Updates many students on an open cursor with one statement
+  @staticmethod
+  def updateStudents(cursor: Any, studentIds: List[str], updateData: Dict[str, str]) -> bool:
+    setClause = ", ".join(f'{key} = %s' for key in updateData.keys())
     idNumberPlaceholders = ", ".join(["%s"] * len(studentIds))
-    whereClause = f"WHERE id_number IN ({idNumberPlaceholders})"
-    values += tuple(studentIds)
+    values = tuple(updateData.values()) + tuple(studentIds)
 
-    query = f"""
+    cursor.execute(f"""
       UPDATE students
       SET {setClause}
-      {whereClause}
-    """
+      WHERE id_number IN ({idNumberPlaceholders})
+    """, values)
 
-    try:
-      cursor.execute(query, values)
-      conn.commit()
+    return cursor.rowcount >= 0
+
+  # Updates every student matching a search with one statement on an open cursor, joining for the college when needed
+  @staticmethod
+  def updateStudentRecordsBySearch(cursor: Any, searchField=None, searchTerm="", updateData: Dict[str, Any] = None) -> int:
+    searchQuery, params = Student.buildSearchQuery(searchField, searchTerm, cursor)
+    _, source = Student.buildStudentSource(cursor)
 
-      return cursor.rowcount >= 0
+    if getBackend().joinedWrites:
+      setClause = ", ".join(f"s.{key} = %s" for key in updateData.keys())
+      statement = f"UPDATE {source} SET {setClause} {searchQuery}"
+    else:
+      # Engines without joined writes always have the college column, so the source is students alone
+      setClause = ", ".join(f"{key} = %s" for key in updateData.keys())
+      statement = f"UPDATE students AS s SET {setClause} {searchQuery}"
 
-    except Exception as e:
-      print(f"Student Model Error batch updating students: {e}")
-      return False
-    
-    finally:
-      cursor.close()
-      conn.close()
+    cursor.execute(statement, tuple(updateData.values()) + tuple(params))
+
+    return cursor.rowcount
+
+  # Deletes every student matching a search with one statement on an open cursor
+  @staticmethod
+  def deleteStudentRecordsBySearch(cursor: Any, searchField=None, searchTerm="") -> int:
+    searchQuery, params = Student.buildSearchQuery(searchField, searchTerm, cursor)
+    _, source = Student.buildStudentSource(cursor)
+
+    if getBackend().joinedWrites:
+      statement = f"DELETE s FROM {source} {searchQuery}"
+    else:
+      statement = f"DELETE FROM students AS s {searchQuery}"
+
+    cursor.execute(statement, tuple(params))
+
+    return cursor.rowcount
 
   # Removes a student record
   @staticmethod
@@ -444,6 +773,7 @@ class Student:
     try:
       cursor.execute(query, (studentId,))
       conn.commit()
+      invalidateTable("students")
 
       return cursor.rowcount > 0
 
@@ -455,35 +785,19 @@ class Student:
       cursor.close()
       conn.close()
 
-  # Batch Removes student records
+  # Batch Removes student records in chunks; returns which students were removed, failed or never reached
   @staticmethod
-  def removeBatchStudentRecordsById(studentIds: List[str]) -> bool:
-    conn = getConnection()
-    
-    if not conn:
-      return False
-    
-    cursor = conn.cursor(dictionary=True)
+  def removeBatchStudentRecordsById(studentIds: List[str], chunkSize: int = BATCH_CHUNK_SIZE, singleTransaction: bool = False, progressCallback=None, cancelEvent=None) -> Dict[str, Any]:
+    return runBatch("students", "id_number", studentIds, Student.deleteStudents, chunkSize, singleTransaction, progressCallback, cancelEvent)
 
-    idNumberPlaceholders = ", ".join(["%s"] * len(studentIds))
-    whereClause = f"WHERE id_number IN ({idNumberPlaceholders})"
-    values = tuple(studentIds)
-
-    query = f"""
-      DELETE FROM students 
-      {whereClause}
-    """
-
-    try:
-      cursor.execute(query, values)
-      conn.commit()
+  # Deletes many students on an open cursor with one statement
+  @staticmethod
+  def deleteStudents(cursor: Any, studentIds: List[str]) -> int:
+    placeholders = ", ".join(["%s"] * len(studentIds))
 
-      return cursor.rowcount > 0
+    cursor.execute(f"""
+      DELETE FROM students
+      WHERE id_number IN ({placeholders})
+    """, tuple(studentIds))
 
-    except Exception as e:
-      print(f"Student Model Error batch deleting students: {e}")
-      return False
-    
-    finally:
-      cursor.close()
-      conn.close()
\ No newline at end of file
+    return cursor.rowcount
@@ -0,0 +1,287 @@
+import argparse
+import asyncio
+import functools
+import gzip
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Tuple, Any, Optional
+from urllib.parse import urlsplit, parse_qs, unquote
+
+from database.db import POOL_MAX_SIZE, getPoolStats, closePool
+from database.queryCache import pageCache
+from controllers import studentControllers, programControllers, collegeControllers
+from controllers.importControllers import STUDENT_IMPORT_FIELDS, PROGRAM_IMPORT_FIELDS, COLLEGE_IMPORT_FIELDS
+
+# HTTP/JSON API over the controllers, so several front-ends and services can share one set of pooled connections
+# The event loop only parses requests and writes responses; controller calls block, so they run on a thread pool
+# sized like the connection pool, and a request waits for a worker rather than for a connection
+#
+#   GET    /students?page=1&perPage=50&sortBy1=last_name&sortOrder=DESC&searchField=program_code&search=BSCS
+#   POST   /students                 JSON body with the fields of a new student
+#   PUT    /students/2024-0001       JSON body with the fields to change
+#   DELETE /students/2024-0001
+#   (the same for /programs and /colleges), and GET /health
+
+API_HOST = os.getenv("LEXIS_API_HOST", "127.0.0.1")
+API_PORT = int(os.getenv("LEXIS_API_PORT", "8080"))
+API_WORKERS = int(os.getenv("LEXIS_API_WORKERS", str(POOL_MAX_SIZE)))
+
+MAX_PER_PAGE = 500
+MAX_BODY_SIZE = 1024 * 1024
+GZIP_MIN_SIZE = 1024
+KEEP_ALIVE_TIMEOUT = 15
+
+REASONS = {200: "OK", 201: "Created", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+# (key field, fields in the argument order of the add and update controllers, listing, add, update, remove)
+# Students accept partial updates; programs and colleges are replaced whole, so every field is required
+ENTITIES = {
+  "students": ("id_number", [field for field, _ in STUDENT_IMPORT_FIELDS], studentControllers.getStudents, studentControllers.addStudent, studentControllers.updateStudent, studentControllers.removeStudent),
+  "programs": ("program_code", [field for field, _ in PROGRAM_IMPORT_FIELDS], programControllers.getPrograms, programControllers.addProgram, programControllers.updateProgram, programControllers.removeProgram),
+  "colleges": ("college_code", [field for field, _ in COLLEGE_IMPORT_FIELDS], collegeControllers.getColleges, collegeControllers.addCollege, collegeControllers.updateCollege, collegeControllers.removeCollege),
+}
+
+class HttpError(Exception):
+  def __init__(self, status: int, message: str):
+    super().__init__(message)
+    self.status = status
+
+class ApiServer:
+  def __init__(self, workers: int = API_WORKERS):
+    if workers > POOL_MAX_SIZE:
+      print(f"API workers ({workers}) exceed DB_POOL_MAX_SIZE ({POOL_MAX_SIZE}); the extra workers will wait for connections")
+
+    self.workers = workers
+    self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lexis-api")
+
+  async def serve(self, host: str = API_HOST, port: int = API_PORT) -> None:
+    server = await asyncio.start_server(self.handleConnection, host, port, backlog=1024)
+    print(f"Lexis API listening on http://{host}:{port} with {self.workers} workers")
+
+    async with server:
+      await server.serve_forever()
+
+  def close(self) -> None:
+    self.executor.shutdown(wait=False, cancel_futures=True)
+
+  # One connection serves requests until the client closes it, asks to, or stays idle past the keep-alive timeout
+  async def handleConnection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+      while True:
+        try:
+          request = await asyncio.wait_for(readRequest(reader), KEEP_ALIVE_TIMEOUT)
+        except HttpError as e:
+          writer.write(buildResponse(e.status, {"error": str(e)}, {}, keepAlive=False))
+          break
+
+        if request is None:
+          break
+
+        method, target, headers, body = request
+        keepAlive = headers.get("connection", "").lower() != "close"
+
+        status, payload, extraHeaders = await self.dispatch(method, target, headers, body)
+        writer.write(buildResponse(status, payload, headers, keepAlive, extraHeaders, cacheable=method == "GET"))
+        await writer.drain()
+
+        if not keepAlive:
+          break
+
+    except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+      pass
+
+    finally:
+      writer.close()
+
+  async def dispatch(self, method: str, target: str, headers: Dict[str, str], body: bytes) -> Tuple[int, Any, Dict[str, str]]:
+    try:
+      url = urlsplit(target)
+      parts = [unquote(part) for part in url.path.strip("/").split("/") if part]
+      query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+
+      if parts == ["health"] and method == "GET":
+        return 200, {"status": "ok", "workers": self.workers, "pool": getPoolStats(), "pageCache": pageCache.stats()}, {}
+
+      if not parts or parts[0] not in ENTITIES or len(parts) > 2:
+        raise HttpError(404, "Not found")
+
+      entity = parts[0]
+      key = parts[1] if len(parts) == 2 else None
+
+      if method == "GET" and key is None:
+        return 200, await self.run(listRecords, entity, query), {}
+      if method == "POST" and key is None:
+        return 201, await self.run(addRecord, entity, parseJson(body)), {}
+      if method == "PUT" and key is not None:
+        return 200, await self.run(updateRecord, entity, key, parseJson(body)), {}
+      if method == "DELETE" and key is not None:
+        return 200, await self.run(removeRecord, entity, key), {}
+
+      raise HttpError(405, f"{method} is not supported here")
+
+    except HttpError as e:
+      return e.status, {"error": str(e)}, {}
+
+    except Exception as e:
+      print(f"API Error handling {method} {target}: {e}")
+      return 500, {"error": "Internal server error"}, {}
+
+  async def run(self, function, *args):
+    return await asyncio.get_running_loop().run_in_executor(self.executor, functools.partial(function, *args))
+
+#--------------------------------------------------------------------------
+
+# Field names end up in the SQL, so sorting and searching only accept the entity's own columns
+def listRecords(entity: str, query: Dict[str, str]) -> Dict[str, Any]:
+  keyField, fields, getRecords, _, _, _ = ENTITIES[entity]
+
+  page = parsePositiveInt(query.get("page", "1"), "page")
+  perPage = min(parsePositiveInt(query.get("perPage", "50"), "perPage"), MAX_PER_PAGE)
+  sortBy1 = parseField(query.get("sortBy1", keyField), fields, "sortBy1")
+  sortBy2 = parseField(query.get("sortBy2", fields[1] if sortBy1 == keyField else keyField), fields, "sortBy2")
+  searchField = parseField(query["searchField"], fields, "searchField") if query.get("searchField") else None
+  sortOrder = query.get("sortOrder", "ASC").upper()
+
+  if sortOrder not in ("ASC", "DESC"):
+    raise HttpError(400, "sortOrder must be ASC or DESC")
+
+  records, totalRecords = getRecords(page=page, perPage=perPage, sortBy1=sortBy1, sortBy2=sortBy2, sortOrder=sortOrder, searchField=searchField, searchTerm=query.get("search", ""))
+
+  return {"records": records, "total": totalRecords, "page": page, "perPage": perPage}
+
+def addRecord(entity: str, data: Dict[str, Any]) -> Dict[str, Any]:
+  _, fields, _, addController, _, _ = ENTITIES[entity]
+  return controllerResult(addController(*[data.get(field) for field in fields]))
+
+def updateRecord(entity: str, key: str, data: Dict[str, Any]) -> Dict[str, Any]:
+  _, fields, _, _, updateController, _ = ENTITIES[entity]
+  values = [data.get(field) for field in fields]
+
+  if entity == "students":
+    return controllerResult(updateController(key, *values, False))
+
+  missing = [field for field, value in zip(fields, values) if value in (None, "")]
+  if missing:
+    raise HttpError(400, f"Missing fields: {', '.join(missing)}")
+
+  return controllerResult(updateController(key, *values))
+
+def removeRecord(entity: str, key: str) -> Dict[str, Any]:
+  _, _, _, _, _, removeController = ENTITIES[entity]
+  return controllerResult(removeController(key), notFoundOnFailure=True)
+
+# The controllers answer with a status message; anything but a success becomes an HTTP error
+def controllerResult(message: str, notFoundOnFailure: bool = False) -> Dict[str, Any]:
+  if "successfully" in message:
+    return {"message": message}
+
+  if "already exists" in message:
+    raise HttpError(409, message)
+
+  raise HttpError(404 if notFoundOnFailure else 400, message)
+
+def parsePositiveInt(value: str, name: str) -> int:
+  if not value.isdigit() or int(value) < 1:
+    raise HttpError(400, f"{name} must be a positive integer")
+  return int(value)
+
+def parseField(value: str, fields: List[str], name: str) -> str:
+  if value not in fields:
+    raise HttpError(400, f"{name} must be one of {', '.join(fields)}")
+  return value
+
+def parseJson(body: bytes) -> Dict[str, Any]:
+  try:
+    data = json.loads(body or b"{}")
+  except ValueError:
+    raise HttpError(400, "Body must be JSON")
+
+  if not isinstance(data, dict):
+    raise HttpError(400, "Body must be a JSON object")
+
+  return data
+
+#--------------------------------------------------------------------------
+
+# Returns (method, target, lowercased headers, body), or None once the client has closed the connection
+async def readRequest(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+  try:
+    head = await reader.readuntil(b"\r\n\r\n")
+  except asyncio.IncompleteReadError as e:
+    if e.partial.strip():
+      raise HttpError(400, "Incomplete request")
+    return None
+  except asyncio.LimitOverrunError:
+    raise HttpError(413, "Request headers too large")
+
+  lines = head.decode("latin-1").split("\r\n")
+  try:
+    method, target, _ = lines[0].split(" ", 2)
+  except ValueError:
+    raise HttpError(400, "Malformed request line")
+
+  headers = {}
+  for line in lines[1:]:
+    if ":" in line:
+      name, value = line.split(":", 1)
+      headers[name.strip().lower()] = value.strip()
+
+  contentLength = int(headers.get("content-length", "0") or 0)
+  if contentLength > MAX_BODY_SIZE:
+    raise HttpError(413, "Request body too large")
+
+  body = await reader.readexactly(contentLength) if contentLength else b""
+  return method.upper(), target, headers, body
+
+# GET responses carry an ETag of their body, so a client that already holds the page gets an empty 304 back;
+# large bodies are gzipped for clients that accept it
+def buildResponse(status: int, payload: Any, requestHeaders: Dict[str, str], keepAlive: bool = True, extraHeaders: Optional[Dict[str, str]] = None, cacheable: bool = False) -> bytes:
+  body = json.dumps(payload, default=str, separators=(",", ":")).encode("utf-8")
+  headers = {"Content-Type": "application/json", **(extraHeaders or {})}
+
+  if cacheable and status == 200:
+    etag = f'"{hashlib.sha1(body).hexdigest()[:24]}"'
+    headers["ETag"] = etag
+    headers["Cache-Control"] = "no-cache"
+
+    if etag in [tag.strip() for tag in requestHeaders.get("if-none-match", "").split(",")]:
+      status, body = 304, b""
+      del headers["Content-Type"]
+
+  if len(body) >= GZIP_MIN_SIZE and "gzip" in requestHeaders.get("accept-encoding", ""):
+    body = gzip.compress(body, compresslevel=5)
+    headers["Content-Encoding"] = "gzip"
+
+  if cacheable:
+    headers["Vary"] = "Accept-Encoding"
+
+  headers["Content-Length"] = str(len(body))
+  headers["Connection"] = "keep-alive" if keepAlive else "close"
+
+  head = f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}\r\n" + "".join(f"{name}: {value}\r\n" for name, value in headers.items()) + "\r\n"
+  return head.encode("latin-1") + body
+
+def main(argv: Optional[List[str]] = None) -> int:
+  parser = argparse.ArgumentParser(description="Serves the Lexis controllers as an HTTP/JSON API.")
+  parser.add_argument("--host", default=API_HOST)
+  parser.add_argument("--port", type=int, default=API_PORT)
+  parser.add_argument("--workers", type=int, default=API_WORKERS, help="threads running controller calls (default: DB_POOL_MAX_SIZE)")
+  args = parser.parse_args(argv)
+
+  server = ApiServer(args.workers)
+
+  try:
+    asyncio.run(server.serve(args.host, args.port))
+  except KeyboardInterrupt:
+    pass
+  finally:
+    server.close()
+    closePool()
+
+  return 0
+
+if __name__ == "__main__":
+  sys.exit(main())
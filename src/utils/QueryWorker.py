@@ -0,0 +1,95 @@
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+class QueryWorkerSignals(QObject):
+  finished = pyqtSignal(object)
+  failed = pyqtSignal(str)
+  # Long jobs (imports, exports) can be handed signals.progress.emit as their progress callback
+  progress = pyqtSignal(object)
+
+# Runs a blocking controller call on a QThreadPool thread and hands the result back through signals
+class QueryWorker(QRunnable):
+  def __init__(self, function, *args, **kwargs):
+    super().__init__()
+    self.function = function
+    self.args = args
+    self.kwargs = kwargs
+    self.signals = QueryWorkerSignals()
+    self.cancelled = False
+
+  # A query already sent to MySQL runs to completion, but its result is dropped
+  def cancel(self):
+    self.cancelled = True
+
+  # Cancels the worker and pulls it from the pool queue if it has not started yet
+  def withdraw(self, threadPool):
+    self.cancel()
+
+    try:
+      threadPool.tryTake(self)
+    except RuntimeError:
+      # The pool already ran it and deleted it, with its result still queued on the event loop
+      pass
+
+  def run(self):
+    if self.cancelled:
+      return
+
+    try:
+      result = self.function(*self.args, **self.kwargs)
+    except Exception as e:
+      if not self.cancelled:
+        self.signals.failed.emit(str(e))
+      return
+
+    if not self.cancelled:
+      self.signals.finished.emit(result)
+
+# Runs one query at a time for a view where only the latest request matters (page, sort and search changes)
+# Starting a new query cancels the previous one: it is pulled from the pool queue if it has not started yet,
+# otherwise its result is ignored when it arrives
+class LatestQueryRunner(QObject):
+  finished = pyqtSignal(object)
+  failed = pyqtSignal(str)
+
+  def __init__(self, parent=None, threadPool=None):
+    super().__init__(parent)
+    self.threadPool = threadPool or QThreadPool.globalInstance()
+    self.currentWorker = None
+
+  def run(self, function, *args, **kwargs):
+    self.cancel()
+
+    worker = QueryWorker(function, *args, **kwargs)
+    worker.signals.finished.connect(self.handleFinished)
+    worker.signals.failed.connect(self.handleFailed)
+
+    self.currentWorker = worker
+    self.threadPool.start(worker)
+
+  def cancel(self):
+    if self.currentWorker is None:
+      return
+
+    self.currentWorker.withdraw(self.threadPool)
+    self.currentWorker = None
+
+  def isBusy(self):
+    return self.currentWorker is not None
+
+  def isCurrent(self):
+    return self.currentWorker is not None and self.sender() is self.currentWorker.signals
+
+  def handleFinished(self, result):
+    # Results of superseded requests can still be queued on the event loop
+    if not self.isCurrent():
+      return
+
+    self.currentWorker = None
+    self.finished.emit(result)
+
+  def handleFailed(self, message):
+    if not self.isCurrent():
+      return
+
+    self.currentWorker = None
+    self.failed.emit(message)
@@ -5,6 +5,7 @@ from PyQt6 import uic
 from views.pages.StudentsPage import StudentsPage
 from views.pages.ProgramsPage import ProgramsPage 
 from views.pages.CollegesPage import CollegesPage
+from controllers.collegeControllers import refreshReferenceData
 
 class MainWindow(QMainWindow):
   def __init__(self):
@@ -52,6 +53,7 @@ class MainWindow(QMainWindow):
 
   def refreshTables(self):
     self.handleStatusMessage("Refreshing tables...", 3000)
+    refreshReferenceData()
     self.studentsPage.studentTable.refreshDisplayStudents()
     self.programsPage.programTable.refreshDisplayPrograms()
     self.collegesPage.collegeTable.refreshDisplayColleges()
\ No newline at end of file
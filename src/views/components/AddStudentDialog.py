@@ -1,8 +1,8 @@
 from PyQt6 import QtWidgets, QtCore, QtGui
 from PyQt6.QtCore import pyqtSignal
 
-from controllers.programControllers import getPrograms
-from controllers.collegeControllers import getColleges
+from controllers.programControllers import getProgramCodesByCollege
+from controllers.collegeControllers import getCollegeCodes
 from controllers.studentControllers import addStudent
 
 class AddStudentDialog(QtWidgets.QDialog):
@@ -74,8 +74,7 @@ class AddStudentDialog(QtWidgets.QDialog):
 
     # Getting all college_codes
     self.collegeCodeInput.addItems(["Select College"])
-    colleges, _ = getColleges()
-    collegeCodeList = [college["college_code"] for college in colleges]
+    collegeCodeList = getCollegeCodes()
 
     self.collegeCodeInput.addItems(collegeCodeList)
     self.collegeCodeInput.model().item(0).setEnabled(False)
@@ -190,8 +189,7 @@ class AddStudentDialog(QtWidgets.QDialog):
     self.programCodeInput.model().item(0).setEnabled(False)
 
     # Add new program options
-    programs, _ = getPrograms(searchField="college_code", searchTerm=selectedCollege)
-    programCodeList = [program["program_code"] for program in programs]
+    programCodeList = getProgramCodesByCollege(selectedCollege)
     self.programCodeInput.addItems(programCodeList)
 
   def showStatusMessage(self, message):
@@ -2,16 +2,19 @@ from operator import itemgetter
 
 from PyQt6 import QtWidgets, QtCore, QtGui
 from PyQt6.QtCore import pyqtSignal, Qt
-from PyQt6.QtWidgets import QGraphicsOpacityEffect, QTableWidgetItem
-from PyQt6.QtGui import QIcon
 
+from utils.QueryWorker import LatestQueryRunner
+from views.components.RecordTableModel import RecordTableModel
+from views.components.OperationsDelegate import OperationsDelegate
+from views.components.TransferProgressDialog import TransferProgressDialog
 from views.components.UpdateCollegeDialog import UpdateCollegeDialog
 
 from controllers.collegeControllers import getColleges, removeCollege, batchRemoveColleges
 
-class CollegeTable(QtWidgets.QTableWidget):
+class CollegeTable(QtWidgets.QTableView):
   # Student variables
   headers = ["College Code", "College Name", "Operations"]
+  columns = list(zip(headers, [("college_code",), ("college_name",), ()]))
   sortByFields = [("college_code", "college_name"), ("college_name", "college_code")]
   searchByFields = ["college_code", "college_name"]
 
@@ -26,10 +29,17 @@ class CollegeTable(QtWidgets.QTableWidget):
 
     self.parentWidget = parent
 
+    self.tableModel = RecordTableModel(self.columns, centeredColumns=(), parent=self)
+    self.operationsDelegate = OperationsDelegate(self)
+
     self.setupUI()
-    self.colleges = []
     self.sortByIndex = 0
     self.sortingOrder = 0
+    self.loadedSearch = None
+
+    self.pageQuery = LatestQueryRunner(self)
+    self.pageQuery.finished.connect(self.applyColleges)
+    self.pageQuery.failed.connect(self.displayQueryError)
 
     self.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.ExtendedSelection)
 
@@ -41,9 +51,13 @@ class CollegeTable(QtWidgets.QTableWidget):
     self.initialCollegesToDisplay()
     
   def setupUI(self):
-    self.setColumnCount(len(self.headers))
-    self.setSelectionBehavior(QtWidgets.QTableWidget.SelectionBehavior.SelectRows)
-    self.setEditTriggers(QtWidgets.QTableWidget.EditTrigger.NoEditTriggers)
+    self.setModel(self.tableModel)
+    self.setItemDelegateForColumn(2, self.operationsDelegate)
+    self.operationsDelegate.editClicked.connect(self.openUpdateCollegeDialog)
+    self.operationsDelegate.deleteClicked.connect(self.deleteSelectedRow)
+
+    self.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
+    self.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
     self.setSortingEnabled(False)
     self.setStyleSheet("""
                         QHeaderView::section { 
@@ -54,28 +68,18 @@ class CollegeTable(QtWidgets.QTableWidget):
                           font-weight: normal; 
                           font-size: 9pt;
                         }
-                        QPushButton { 
-                          font: 9pt "Inter"; 
-                          font-weight: bold; 
-                          padding: 0px 15px; 
-                          border-radius: 3px; 
-                        } 
                        
-                        QTableWidget {
+                        QTableView {
                             gridline-color: transparent;
                         }
-                        QTableWidget::item {
+                        QTableView::item {
                             border-bottom: 1px solid rgb(120, 139, 140); 
                             border-right: 1px solid transparent;
                         }
-                        QTableWidget::item:selected {
+                        QTableView::item:selected {
                           background-color: rgb(105, 105, 105); 
                         }
                        
-                        #deleteButton { background-color: rgb(160, 63, 63); } 
-                        #editButton { background-color: rgb(63, 150, 160); } 
-                        #editButton::hover { background-color: rgb(83, 170, 180); } 
-                        #deleteButton::hover { background-color: rgb(180, 83, 83); } 
                         QFrame { border: none; background: transparent; } 
                         QLabel { border: none; background: transparent; font: 9pt "Inter"; }
                       """)
@@ -88,17 +92,45 @@ class CollegeTable(QtWidgets.QTableWidget):
     header.setMinimumHeight(40)
     header.setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Stretch)
     header.setSectionResizeMode(2, QtWidgets.QHeaderView.ResizeMode.Fixed)
-    
-    self.setHorizontalHeaderLabels(self.headers)
 
   #--------------------------------------------------------------------------
   
   def refreshDisplayColleges(self):
-    self.setRowCount(0)
     self.updateSortByIndex()
     primaryField, secondaryField = self.sortByFields[self.sortByIndex]
     sortingOrder = "ASC" if self.sortingOrder == 0 else "DESC"
-    
+    searchField, searchValue = self.currentSearch()
+    page = int(self.parentWidget.page)
+
+    # Runs on the thread pool; a newer refresh cancels any that is still pending
+    self.pageQuery.run(lambda: (page, searchField, searchValue, getColleges(page=page, sortBy1=primaryField, sortBy2=secondaryField, sortOrder=sortingOrder, searchField=searchField, searchTerm=searchValue)))
+
+  # Searches narrow the rows on display when they can and only go to the database otherwise
+  def searchDisplayColleges(self):
+    searchField, searchValue = self.currentSearch()
+    if not self.narrowLoadedColleges(searchField, searchValue):
+      self.refreshDisplayColleges()
+
+  # When the rows on display hold every match of a broader search, a narrower one is filtered without a query
+  def narrowLoadedColleges(self, searchField, searchValue):
+    if self.loadedSearch is None or self.pageQuery.isBusy():
+      return False
+
+    loadedField, loadedValue = self.loadedSearch
+
+    # An unfiltered listing can be narrowed by any field, but college codes are matched exactly
+    if (loadedValue and loadedField != searchField) or (searchField == "college_code" and searchValue):
+      return False
+
+    if not RecordTableModel.isNarrowerSearch([loadedValue], [searchValue]):
+      return False
+
+    self.tableModel.filterRecords([searchField] if searchField else self.searchByFields, [searchValue])
+    self.loadedSearch = (searchField, searchValue)
+    self.updateLastPage(self.tableModel.rowCount())
+    return True
+
+  def currentSearch(self):
     searchField = None
     searchValue = ""
 
@@ -108,81 +140,46 @@ class CollegeTable(QtWidgets.QTableWidget):
         searchField = self.searchByFields[searchIndex - 2]
       searchValue = self.parentWidget.searchBarLineEdit.text().strip()
 
-    page = int(self.parentWidget.page)
+    return searchField, searchValue
 
-    colleges, totalCount = getColleges(page=page, sortBy1=primaryField, sortBy2=secondaryField, sortOrder=sortingOrder, searchField=searchField, searchTerm=searchValue)
-    self.colleges = colleges
-    
+  # The sort and search on display, as keyword arguments for the export controllers
+  def exportParameters(self):
+    self.updateSortByIndex()
+    primaryField, secondaryField = self.sortByFields[self.sortByIndex]
+    searchField, searchValue = self.currentSearch()
+
+    return {
+      "sortBy1": primaryField,
+      "sortBy2": secondaryField,
+      "sortOrder": "ASC" if self.sortingOrder == 0 else "DESC",
+      "searchField": searchField,
+      "searchTerm": searchValue,
+    }
+
+  def applyColleges(self, result):
+    page, searchField, searchValue, (colleges, totalCount) = result
+
+    self.updateLastPage(totalCount)
+    self.populateTable(colleges, page)
+
+    # A short first page is the whole result set
+    self.loadedSearch = (searchField, searchValue) if page == 1 and len(colleges) < 50 else None
+
+  def updateLastPage(self, totalCount):
     lastPage = (totalCount + 50 - 1) // 50
     self.parentWidget.lastPage = lastPage
     self.parentWidget.validator.setTop(lastPage)
     self.parentWidget.lastPageInfo.setText(f"of {lastPage}")
 
-    self.populateTable()
+  def displayQueryError(self, message):
+    self.statusMessageSignal.emit(f"Failed to load colleges: {message}", 3000)
   
   def initialCollegesToDisplay(self):
-    self.setRowCount(0)
-    colleges, _ = getColleges()
-    if not colleges:
-      self.colleges = []
-      return
-    
-    self.colleges = colleges
     self.refreshDisplayColleges()
 
-  def populateTable(self):
-    self.setRowCount(len(self.colleges))
-    
-    for row, college in enumerate(self.colleges):
-      self.setItem(row, 0, QtWidgets.QTableWidgetItem(str(college["college_code"])))
+  def populateTable(self, colleges, page):
+    self.tableModel.setRecords(colleges, rowOffset=(page - 1) * 50)
 
-      collegeName = QTableWidgetItem(college["college_name"])
-      self.setItem(row, 1, collegeName)
-      
-      operationsWidget = QtWidgets.QWidget()
-      operationsLayout = QtWidgets.QHBoxLayout()
-      operationsLayout.setContentsMargins(0, 0, 0, 0)
-      operationsLayout.setSpacing(0)
-
-      editButton = QtWidgets.QPushButton()
-      editButton.setObjectName("editButton")
-      editButton.setIcon(QIcon("assets/edit.png"))
-      editButton.setFixedSize(30, 30)
-      editButton.setCursor(QtCore.Qt.CursorShape.PointingHandCursor)
-      editButton.clicked.connect(lambda _, s=college: self.openUpdateCollegeDialog(s))
-      
-      self.editOpacity = QGraphicsOpacityEffect()
-      editButton.setGraphicsEffect(self.editOpacity)
-      self.editOpacity.setOpacity(0.0) 
-
-      deleteButton = QtWidgets.QPushButton()
-      deleteButton.setObjectName("deleteButton")
-      deleteButton.setIcon(QIcon("assets/delete.png"))
-      deleteButton.setFixedSize(30, 30)
-      deleteButton.setCursor(QtCore.Qt.CursorShape.PointingHandCursor)
-      deleteButton.clicked.connect(lambda _, s=college: self.deleteSelectedRow(s))
-
-      self.deleteOpacity = QGraphicsOpacityEffect()
-      deleteButton.setGraphicsEffect(self.deleteOpacity)
-      self.deleteOpacity.setOpacity(0.0)
-
-      operationsLayout.addWidget(editButton)
-      operationsLayout.addWidget(deleteButton)
-      operationsWidget.setLayout(operationsLayout)
-      operationsWidget.setStyleSheet(operationsWidget.setStyleSheet("""
-        QPushButton { font: 9pt "Inter"; font-weight: bold; padding: 0px 15px; border-radius: 3px; }
-        QPushButton#editButton { background-color: rgb(63, 150, 160); }
-        QPushButton#deleteButton { background-color: rgb(160, 63, 63); }
-        QPushButton#editButton:hover { background-color: rgb(83, 170, 180); }
-        QPushButton#deleteButton:hover { background-color: rgb(180, 83, 83); }
-      """))
-      
-      self.setCellWidget(row, 2, operationsWidget)
-
-    startIndex = (self.parentWidget.page * 50) - 49
-    self.setVerticalHeaderLabels([str(i) for i in range(startIndex, startIndex + 51)])
-    self.viewport().installEventFilter(self)
-  
   def updateSortByIndex(self):
     sortByIndex = self.parentWidget.sortByComboBox.currentIndex()
     sortingOrder = self.parentWidget.sortingOrderComboBox.currentIndex()
@@ -190,9 +187,12 @@ class CollegeTable(QtWidgets.QTableWidget):
     self.sortByIndex = max(0, sortByIndex - 1)
     self.sortingOrder = max(0, sortingOrder)
   
-  def openUpdateCollegeDialog(self, collegeRowData):
-    selectedRows = list(set(index.row() for index in self.selectedIndexes()))
-    collegeData = list(collegeRowData.values())
+  def selectedRows(self):
+    return sorted(index.row() for index in self.selectionModel().selectedRows())
+
+  def openUpdateCollegeDialog(self, row):
+    selectedRows = self.selectedRows()
+    collegeData = list(self.tableModel.record(row).values())
     self.updateDialog = UpdateCollegeDialog(self, collegeData)
     self.updateDialog.collegeUpdatedTableSignal.connect(self.refreshDisplayColleges)
     self.updateDialog.updateTablesSignal.connect(self.updateTablesSignal)
@@ -203,64 +203,62 @@ class CollegeTable(QtWidgets.QTableWidget):
       
     self.updateDialog.exec()
 
-  def deleteSelectedRow(self, college):
-    selectedRows = sorted(set(index.row() for index in self.selectedIndexes()), reverse=True)
+  def deleteSelectedRow(self, row):
+    selectedRows = self.selectedRows()
     selectedRowCount = len(selectedRows)
 
     # Multiple Deletions
     if len(selectedRows) > 1:
-      collegeCodesText = f'\n{"\n".join(f'{self.item(row, 0).text()}' for row in selectedRows)}'
+      collegeCodesText = f'\n{"\n".join(self.tableModel.value(selectedRow, "college_code") for selectedRow in selectedRows)}'
       promptText = f"the following colleges?\n{collegeCodesText}" if selectedRowCount < 20 else f"{selectedRowCount} colleges"
       if not self.showDeleteConfirmation(self, promptText):
         return
 
-      collegeCodes = []
-      for row in sorted(selectedRows, reverse=True):      # Reverse to avoid shifting indices
-        collegeCodes.append(self.colleges[row]["college_code"])
-
-      result = batchRemoveColleges(collegeCodes)
-      if result != "Colleges removed successfully.":
-        self.statusMessageSignal.emit("Failed to remove selected colleges.", 3000)
-        return
+      collegeCodes = [self.tableModel.value(selectedRow, "college_code") for selectedRow in selectedRows]
 
-      for row in sorted(selectedRows, reverse=True):  
-        self.colleges.pop(row)
-        self.removeRow(row)
-      
-      self.statusMessageSignal.emit("Selected colleges removed successfully.", 3000)
+      # Runs in chunks behind a progress dialog; the table is updated once it finishes
+      self.batchDialog = TransferProgressDialog(self, "Remove Colleges", f"Removing {selectedRowCount:,} colleges...", batchRemoveColleges, collegeCodes)
+      self.batchDialog.transferFinishedSignal.connect(self.handleBatchRemoveFinished)
+      self.batchDialog.transferFailedSignal.connect(self.handleBatchRemoveFailed)
+      self.batchDialog.start()
+      return
     
     # Single Deletion
     else:
+      college = self.tableModel.record(row)
       if not self.showDeleteConfirmation(self, college["college_name"]):
         return
 
-      # Remove from CSV
       result = removeCollege(college["college_code"])
 
       if result != "College removed successfully.":
         self.statusMessageSignal.emit(result, 3000)
         return
 
-      # Find the row index of the program
-      rowToRemove = -1
-      for row in range(self.rowCount()):
-        if self.item(row, 0) and self.item(row, 0).text() == str(college["college_code"]):
-          rowToRemove = row
-          break
+      # The row may have moved while the confirmation was open
+      rowToRemove = self.tableModel.findRow("college_code", college["college_code"])
 
       if rowToRemove == -1:
         self.statusMessageSignal.emit("Error: College not found in table.", 3000)
         return
 
-      # Remove program from internal list
-      self.colleges.remove(college)
-
-      # Remove row from QTableWidget
-      self.removeRow(rowToRemove)
+      self.tableModel.removeRecords([rowToRemove])
       self.statusMessageSignal.emit(result, 3000)
     
     self.updateTablesSignal.emit()
 
+  # Drops the colleges that were removed from the table; any that failed stay listed
+  def handleBatchRemoveFinished(self, summary):
+    removedKeys = {str(key).lower() for key in summary["succeeded"]}
+    removedRows = [row for row in range(self.tableModel.rowCount()) if str(self.tableModel.value(row, "college_code")).lower() in removedKeys]
+
+    self.tableModel.removeRecords(removedRows)
+    self.statusMessageSignal.emit(summary["message"], 5000)
+    self.updateTablesSignal.emit()
+
+  def handleBatchRemoveFailed(self, message):
+    self.statusMessageSignal.emit(f"Failed to remove selected colleges: {message}", 5000)
+
   def showDeleteConfirmation(self, parent, collegeName):
     msgBox = QtWidgets.QMessageBox(parent)
     msgBox.setWindowTitle("Confirm Deletion")
@@ -302,19 +300,17 @@ class CollegeTable(QtWidgets.QTableWidget):
     if obj == self.viewport():
       if event.type() == QtCore.QEvent.Type.MouseMove:
         index = self.indexAt(event.pos())  # Get index of row under mouse
-        if index.isValid():
-          self.toggleButtons(index.row())
-        else:
-          self.toggleButtons(-1)  # Hide buttons when not over a valid row
+        row = index.row() if index.isValid() else -1  # Hide buttons when not over a valid row
+        button = self.operationsDelegate.buttonAt(self.visualRect(index), event.pos()) if index.isValid() and index.column() == 2 else None
+
+        if button != self.operationsDelegate.hoveredButton:
+          self.viewport().setCursor(Qt.CursorShape.PointingHandCursor if button else Qt.CursorShape.ArrowCursor)
+        self.toggleButtons(row, button)
       elif event.type() == QtCore.QEvent.Type.Leave:
         self.toggleButtons(-1)  # Hide buttons when mouse leaves the table
     return super().eventFilter(obj, event)
 
-  def toggleButtons(self, row):
-    for r in range(self.rowCount()):
-      operationsWidget = self.cellWidget(r, 2)
-      if operationsWidget:
-        for i in range(operationsWidget.layout().count()):
-          widget = operationsWidget.layout().itemAt(i).widget()
-          if widget and isinstance(widget.graphicsEffect(), QGraphicsOpacityEffect):
-            widget.graphicsEffect().setOpacity(1.0 if r == row else 0.0)
+  # Repaints only the operations cells of the rows the hover left and entered, not the whole viewport
+  def toggleButtons(self, row, button=None):
+    for changedRow in self.operationsDelegate.setHover(row, button):
+      self.viewport().update(self.visualRect(self.tableModel.index(changedRow, 2)))
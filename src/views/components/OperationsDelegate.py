@@ -0,0 +1,98 @@
+from PyQt6 import QtWidgets, QtCore, QtGui
+from PyQt6.QtCore import pyqtSignal, Qt, QRect
+from PyQt6.QtGui import QColor, QIcon
+
+# Paints the edit and delete buttons of the operations column instead of creating two QPushButtons per row
+class OperationsDelegate(QtWidgets.QStyledItemDelegate):
+  BUTTON_SIZE = 30
+
+  EDIT_COLOR = QColor(63, 150, 160)
+  EDIT_HOVER_COLOR = QColor(83, 170, 180)
+  DELETE_COLOR = QColor(160, 63, 63)
+  DELETE_HOVER_COLOR = QColor(180, 83, 83)
+
+  # Signals
+  editClicked = pyqtSignal(int)
+  deleteClicked = pyqtSignal(int)
+
+  def __init__(self, parent=None):
+    super().__init__(parent)
+    self.editIcon = QIcon("assets/edit.png")
+    self.deleteIcon = QIcon("assets/delete.png")
+
+    # Buttons are only drawn on the row under the mouse, and the one under it is highlighted
+    self.hoveredRow = -1
+    self.hoveredButton = None
+    self.pressedButton = None
+
+  # The buttons sit centered in each half of the cell, like the old two-button layout
+  def buttonRects(self, rect):
+    half = rect.width() // 2
+    top = rect.top() + (rect.height() - self.BUTTON_SIZE) // 2
+    editLeft = rect.left() + (half - self.BUTTON_SIZE) // 2
+    deleteLeft = rect.left() + half + (rect.width() - half - self.BUTTON_SIZE) // 2
+
+    return QRect(editLeft, top, self.BUTTON_SIZE, self.BUTTON_SIZE), QRect(deleteLeft, top, self.BUTTON_SIZE, self.BUTTON_SIZE)
+
+  def buttonAt(self, rect, pos):
+    editRect, deleteRect = self.buttonRects(rect)
+    if editRect.contains(pos):
+      return "edit"
+    if deleteRect.contains(pos):
+      return "delete"
+    return None
+
+  # Moves the hover and returns the rows whose operations cell looks different now
+  # Moving within a row only repaints it when the pointer crosses onto or off a button
+  def setHover(self, row, button):
+    if row != self.hoveredRow:
+      changedRows = [self.hoveredRow, row]
+    elif button != self.hoveredButton:
+      changedRows = [row]
+    else:
+      changedRows = []
+
+    self.hoveredRow = row
+    self.hoveredButton = button if row != -1 else None
+    return [changedRow for changedRow in changedRows if changedRow != -1]
+
+  def paint(self, painter, option, index):
+    super().paint(painter, option, index)
+
+    if index.row() != self.hoveredRow:
+      return
+
+    editRect, deleteRect = self.buttonRects(option.rect)
+
+    painter.save()
+    painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+    painter.setPen(Qt.PenStyle.NoPen)
+
+    for button, buttonRect, icon, color, hoverColor in (("edit", editRect, self.editIcon, self.EDIT_COLOR, self.EDIT_HOVER_COLOR), ("delete", deleteRect, self.deleteIcon, self.DELETE_COLOR, self.DELETE_HOVER_COLOR)):
+      painter.setBrush(hoverColor if button == self.hoveredButton else color)
+      painter.drawRoundedRect(buttonRect, 3, 3)
+      icon.paint(painter, buttonRect.adjusted(7, 7, -7, -7))
+
+    painter.restore()
+
+  def editorEvent(self, event, model, option, index):
+    eventType = event.type()
+
+    if eventType in (QtCore.QEvent.Type.MouseButtonPress, QtCore.QEvent.Type.MouseButtonDblClick):
+      self.pressedButton = self.buttonAt(option.rect, event.position().toPoint())
+      # Swallow clicks on the buttons so the current selection survives for batch edits and deletes
+      return self.pressedButton is not None
+
+    if eventType == QtCore.QEvent.Type.MouseButtonRelease:
+      pressedButton, self.pressedButton = self.pressedButton, None
+      if pressedButton is None:
+        return False
+
+      if pressedButton == self.buttonAt(option.rect, event.position().toPoint()):
+        if pressedButton == "edit":
+          self.editClicked.emit(index.row())
+        else:
+          self.deleteClicked.emit(index.row())
+      return True
+
+    return super().editorEvent(event, model, option, index)
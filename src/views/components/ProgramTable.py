@@ -2,16 +2,19 @@ from operator import itemgetter
 
 from PyQt6 import QtWidgets, QtCore, QtGui
 from PyQt6.QtCore import pyqtSignal, Qt
-from PyQt6.QtWidgets import QGraphicsOpacityEffect, QTableWidgetItem
-from PyQt6.QtGui import QIcon
 
+from utils.QueryWorker import LatestQueryRunner
+from views.components.RecordTableModel import RecordTableModel
+from views.components.OperationsDelegate import OperationsDelegate
+from views.components.TransferProgressDialog import TransferProgressDialog
 from views.components.UpdateProgramDialog import UpdateProgramDialog
 
 from controllers.programControllers import getPrograms, removeProgram, batchRemovePrograms
 
-class ProgramTable(QtWidgets.QTableWidget):
+class ProgramTable(QtWidgets.QTableView):
   # Program variables
   headers = ["Program Code", "Program Name", "College Code", "Operations"]
+  columns = list(zip(headers, [("program_code",), ("program_name",), ("college_code",), ()]))
   sortByFields = [("program_code", "program_name"), ("program_name", "college_code"), ("college_code", "program_name")]
   searchByFields = ["program_code", "program_name", "college_code"]
 
@@ -26,10 +29,17 @@ class ProgramTable(QtWidgets.QTableWidget):
 
     self.parentWidget = parent
 
+    self.tableModel = RecordTableModel(self.columns, centeredColumns=(2,), parent=self)
+    self.operationsDelegate = OperationsDelegate(self)
+
     self.setupUI()
-    self.programs = []
     self.sortByIndex = 0
     self.sortingOrder = 0
+    self.loadedSearch = None
+
+    self.pageQuery = LatestQueryRunner(self)
+    self.pageQuery.finished.connect(self.applyPrograms)
+    self.pageQuery.failed.connect(self.displayQueryError)
 
     self.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.ExtendedSelection)
 
@@ -41,9 +51,13 @@ class ProgramTable(QtWidgets.QTableWidget):
     self.initialProgramsToDisplay()
 
   def setupUI(self):
-    self.setColumnCount(len(self.headers))
-    self.setSelectionBehavior(QtWidgets.QTableWidget.SelectionBehavior.SelectRows)
-    self.setEditTriggers(QtWidgets.QTableWidget.EditTrigger.NoEditTriggers)
+    self.setModel(self.tableModel)
+    self.setItemDelegateForColumn(3, self.operationsDelegate)
+    self.operationsDelegate.editClicked.connect(self.openUpdateProgramDialog)
+    self.operationsDelegate.deleteClicked.connect(self.deleteSelectedRow)
+
+    self.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
+    self.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
     self.setSortingEnabled(False)
     self.setStyleSheet("""
                         QHeaderView::section { 
@@ -54,27 +68,17 @@ class ProgramTable(QtWidgets.QTableWidget):
                           font-weight: normal; 
                           font-size: 9pt;
                         }
-                        QPushButton { 
-                          font: 9pt "Inter"; 
-                          font-weight: bold; 
-                          padding: 0px 15px; 
-                          border-radius: 3px; 
-                        } 
                        
-                        QTableWidget {
+                        QTableView {
                             gridline-color: transparent;
                         }
-                        QTableWidget::item {
+                        QTableView::item {
                             border-bottom: 1px solid rgb(120, 139, 140); 
                             border-right: 1px solid transparent;
                         }
-                        QTableWidget::item:selected {
+                        QTableView::item:selected {
                           background-color: rgb(105, 105, 105); 
                         }
-                        #deleteButton { background-color: rgb(160, 63, 63); } 
-                        #editButton { background-color: rgb(63, 150, 160); } 
-                        #editButton::hover { background-color: rgb(83, 170, 180); } 
-                        #deleteButton::hover { background-color: rgb(180, 83, 83); } 
                         QFrame { border: none; background: transparent; } 
                         QLabel { border: none; background: transparent; font: 9pt "Inter"; }
                       """)
@@ -87,17 +91,45 @@ class ProgramTable(QtWidgets.QTableWidget):
     header.setMinimumHeight(40)
     header.setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Stretch)
     header.setSectionResizeMode(3, QtWidgets.QHeaderView.ResizeMode.Fixed)
-    
-    self.setHorizontalHeaderLabels(self.headers)
 
   #--------------------------------------------------------------------------
   
   def refreshDisplayPrograms(self):
-    self.setRowCount(0)
     self.updateSortByIndex()
     primaryField, secondaryField = self.sortByFields[self.sortByIndex]
     sortingOrder = "ASC" if self.sortingOrder == 0 else "DESC"
-    
+    searchField, searchValue = self.currentSearch()
+    page = int(self.parentWidget.page)
+
+    # Runs on the thread pool; a newer refresh cancels any that is still pending
+    self.pageQuery.run(lambda: (page, searchField, searchValue, getPrograms(page=page, sortBy1=primaryField, sortBy2=secondaryField, sortOrder=sortingOrder, searchField=searchField, searchTerm=searchValue)))
+
+  # Searches narrow the rows on display when they can and only go to the database otherwise
+  def searchDisplayPrograms(self):
+    searchField, searchValue = self.currentSearch()
+    if not self.narrowLoadedPrograms(searchField, searchValue):
+      self.refreshDisplayPrograms()
+
+  # When the rows on display hold every match of a broader search, a narrower one is filtered without a query
+  def narrowLoadedPrograms(self, searchField, searchValue):
+    if self.loadedSearch is None or self.pageQuery.isBusy():
+      return False
+
+    loadedField, loadedValue = self.loadedSearch
+
+    # An unfiltered listing can be narrowed by any field, but program codes are matched exactly
+    if (loadedValue and loadedField != searchField) or (searchField == "program_code" and searchValue):
+      return False
+
+    if not RecordTableModel.isNarrowerSearch([loadedValue], [searchValue]):
+      return False
+
+    self.tableModel.filterRecords([searchField] if searchField else self.searchByFields, [searchValue])
+    self.loadedSearch = (searchField, searchValue)
+    self.updateLastPage(self.tableModel.rowCount())
+    return True
+
+  def currentSearch(self):
     searchField = None
     searchValue = ""
 
@@ -107,84 +139,45 @@ class ProgramTable(QtWidgets.QTableWidget):
         searchField = self.searchByFields[searchIndex - 2]
       searchValue = self.parentWidget.searchBarLineEdit.text().strip()
 
-    page = int(self.parentWidget.page)
+    return searchField, searchValue
 
-    programs, totalCount = getPrograms(page=page, sortBy1=primaryField, sortBy2=secondaryField, sortOrder=sortingOrder, searchField=searchField, searchTerm=searchValue)
-    self.programs = programs
-    
+  # The sort and search on display, as keyword arguments for the export controllers
+  def exportParameters(self):
+    self.updateSortByIndex()
+    primaryField, secondaryField = self.sortByFields[self.sortByIndex]
+    searchField, searchValue = self.currentSearch()
+
+    return {
+      "sortBy1": primaryField,
+      "sortBy2": secondaryField,
+      "sortOrder": "ASC" if self.sortingOrder == 0 else "DESC",
+      "searchField": searchField,
+      "searchTerm": searchValue,
+    }
+
+  def applyPrograms(self, result):
+    page, searchField, searchValue, (programs, totalCount) = result
+
+    self.updateLastPage(totalCount)
+    self.populateTable(programs, page)
+
+    # A short first page is the whole result set
+    self.loadedSearch = (searchField, searchValue) if page == 1 and len(programs) < 50 else None
+
+  def updateLastPage(self, totalCount):
     lastPage = (totalCount + 50 - 1) // 50
     self.parentWidget.lastPage = lastPage
     self.parentWidget.validator.setTop(lastPage)
     self.parentWidget.lastPageInfo.setText(f"of {lastPage}")
 
-    self.populateTable()
+  def displayQueryError(self, message):
+    self.statusMessageSignal.emit(f"Failed to load programs: {message}", 3000)
   
   def initialProgramsToDisplay(self):
-    self.setRowCount(0)
-    programs, _ = getPrograms()
-    if not programs:
-      self.programs = []
-      return
-    
-    self.programs = programs
     self.refreshDisplayPrograms()
 
-  def populateTable(self):
-    self.setRowCount(len(self.programs))
-    
-    for row, program in enumerate(self.programs):
-      self.setItem(row, 0, QtWidgets.QTableWidgetItem(str(program["program_code"])))
-
-      programName = QTableWidgetItem(program["program_name"])
-      self.setItem(row, 1, programName)
-
-      collegeCode = QTableWidgetItem(program["college_code"])
-      collegeCode.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-      self.setItem(row, 2, collegeCode)
-      
-      operationsWidget = QtWidgets.QWidget()
-      operationsLayout = QtWidgets.QHBoxLayout()
-      operationsLayout.setContentsMargins(0, 0, 0, 0)
-      operationsLayout.setSpacing(0)
-
-      editButton = QtWidgets.QPushButton()
-      editButton.setObjectName("editButton")
-      editButton.setIcon(QIcon("assets/edit.png"))
-      editButton.setFixedSize(30, 30)
-      editButton.setCursor(QtCore.Qt.CursorShape.PointingHandCursor)
-      editButton.clicked.connect(lambda _, s=program: self.openUpdateProgramDialog(s))
-      
-      self.editOpacity = QGraphicsOpacityEffect()
-      editButton.setGraphicsEffect(self.editOpacity)
-      self.editOpacity.setOpacity(0.0) 
-
-      deleteButton = QtWidgets.QPushButton()
-      deleteButton.setObjectName("deleteButton")
-      deleteButton.setIcon(QIcon("assets/delete.png"))
-      deleteButton.setFixedSize(30, 30)
-      deleteButton.setCursor(QtCore.Qt.CursorShape.PointingHandCursor)
-      deleteButton.clicked.connect(lambda _, s=program: self.deleteSelectedRow(s))
-
-      self.deleteOpacity = QGraphicsOpacityEffect()
-      deleteButton.setGraphicsEffect(self.deleteOpacity)
-      self.deleteOpacity.setOpacity(0.0)
-
-      operationsLayout.addWidget(editButton)
-      operationsLayout.addWidget(deleteButton)
-      operationsWidget.setLayout(operationsLayout)
-      operationsWidget.setStyleSheet(operationsWidget.setStyleSheet("""
-        QPushButton { font: 9pt "Inter"; font-weight: bold; padding: 0px 15px; border-radius: 3px; }
-        QPushButton#editButton { background-color: rgb(63, 150, 160); }
-        QPushButton#deleteButton { background-color: rgb(160, 63, 63); }
-        QPushButton#editButton:hover { background-color: rgb(83, 170, 180); }
-        QPushButton#deleteButton:hover { background-color: rgb(180, 83, 83); }
-      """))
-      
-      self.setCellWidget(row, 3, operationsWidget)
-
-    startIndex = (self.parentWidget.page * 50) - 49
-    self.setVerticalHeaderLabels([str(i) for i in range(startIndex, startIndex + 51)])
-    self.viewport().installEventFilter(self)
+  def populateTable(self, programs, page):
+    self.tableModel.setRecords(programs, rowOffset=(page - 1) * 50)
 
   def updateSortByIndex(self):
     sortByIndex = self.parentWidget.sortByComboBox.currentIndex()
@@ -193,9 +186,12 @@ class ProgramTable(QtWidgets.QTableWidget):
     self.sortByIndex = max(0, sortByIndex - 1)
     self.sortingOrder = max(0, sortingOrder)
 
-  def openUpdateProgramDialog(self, programRowData):
-    selectedRows = list(set(index.row() for index in self.selectedIndexes()))
-    programData = list(programRowData.values())
+  def selectedRows(self):
+    return sorted(index.row() for index in self.selectionModel().selectedRows())
+
+  def openUpdateProgramDialog(self, row):
+    selectedRows = self.selectedRows()
+    programData = list(self.tableModel.record(row).values())
     self.updateDialog = UpdateProgramDialog(self, programData)
     self.updateDialog.programUpdatedTableSignal.connect(self.refreshDisplayPrograms)
     self.updateDialog.updateTablesSignal.connect(self.updateTablesSignal)
@@ -206,64 +202,62 @@ class ProgramTable(QtWidgets.QTableWidget):
       
     self.updateDialog.exec()
 
-  def deleteSelectedRow(self, program):
-    selectedRows = sorted(set(index.row() for index in self.selectedIndexes()), reverse=True)
+  def deleteSelectedRow(self, row):
+    selectedRows = self.selectedRows()
     selectedRowCount = len(selectedRows)
 
     # Multiple Deletions
     if len(selectedRows) > 1:
-      programCodesText = f'\n{"\n".join(f'{self.item(row, 0).text()}' for row in selectedRows)}'
+      programCodesText = f'\n{"\n".join(self.tableModel.value(selectedRow, "program_code") for selectedRow in selectedRows)}'
       promptText = f"the following programs?\n{programCodesText}" if selectedRowCount < 20 else f"{selectedRowCount} programs"
       if not self.showDeleteConfirmation(self, promptText):
         return
       
-      programCodes = []
-      for row in sorted(selectedRows, reverse=True):      # Reverse to avoid shifting indices
-        programCodes.append(self.programs[row]["program_code"])
-
-      result = batchRemovePrograms(programCodes)
-      if result != "Programs removed successfully.":
-        self.statusMessageSignal.emit("Failed to remove selected programs.", 3000)
-        return
+      programCodes = [self.tableModel.value(selectedRow, "program_code") for selectedRow in selectedRows]
 
-      for row in sorted(selectedRows, reverse=True):  
-        self.programs.pop(row)
-        self.removeRow(row)
-      
-      self.statusMessageSignal.emit("Selected programs removed successfully.", 3000)
+      # Runs in chunks behind a progress dialog; the table is updated once it finishes
+      self.batchDialog = TransferProgressDialog(self, "Remove Programs", f"Removing {selectedRowCount:,} programs...", batchRemovePrograms, programCodes)
+      self.batchDialog.transferFinishedSignal.connect(self.handleBatchRemoveFinished)
+      self.batchDialog.transferFailedSignal.connect(self.handleBatchRemoveFailed)
+      self.batchDialog.start()
+      return
     
     # Single Deletion
     else:
+      program = self.tableModel.record(row)
       if not self.showDeleteConfirmation(self, program["program_name"]):
         return
 
-      # Remove from CSV
       result = removeProgram(program["program_code"])
 
       if result != "Program removed successfully.":
         self.statusMessageSignal.emit(result, 3000)
         return
 
-      # Find the row index of the program
-      rowToRemove = -1
-      for row in range(self.rowCount()):
-        if self.item(row, 0) and self.item(row, 0).text() == str(program["program_code"]):
-          rowToRemove = row
-          break
+      # The row may have moved while the confirmation was open
+      rowToRemove = self.tableModel.findRow("program_code", program["program_code"])
 
       if rowToRemove == -1:
         self.statusMessageSignal.emit("Error: Program not found in table.", 3000)
         return
 
-      # Remove program from internal list
-      self.programs.remove(program)
-
-      # Remove row from QTableWidget
-      self.removeRow(rowToRemove)
+      self.tableModel.removeRecords([rowToRemove])
       self.statusMessageSignal.emit(result, 3000)
     
     self.updateTablesSignal.emit()
 
+  # Drops the programs that were removed from the table; any that failed stay listed
+  def handleBatchRemoveFinished(self, summary):
+    removedKeys = {str(key).lower() for key in summary["succeeded"]}
+    removedRows = [row for row in range(self.tableModel.rowCount()) if str(self.tableModel.value(row, "program_code")).lower() in removedKeys]
+
+    self.tableModel.removeRecords(removedRows)
+    self.statusMessageSignal.emit(summary["message"], 5000)
+    self.updateTablesSignal.emit()
+
+  def handleBatchRemoveFailed(self, message):
+    self.statusMessageSignal.emit(f"Failed to remove selected programs: {message}", 5000)
+
   def showDeleteConfirmation(self, parent, programName):
     msgBox = QtWidgets.QMessageBox(parent)
     msgBox.setWindowTitle("Confirm Deletion")
@@ -305,19 +299,17 @@ class ProgramTable(QtWidgets.QTableWidget):
     if obj == self.viewport():
       if event.type() == QtCore.QEvent.Type.MouseMove:
         index = self.indexAt(event.pos())  # Get index of row under mouse
-        if index.isValid():
-          self.toggleButtons(index.row())
-        else:
-          self.toggleButtons(-1)  # Hide buttons when not over a valid row
+        row = index.row() if index.isValid() else -1  # Hide buttons when not over a valid row
+        button = self.operationsDelegate.buttonAt(self.visualRect(index), event.pos()) if index.isValid() and index.column() == 3 else None
+
+        if button != self.operationsDelegate.hoveredButton:
+          self.viewport().setCursor(Qt.CursorShape.PointingHandCursor if button else Qt.CursorShape.ArrowCursor)
+        self.toggleButtons(row, button)
       elif event.type() == QtCore.QEvent.Type.Leave:
         self.toggleButtons(-1)  # Hide buttons when mouse leaves the table
     return super().eventFilter(obj, event)
 
-  def toggleButtons(self, row):
-    for r in range(self.rowCount()):
-      operationsWidget = self.cellWidget(r, 3)
-      if operationsWidget:
-        for i in range(operationsWidget.layout().count()):
-          widget = operationsWidget.layout().itemAt(i).widget()
-          if widget and isinstance(widget.graphicsEffect(), QGraphicsOpacityEffect):
-            widget.graphicsEffect().setOpacity(1.0 if r == row else 0.0)
\ No newline at end of file
+  # Repaints only the operations cells of the rows the hover left and entered, not the whole viewport
+  def toggleButtons(self, row, button=None):
+    for changedRow in self.operationsDelegate.setHover(row, button):
+      self.viewport().update(self.visualRect(self.tableModel.index(changedRow, 3)))
@@ -0,0 +1,133 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from PyQt6 import QtCore
+from PyQt6.QtCore import Qt, QModelIndex
+
+# Table model shared by the student, program and college tables
+# Records are kept as plain tuples and only turned back into dicts when a dialog or controller needs one
+class RecordTableModel(QtCore.QAbstractTableModel):
+  def __init__(self, columns: Sequence[Tuple[str, Tuple[str, ...]]], centeredColumns: Sequence[int] = (), parent=None):
+    super().__init__(parent)
+
+    # Each column is (header, record fields joined with a space to display it)
+    self.columns = list(columns)
+    self.centeredColumns = set(centeredColumns)
+
+    self.fields: List[str] = []
+    self.rows: List[tuple] = []
+    self.columnFieldIndexes: List[Tuple[int, ...]] = [() for _ in self.columns]
+    self.rowOffset = 0
+
+  def setRecords(self, records: List[Dict[str, Any]], rowOffset: int = 0) -> None:
+    self.beginResetModel()
+
+    if records:
+      self.setFields(records[0].keys())
+
+    self.rows = [tuple(record.values()) for record in records]
+    self.rowOffset = rowOffset
+
+    self.endResetModel()
+
+  # Maps each column to the positions of its fields in the record tuples
+  def setFields(self, fields: Sequence[str]) -> None:
+    fields = list(fields)
+    if fields == self.fields:
+      return
+
+    self.fields = fields
+    fieldIndex = {field: i for i, field in enumerate(fields)}
+    self.columnFieldIndexes = [tuple(fieldIndex[field] for field in columnFields if field in fieldIndex) for _, columnFields in self.columns]
+
+  def record(self, row: int) -> Dict[str, Any]:
+    return dict(zip(self.fields, self.rows[row]))
+
+  def value(self, row: int, field: str) -> Any:
+    return self.rows[row][self.fields.index(field)]
+
+  def findRow(self, field: str, value: Any) -> int:
+    if field not in self.fields:
+      return -1
+
+    fieldIndex = self.fields.index(field)
+    for row, values in enumerate(self.rows):
+      if values[fieldIndex] == value:
+        return row
+
+    return -1
+
+  def removeRecords(self, rows: List[int]) -> None:
+    # Remove from the bottom up so earlier indexes stay valid
+    for row in sorted(set(rows), reverse=True):
+      self.beginRemoveRows(QModelIndex(), row, row)
+      del self.rows[row]
+      self.endRemoveRows()
+
+  # Keeps the rows where every term is found in at least one of the fields, the way a LIKE '%term%' search matches
+  def filterRecords(self, fields: Sequence[str], terms: Sequence[str]) -> None:
+    fieldIndexes = [self.fields.index(field) for field in fields if field in self.fields]
+    terms = [term.lower() for term in terms]
+
+    self.beginResetModel()
+    self.rows = [
+      values for values in self.rows
+      if all(any(values[i] is not None and term in str(values[i]).lower() for i in fieldIndexes) for term in terms)
+    ]
+    self.endResetModel()
+
+  # A search narrows an earlier one when every earlier term is part of some new term, so its matches are a subset
+  @staticmethod
+  def isNarrowerSearch(previousTerms: Sequence[str], terms: Sequence[str]) -> bool:
+    # LIKE wildcards would make the client-side match disagree with MySQL
+    if any(character in term for term in terms for character in "%_\\"):
+      return False
+
+    return all(any(previousTerm.lower() in term.lower() for term in terms) for previousTerm in previousTerms)
+
+  #----------------------------------------------------------
+
+  def rowCount(self, parent=QModelIndex()) -> int:
+    return 0 if parent.isValid() else len(self.rows)
+
+  def columnCount(self, parent=QModelIndex()) -> int:
+    return 0 if parent.isValid() else len(self.columns)
+
+  def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+    if not index.isValid():
+      return None
+
+    row, column = index.row(), index.column()
+
+    if role == Qt.ItemDataRole.DisplayRole:
+      values = self.rows[row]
+      return " ".join("" if values[i] is None else str(values[i]) for i in self.columnFieldIndexes[column])
+
+    if role == Qt.ItemDataRole.TextAlignmentRole:
+      if column in self.centeredColumns:
+        return Qt.AlignmentFlag.AlignCenter
+      return Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+
+    if role == Qt.ItemDataRole.FontRole:
+      return self.cellFont(row, column)
+
+    if role == Qt.ItemDataRole.ForegroundRole:
+      return self.cellForeground(row, column)
+
+    return None
+
+  def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+    if role != Qt.ItemDataRole.DisplayRole:
+      return None
+
+    if orientation == Qt.Orientation.Horizontal:
+      return self.columns[section][0]
+
+    # Row numbers continue across pages
+    return str(self.rowOffset + section + 1)
+
+  # Hooks for subclasses that style individual cells
+  def cellFont(self, row: int, column: int) -> Optional[Any]:
+    return None
+
+  def cellForeground(self, row: int, column: int) -> Optional[Any]:
+    return None
@@ -1,17 +1,64 @@
+from functools import partial
 from operator import itemgetter
 
 from PyQt6 import QtWidgets, QtCore, QtGui
-from PyQt6.QtWidgets import QGraphicsOpacityEffect, QTableWidgetItem
 from PyQt6.QtCore import pyqtSignal, Qt
-from PyQt6.QtGui import QIcon, QFont, QBrush, QColor 
-
-from controllers.studentControllers import getStudents, removeStudent, batchRemoveStudents
+from PyQt6.QtGui import QFont, QBrush, QColor 
+
+from controllers.studentControllers import getStudents, countStudents, isStudentCountExact, removeStudent, batchRemoveStudents, removeMatchingStudents
+from utils.QueryWorker import LatestQueryRunner
+from views.components.RecordTableModel import RecordTableModel
+from views.components.WindowedRecordModel import WindowedRecordModel
+from views.components.OperationsDelegate import OperationsDelegate
+from views.components.TransferProgressDialog import TransferProgressDialog
 from views.components.UpdateStudentDialog import UpdateStudentDialog
 from views.components.UpdateBatchStudentDialog import UpdateBatchStudentDialog
 
-class StudentTable(QtWidgets.QTableWidget):
+MESSAGE_BOX_STYLESHEET = """
+  QMessageBox {
+    background-color: rgb(37, 37, 37);
+    color: white;
+    border-radius: 10px;
+  }
+  QMessageBox QLabel {
+    color: white;
+    font-family: \"Inter\";
+  }
+  QMessageBox QPushButton {
+    font: 9pt "Inter";
+    font-weight: bold;
+    padding: 0px, 15px;
+    background-color: rgb(63, 150, 160);
+    border-radius: 3px;
+    padding: 5px 15px;
+  }
+
+  QMessageBox QPushButton::hover {
+    background-color: rgb(83, 170, 180);
+  }
+"""
+
+class StudentTableModel(WindowedRecordModel):
+  def __init__(self, parent=None):
+    super().__init__(StudentTable.columns, centeredColumns=(2, 3, 4, 5), parent=parent)
+
+    self.highlightFont = QFont()
+    self.highlightFont.setBold(True)
+    self.highlightBrush = QBrush(QColor("gold"))
+
+  def isHighlighted(self, row, column):
+    return column == 1 and self.data(self.index(row, column)) == "Kim Gabriel Nasayao"
+
+  def cellFont(self, row, column):
+    return self.highlightFont if self.isHighlighted(row, column) else None
+
+  def cellForeground(self, row, column):
+    return self.highlightBrush if self.isHighlighted(row, column) else None
+
+class StudentTable(QtWidgets.QTableView):
   # Student variables
   headers = ["ID Number", "Name", "Gender", "Year Level", "Program", "College", "Operations"]
+  columns = list(zip(headers, [("id_number",), ("first_name", "last_name"), ("gender",), ("year_level",), ("program_code",), ("college_code",), ()]))
   sortByFields = [("id_number", "last_name"), ("first_name", "last_name"), ("last_name", "first_name"), ("gender", "last_name"), ("year_level", "last_name"), ("program_code", "last_name"), ("college_code", "last_name")]
   searchByFields = ["id_number", "first_name", "last_name", "gender", "year_level", "program_code", "college_code"]
 
@@ -24,10 +71,30 @@ class StudentTable(QtWidgets.QTableWidget):
     super().__init__(parent)
     self.parentWidget = parent
 
+    self.tableModel = StudentTableModel(self)
+    self.operationsDelegate = OperationsDelegate(self)
+
     self.setupUI()
-    self.students = []
     self.sortByIndex = 0
     self.sortingOrder = 0
+    self.countRequest = None
+    self.loadedSearch = None
+
+    # How many students the search on display matches, for "apply to all matching" batch operations
+    self.matchingCount = 0
+    self.isMatchingCountEstimate = False
+
+    self.pageQuery = LatestQueryRunner(self)
+    self.pageQuery.finished.connect(self.applyStudents)
+    self.pageQuery.failed.connect(self.displayQueryError)
+
+    self.countQuery = LatestQueryRunner(self)
+    self.countQuery.finished.connect(self.applyExactCount)
+
+    # Continuous scrolling loads windows of students as the view nears the end instead of pages of 50
+    self.isScrollMode = False
+    self.tableModel.pinnedRows = lambda: [index.row() for index in self.selectionModel().selectedRows()]
+    self.tableModel.windowFailed.connect(self.displayQueryError)
 
     self.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.ExtendedSelection)
     
@@ -39,9 +106,13 @@ class StudentTable(QtWidgets.QTableWidget):
     self.initialStudentsToDisplay()
 
   def setupUI(self):
-    self.setColumnCount(len(self.headers))
-    self.setSelectionBehavior(QtWidgets.QTableWidget.SelectionBehavior.SelectRows)
-    self.setEditTriggers(QtWidgets.QTableWidget.EditTrigger.NoEditTriggers)
+    self.setModel(self.tableModel)
+    self.setItemDelegateForColumn(6, self.operationsDelegate)
+    self.operationsDelegate.editClicked.connect(self.openUpdateStudentDialog)
+    self.operationsDelegate.deleteClicked.connect(self.deleteSelectedRow)
+
+    self.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
+    self.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
     self.setSortingEnabled(False)
     self.setStyleSheet("""
                         QHeaderView::section { 
@@ -52,28 +123,18 @@ class StudentTable(QtWidgets.QTableWidget):
                           font-weight: normal; 
                           font-size: 9pt;
                         }
-                        QPushButton { 
-                          font: 9pt "Inter"; 
-                          font-weight: bold; 
-                          padding: 0px 15px; 
-                          border-radius: 3px; 
-                        } 
                        
-                        QTableWidget {
+                        QTableView {
                             gridline-color: transparent;
                         }
-                        QTableWidget::item {
+                        QTableView::item {
                             border-bottom: 1px solid rgb(120, 139, 140); 
                             border-right: 1px solid transparent;
                         }
-                        QTableWidget::item:selected {
+                        QTableView::item:selected {
                           background-color: rgb(105, 105, 105); 
                         }
                        
-                        #deleteButton { background-color: rgb(160, 63, 63); } 
-                        #editButton { background-color: rgb(63, 150, 160); } 
-                        #editButton::hover { background-color: rgb(83, 170, 180); } 
-                        #deleteButton::hover { background-color: rgb(180, 83, 83); } 
                         QFrame { border: none; background: transparent; } 
                         QLabel { border: none; background: transparent; font: 9pt "Inter"; }
                       """)
@@ -86,17 +147,59 @@ class StudentTable(QtWidgets.QTableWidget):
     header.setMinimumHeight(40)
     header.setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Stretch)
     header.setSectionResizeMode(6, QtWidgets.QHeaderView.ResizeMode.Fixed)
-    
-    self.setHorizontalHeaderLabels(self.headers)
 
   #--------------------------------------------------------------------------
   
   def refreshDisplayStudents(self):
-    self.setRowCount(0)
+    self.loadStudents()
+
+  # Loads the page after (or before) the rows on display by seeking from the last (or first) row instead of using OFFSET
+  def seekDisplayStudents(self, seekDirection):
+    # While a page is still loading the rows on display are stale anchors, so trust the page number
+    if not self.tableModel.rowCount() or self.pageQuery.isBusy():
+      self.loadStudents()
+      return
+
     self.updateSortByIndex()
     primaryField, secondaryField = self.sortByFields[self.sortByIndex]
-    sortingOrder = "ASC" if self.sortingOrder == 0 else "DESC"
-    
+
+    anchor = self.tableModel.record(self.tableModel.rowCount() - 1 if seekDirection == "next" else 0)
+    seekCursor = (anchor[primaryField], anchor[secondaryField], anchor["id_number"])
+
+    self.loadStudents(seekCursor, seekDirection)
+
+  # Searches narrow the rows on display when they can and only go to the database otherwise
+  def searchDisplayStudents(self):
+    searchField, searchValue = self.currentSearch()
+    if not self.narrowLoadedStudents(searchField, searchValue):
+      self.loadStudents()
+
+  # When the rows on display hold every match of a broader search, a narrower one is filtered without a query
+  def narrowLoadedStudents(self, searchField, searchValue):
+    if self.loadedSearch is None or self.pageQuery.isBusy():
+      return False
+
+    loadedField, loadedValue = self.loadedSearch
+
+    # An unfiltered listing can be narrowed by any field
+    if loadedValue and loadedField != searchField:
+      return False
+
+    # The "Any" search matches each word on its own
+    loadedTerms = loadedValue.split() if searchField is None else [loadedValue]
+    terms = searchValue.split() if searchField is None else [searchValue]
+
+    if not RecordTableModel.isNarrowerSearch(loadedTerms, terms):
+      return False
+
+    self.tableModel.filterRecords([searchField] if searchField else self.searchByFields, terms)
+    self.loadedSearch = (searchField, searchValue)
+    self.countRequest = (searchField, searchValue)
+    self.updateLastPage(self.tableModel.rowCount())
+    self.matchingCount, self.isMatchingCountEstimate = self.tableModel.rowCount(), False
+    return True
+
+  def currentSearch(self):
     searchField = None
     searchValue = ""
 
@@ -106,102 +209,117 @@ class StudentTable(QtWidgets.QTableWidget):
         searchField = self.searchByFields[searchIndex - 2]
       searchValue = self.parentWidget.searchBarLineEdit.text().strip()
 
+    return searchField, searchValue
+
+  # The sort and search on display, as keyword arguments for the export controllers
+  def exportParameters(self):
+    self.updateSortByIndex()
+    primaryField, secondaryField = self.sortByFields[self.sortByIndex]
+    searchField, searchValue = self.currentSearch()
+
+    return {
+      "sortBy1": primaryField,
+      "sortBy2": secondaryField,
+      "sortOrder": "ASC" if self.sortingOrder == 0 else "DESC",
+      "searchField": searchField,
+      "searchTerm": searchValue,
+    }
+
+  def setScrollMode(self, enabled):
+    self.isScrollMode = enabled
+    self.verticalScrollBar().setValue(0)
+    self.loadStudents()
+
+  # Queries run on the thread pool; a newer load cancels any that is still pending
+  def loadStudents(self, seekCursor=None, seekDirection="next"):
+    self.updateSortByIndex()
+    primaryField, secondaryField = self.sortByFields[self.sortByIndex]
+    sortingOrder = "ASC" if self.sortingOrder == 0 else "DESC"
+    searchField, searchValue = self.currentSearch()
+
+    if self.isScrollMode:
+      self.loadStudentWindows(primaryField, secondaryField, sortingOrder, searchField, searchValue)
+      return
+
     page = int(self.parentWidget.page)
 
-    students, totalCount = getStudents(page=page, sortBy1=primaryField, sortBy2=secondaryField, sortOrder=sortingOrder, searchField=searchField, searchTerm=searchValue)
-    self.students = students
-    
-    lastPage = (totalCount + 50 - 1) // 50
-    self.parentWidget.lastPage = lastPage
-    self.parentWidget.validator.setTop(lastPage)
-    self.parentWidget.lastPageInfo.setText(f"of {lastPage}")
+    self.pageQuery.run(self.fetchStudents, page, primaryField, secondaryField, sortingOrder, searchField, searchValue, seekCursor, seekDirection)
 
-    self.populateTable()
+  # Runs on a worker thread, so it must not touch any widget
+  @staticmethod
+  def fetchStudents(page, primaryField, secondaryField, sortingOrder, searchField, searchValue, seekCursor, seekDirection):
+    # Unfiltered listings show the table statistics estimate until the exact count arrives
+    isEstimate = not searchValue and not isStudentCountExact(searchField, searchValue)
 
-  def initialStudentsToDisplay(self):
-    self.setRowCount(0)
-    students, _ = getStudents()
-    if not students:
-      self.programs = []
-      return
-    
-    self.students = students
-    self.refreshDisplayStudents()
+    students, totalCount = getStudents(page=page, sortBy1=primaryField, sortBy2=secondaryField, sortOrder=sortingOrder, searchField=searchField, searchTerm=searchValue, seekCursor=seekCursor, seekDirection=seekDirection, approximateCount=True)
 
-  def populateTable(self):
-    self.setRowCount(len(self.students))
-    
-    for row, student in enumerate(self.students):
-      self.setItem(row, 0, QtWidgets.QTableWidgetItem(str(student["id_number"])))
+    # The anchor row may be gone (deleted or edited), so fall back to the page number
+    if seekCursor is not None and not students:
+      students, totalCount = getStudents(page=page, sortBy1=primaryField, sortBy2=secondaryField, sortOrder=sortingOrder, searchField=searchField, searchTerm=searchValue)
 
-      nameItem = QTableWidgetItem(f"{student['first_name']} {student['last_name']}")
-      self.setItem(row, 1, nameItem)
+    return page, searchField, searchValue, students, totalCount, isEstimate
 
-      if f"{student['first_name']} {student['last_name']}" == "Kim Gabriel Nasayao":
-        font = QFont()
-        font.setBold(True)
-        nameItem.setFont(font)
-        nameItem.setForeground(QBrush(QColor("gold")))
+  # The model fetches the windows itself as the view scrolls; the total comes from a separate count
+  def loadStudentWindows(self, primaryField, secondaryField, sortingOrder, searchField, searchValue):
+    self.pageQuery.cancel()
+    self.loadedSearch = None
+    self.countRequest = (searchField, searchValue)
+    self.matchingCount, self.isMatchingCountEstimate = 0, True
 
-      genderItem = QTableWidgetItem(student["gender"])
-      genderItem.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-      self.setItem(row, 2, genderItem)
+    self.tableModel.startWindows(partial(self.fetchStudentWindow, primaryField=primaryField, secondaryField=secondaryField, sortingOrder=sortingOrder, searchField=searchField, searchValue=searchValue))
+    self.countStudentsInBackground(searchField, searchValue)
 
-      yearLevelItem = QTableWidgetItem(str(student["year_level"]))
-      yearLevelItem.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-      self.setItem(row, 3, yearLevelItem)
+  # Runs on a worker thread, so it must not touch any widget
+  @staticmethod
+  def fetchStudentWindow(window, windowSize, previousRecord, primaryField, secondaryField, sortingOrder, searchField, searchValue):
+    # Seeking from the row before the window costs the same at any depth; OFFSET is only used when that row was evicted
+    seekCursor = None if previousRecord is None else (previousRecord[primaryField], previousRecord[secondaryField], previousRecord["id_number"])
 
-      programCodeItem = QTableWidgetItem(student["program_code"])
-      programCodeItem.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-      self.setItem(row, 4, programCodeItem)
-      
-      collegeCodeItem = QTableWidgetItem(student["college_code"])
-      collegeCodeItem.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-      self.setItem(row, 5, collegeCodeItem)
-      
-      operationsWidget = QtWidgets.QWidget()
-      operationsLayout = QtWidgets.QHBoxLayout()
-      operationsLayout.setContentsMargins(0, 0, 0, 0)
-      operationsLayout.setSpacing(0)
-
-      editButton = QtWidgets.QPushButton()
-      editButton.setObjectName("editButton")
-      editButton.setIcon(QIcon("assets/edit.png"))
-      editButton.setFixedSize(30, 30)
-      editButton.setCursor(QtCore.Qt.CursorShape.PointingHandCursor)
-      editButton.clicked.connect(lambda _, s=student: self.openUpdateStudentDialog(s))
-      
-      self.editOpacity = QGraphicsOpacityEffect()
-      editButton.setGraphicsEffect(self.editOpacity)
-      self.editOpacity.setOpacity(0.0) 
-
-      deleteButton = QtWidgets.QPushButton()
-      deleteButton.setObjectName("deleteButton")
-      deleteButton.setIcon(QIcon("assets/delete.png"))
-      deleteButton.setFixedSize(30, 30)
-      deleteButton.setCursor(QtCore.Qt.CursorShape.PointingHandCursor)
-      deleteButton.clicked.connect(lambda _, s=student: self.deleteSelectedRow(s))
-
-      self.deleteOpacity = QGraphicsOpacityEffect()
-      deleteButton.setGraphicsEffect(self.deleteOpacity)
-      self.deleteOpacity.setOpacity(0.0)
-
-      operationsLayout.addWidget(editButton)
-      operationsLayout.addWidget(deleteButton)
-      operationsWidget.setLayout(operationsLayout)
-      operationsWidget.setStyleSheet(operationsWidget.setStyleSheet("""
-        QPushButton { font: 9pt "Inter"; font-weight: bold; padding: 0px 15px; border-radius: 3px; }
-        QPushButton#editButton { background-color: rgb(63, 150, 160); }
-        QPushButton#deleteButton { background-color: rgb(160, 63, 63); }
-        QPushButton#editButton:hover { background-color: rgb(83, 170, 180); }
-        QPushButton#deleteButton:hover { background-color: rgb(180, 83, 83); }
-      """))
-      
-      self.setCellWidget(row, 6, operationsWidget)
+    students, _ = getStudents(page=window + 1, perPage=windowSize, sortBy1=primaryField, sortBy2=secondaryField, sortOrder=sortingOrder, searchField=searchField, searchTerm=searchValue, seekCursor=seekCursor, approximateCount=True)
+    return students
 
-    startIndex = (self.parentWidget.page * 50) - 49
-    self.setVerticalHeaderLabels([str(i) for i in range(startIndex, startIndex + 51)])
-    self.viewport().installEventFilter(self)
+  def applyStudents(self, result):
+    page, searchField, searchValue, students, totalCount, isEstimate = result
+
+    self.updateLastPage(totalCount, isEstimate)
+    self.countRequest = (searchField, searchValue)
+    self.matchingCount, self.isMatchingCountEstimate = totalCount, isEstimate
+
+    if isEstimate:
+      self.countStudentsInBackground(searchField, searchValue)
+
+    self.populateTable(students, page)
+
+    # A short first page is the whole result set
+    self.loadedSearch = (searchField, searchValue) if page == 1 and len(students) < 50 else None
+
+  def displayQueryError(self, message):
+    self.statusMessageSignal.emit(f"Failed to load students: {message}", 3000)
+
+  def updateLastPage(self, totalCount, isEstimate=False):
+    lastPage = (totalCount + 50 - 1) // 50
+    self.parentWidget.lastPage = lastPage
+    self.parentWidget.validator.setTop(lastPage)
+    self.parentWidget.lastPageInfo.setText(f"of ~{lastPage}" if isEstimate else f"of {lastPage}")
+
+  def countStudentsInBackground(self, searchField, searchValue):
+    self.countQuery.run(lambda: (searchField, searchValue, countStudents(searchField, searchValue)))
+
+  def applyExactCount(self, result):
+    searchField, searchValue, totalCount = result
+
+    # Ignore counts for a search the user has already moved away from
+    if (searchField, searchValue) != self.countRequest:
+      return
+
+    self.updateLastPage(totalCount)
+    self.matchingCount, self.isMatchingCountEstimate = totalCount, False
+
+  def initialStudentsToDisplay(self):
+    self.refreshDisplayStudents()
+
+  def populateTable(self, students, page):
+    self.tableModel.setRecords(students, rowOffset=(page - 1) * 50)
 
   def updateSortByIndex(self):
     sortByIndex = self.parentWidget.sortByComboBox.currentIndex()
@@ -210,91 +328,144 @@ class StudentTable(QtWidgets.QTableWidget):
     self.sortByIndex = max(0, sortByIndex - 1)
     self.sortingOrder = max(0, sortingOrder)
   
-  def openUpdateStudentDialog(self, studentRowData):
-    selectedRows = list(set(index.row() for index in self.selectedIndexes()))
+  # Rows still loading after a continuous scroll have nothing to act on yet
+  def selectedRows(self):
+    return sorted(index.row() for index in self.selectionModel().selectedRows() if self.tableModel.isRowLoaded(index.row()))
+
+  def openUpdateStudentDialog(self, row):
+    selectedRows = self.selectedRows()
     if not selectedRows or len(selectedRows) == 1:
-      studentData = list(studentRowData.values())
+      studentData = list(self.tableModel.record(row).values())
       self.updateDialog = UpdateStudentDialog(self, studentData)
       self.updateDialog.studentUpdatedTableSignal.connect(self.refreshDisplayStudents)
       self.updateDialog.statusMessageSignal.connect(self.parentWidget.displayMessageToStatusBar)
       self.updateDialog.exec()
       return
 
-    studentsData = [
-      [
-        self.item(row, 0).text() if self.item(row, 0) else "",  # ID Number
-        self.item(row, 1).text().split()[0] if self.item(row, 1) else "",  # First Name
-        " ".join(self.item(row, 1).text().split()[1:]) if self.item(row, 1) else "",  # Last Name
-        self.item(row, 3).text() if self.item(row, 3) else "",  # Year Level
-        self.item(row, 2).text() if self.item(row, 2) else "",  # Gender
-        self.item(row, 4).text() if self.item(row, 4) else "",  # Program Code
-        self.item(row, 5).text() if self.item(row, 5) else "",  # college_code
-      ]
-      for row in selectedRows
-    ]
-
-    self.updateDialog = UpdateBatchStudentDialog(self, studentsData)
+    scope = self.chooseSelectionScope(len(selectedRows), "Update")
+    if scope is None:
+      return
+
+    studentsData = [list(self.tableModel.record(selectedRow).values()) for selectedRow in selectedRows]
+    matchingSearch = (*self.currentSearch(), self.exactMatchingCount()) if scope == "matching" else None
+
+    self.updateDialog = UpdateBatchStudentDialog(self, studentsData, matchingSearch)
     self.updateDialog.studentUpdatedTableSignal.connect(self.refreshDisplayStudents)
     self.updateDialog.statusMessageSignal.connect(self.parentWidget.displayMessageToStatusBar)
     self.updateDialog.exec()
 
-  def deleteSelectedRow(self, student):
-    selectedRows = sorted(set(index.row() for index in self.selectedIndexes()), reverse=True)
+  def deleteSelectedRow(self, row):
+    selectedRows = self.selectedRows()
     selectedRowCount = len(selectedRows)
 
     # Multiple Deletions
     if len(selectedRows) > 1:
-      studentNames = f'\n{"\n".join(f'{self.item(row, 1).text()}' for row in selectedRows)}'
-      promptText = f"the following students?\n{studentNames}" if selectedRowCount < 20 else f"{selectedRowCount} students"
-      if not self.showDeleteConfirmation(self, promptText):
+      scope = self.chooseSelectionScope(selectedRowCount, "Delete")
+      if scope is None:
         return
-      
-      idNumbers = []
-      for row in sorted(selectedRows, reverse=True):      # Reverse to avoid shifting indices
-        idNumbers.append(self.students[row]["id_number"])
 
-      result = batchRemoveStudents(idNumbers)
-      if result != "Students removed successfully.":
-        self.statusMessageSignal.emit("Failed to remove selected students.", 3000)
+      if scope == "matching":
+        self.deleteMatchingStudents()
         return
 
-      for row in sorted(selectedRows, reverse=True):  
-        self.students.pop(row)
-        self.removeRow(row)
+      studentNames = f'\n{"\n".join(self.tableModel.data(self.tableModel.index(selectedRow, 1)) for selectedRow in selectedRows)}'
+      promptText = f"the following students?\n{studentNames}" if selectedRowCount < 20 else f"{selectedRowCount} students"
+      if not self.showDeleteConfirmation(self, promptText):
+        return
       
-      self.statusMessageSignal.emit("Selected students removed successfully.", 3000)
+      idNumbers = [self.tableModel.value(selectedRow, "id_number") for selectedRow in selectedRows]
+
+      # Runs in chunks behind a progress dialog; the table is updated once it finishes
+      self.batchDialog = TransferProgressDialog(self, "Remove Students", f"Removing {selectedRowCount:,} students...", batchRemoveStudents, idNumbers)
+      self.batchDialog.transferFinishedSignal.connect(self.handleBatchRemoveFinished)
+      self.batchDialog.transferFailedSignal.connect(self.handleBatchRemoveFailed)
+      self.batchDialog.start()
     
     # Single Deletion
     else:
+      student = self.tableModel.record(row)
       if not self.showDeleteConfirmation(self, f'{student["first_name"]} {student["last_name"]}'):
         return
 
-      # Remove from CSV
       result = removeStudent(student["id_number"])
 
       if result != "Student removed successfully.":
         self.statusMessageSignal.emit(result, 3000)
         return
 
-      # Find the row index of the student
-      rowToRemove = -1
-      for row in range(self.rowCount()):
-        if self.item(row, 0) and self.item(row, 0).text() == str(student["id_number"]):
-          rowToRemove = row
-          break
+      # The row may have moved while the confirmation was open
+      rowToRemove = self.tableModel.findRow("id_number", student["id_number"])
 
       if rowToRemove == -1:
         self.statusMessageSignal.emit("Error: Student not found in table.", 3000)
         return
 
-      # Remove student from internal list
-      self.students.remove(student)
-
-      # Remove row from QTableWidget
-      self.removeRow(rowToRemove)
+      self.tableModel.removeRecords([rowToRemove])
 
       self.statusMessageSignal.emit(result, 3000)
 
+  # Deletes every student matching the search on display with one statement, not just the rows on this page
+  def deleteMatchingStudents(self):
+    searchField, searchValue = self.currentSearch()
+    matchingCount = self.exactMatchingCount()
+
+    if not self.showDeleteConfirmation(self, f"all {matchingCount:,} students matching the search"):
+      return
+
+    self.batchDialog = TransferProgressDialog(self, "Remove Students", f"Removing {matchingCount:,} students...", removeMatchingStudents, searchField, searchValue, matchingCount)
+    self.batchDialog.transferFinishedSignal.connect(self.handleMatchingRemoveFinished)
+    self.batchDialog.transferFailedSignal.connect(self.handleBatchRemoveFailed)
+    self.batchDialog.start()
+
+  def handleMatchingRemoveFinished(self, summary):
+    self.statusMessageSignal.emit(summary["message"], 5000)
+    self.refreshDisplayStudents()
+
+  # When every row of the page is selected and the search matches more, asks whether to act on all of them
+  # Returns "selection", "matching", or None when the user backs out
+  def chooseSelectionScope(self, selectedRowCount, action):
+    if selectedRowCount < self.tableModel.rowCount() or self.matchingCount <= selectedRowCount:
+      return "selection"
+
+    msgBox = QtWidgets.QMessageBox(self)
+    msgBox.setWindowTitle(f"{action} Students")
+    msgBox.setText(f"All {selectedRowCount:,} students on this page are selected.\n{action} only these, or all {'~' if self.isMatchingCountEstimate else ''}{self.matchingCount:,} students matching the search?")
+    msgBox.setIcon(QtWidgets.QMessageBox.Icon.Question)
+
+    selectionButton = msgBox.addButton(f"Only These {selectedRowCount:,}", QtWidgets.QMessageBox.ButtonRole.AcceptRole)
+    matchingButton = msgBox.addButton("All Matching", QtWidgets.QMessageBox.ButtonRole.AcceptRole)
+    msgBox.addButton(QtWidgets.QMessageBox.StandardButton.Cancel)
+
+    for button in msgBox.findChildren(QtWidgets.QPushButton):
+      button.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
+
+    msgBox.setStyleSheet(MESSAGE_BOX_STYLESHEET)
+    msgBox.exec()
+
+    if msgBox.clickedButton() is selectionButton:
+      return "selection"
+    if msgBox.clickedButton() is matchingButton:
+      return "matching"
+    return None
+
+  # The exact total behind an unfiltered listing may still be loading, so it is counted here if needed
+  def exactMatchingCount(self):
+    if self.isMatchingCountEstimate:
+      self.matchingCount, self.isMatchingCountEstimate = countStudents(*self.currentSearch()), False
+
+    return self.matchingCount
+
+  # Drops the students that were removed from the table; any that failed stay listed
+  def handleBatchRemoveFinished(self, summary):
+    removedKeys = {str(key).lower() for key in summary["succeeded"]}
+    removedRows = [row for row in range(self.tableModel.rowCount()) if str(self.tableModel.value(row, "id_number")).lower() in removedKeys]
+
+    self.tableModel.removeRecords(removedRows)
+    self.statusMessageSignal.emit(summary["message"], 5000)
+
+  def handleBatchRemoveFailed(self, message):
+    self.statusMessageSignal.emit(f"Failed to remove selected students: {message}", 5000)
+
   def showDeleteConfirmation(self, parent, studentName):
     msgBox = QtWidgets.QMessageBox(parent)
     msgBox.setWindowTitle("Confirm Deletion")
@@ -305,29 +476,7 @@ class StudentTable(QtWidgets.QTableWidget):
     for button in msgBox.findChildren(QtWidgets.QPushButton):
       button.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
 
-    msgBox.setStyleSheet("""
-      QMessageBox {
-        background-color: rgb(37, 37, 37);
-        color: white;
-        border-radius: 10px;
-      }
-      QMessageBox QLabel {
-        color: white;
-        font-family: \"Inter\";
-      }
-      QMessageBox QPushButton {
-        font: 9pt "Inter";
-        font-weight: bold;
-        padding: 0px, 15px;
-        background-color: rgb(63, 150, 160);
-        border-radius: 3px;
-        padding: 5px 15px;
-      }
-                         
-      QMessageBox QPushButton::hover {
-        background-color: rgb(83, 170, 180);
-      }
-    """)
+    msgBox.setStyleSheet(MESSAGE_BOX_STYLESHEET)
 
     # Show the dialog and return the user's choice
     return msgBox.exec() == QtWidgets.QMessageBox.StandardButton.Yes
@@ -336,20 +485,17 @@ class StudentTable(QtWidgets.QTableWidget):
     if obj == self.viewport():
       if event.type() == QtCore.QEvent.Type.MouseMove:
         index = self.indexAt(event.pos())  # Get index of row under mouse
-        if index.isValid():
-          self.toggleButtons(index.row())
-        else:
-          self.toggleButtons(-1)  # Hide buttons when not over a valid row
+        row = index.row() if index.isValid() else -1  # Hide buttons when not over a valid row
+        button = self.operationsDelegate.buttonAt(self.visualRect(index), event.pos()) if index.isValid() and index.column() == 6 else None
+
+        if button != self.operationsDelegate.hoveredButton:
+          self.viewport().setCursor(Qt.CursorShape.PointingHandCursor if button else Qt.CursorShape.ArrowCursor)
+        self.toggleButtons(row, button)
       elif event.type() == QtCore.QEvent.Type.Leave:
         self.toggleButtons(-1)  # Hide buttons when mouse leaves the table
     return super().eventFilter(obj, event)
 
-  def toggleButtons(self, row):
-    for r in range(self.rowCount()):
-      operationsWidget = self.cellWidget(r, 6)
-      if operationsWidget:
-        for i in range(operationsWidget.layout().count()):
-          widget = operationsWidget.layout().itemAt(i).widget()
-          if widget and isinstance(widget.graphicsEffect(), QGraphicsOpacityEffect):
-            widget.graphicsEffect().setOpacity(1.0 if r == row else 0.0)
-  
\ No newline at end of file
+  # Repaints only the operations cells of the rows the hover left and entered, not the whole viewport
+  def toggleButtons(self, row, button=None):
+    for changedRow in self.operationsDelegate.setHover(row, button):
+      self.viewport().update(self.visualRect(self.tableModel.index(changedRow, 6)))
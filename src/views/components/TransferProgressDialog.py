@@ -0,0 +1,90 @@
+import threading
+
+from PyQt6 import QtWidgets, QtCore, QtGui
+from PyQt6.QtCore import pyqtSignal, QThreadPool
+
+from utils.QueryWorker import QueryWorker
+
+# Runs a CSV import or export, a batch update or delete (or any job taking progressCallback and cancelEvent) on the thread pool behind a progress bar
+class TransferProgressDialog(QtWidgets.QProgressDialog):
+  transferFinishedSignal = pyqtSignal(object)
+  transferFailedSignal = pyqtSignal(str)
+
+  PROGRESS_STEPS = 1000
+
+  def __init__(self, parent, title, labelText, function, *args, **kwargs):
+    super().__init__(labelText, "Cancel", 0, self.PROGRESS_STEPS, parent)
+    self.labelText = labelText
+
+    self.setWindowTitle(title)
+    self.setModal(True)
+    self.setMinimumDuration(0)
+    self.setMinimumWidth(400)
+    self.setAutoClose(False)
+    self.setAutoReset(False)
+    self.setStyleSheet("""
+                       QProgressDialog {
+                          background-color: qlineargradient(spread:pad, x1:0, y1:0, x2:0, y2:1, stop:0 rgba(37, 37, 37, 255), stop:1 rgba(52, 57, 57, 255));
+                       }
+                       QLabel { font: 9pt "Inter"; }
+                       QProgressBar::chunk { background-color: rgb(63, 150, 160); }
+                       QPushButton {
+                          font: 9pt "Inter";
+                          font-weight: bold;
+                          background-color: rgb(63, 150, 160);
+                          border-radius: 3px;
+                          padding: 5px 15px;
+                       }
+                       QPushButton::hover { background-color: rgb(83, 170, 180); }
+                      """)
+
+    for button in self.findChildren(QtWidgets.QPushButton):
+      button.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
+
+    # Chunks already committed stay committed when the job is cancelled
+    self.cancelEvent = threading.Event()
+    self.canceled.connect(self.cancelTransfer)
+
+    self.worker = QueryWorker(function, *args, cancelEvent=self.cancelEvent, **kwargs)
+    self.worker.kwargs["progressCallback"] = self.worker.signals.progress.emit
+    self.worker.signals.progress.connect(self.updateProgress)
+    self.worker.signals.finished.connect(self.handleFinished)
+    self.worker.signals.failed.connect(self.handleFailed)
+
+  def start(self):
+    self.setValue(0)
+    self.show()
+    QThreadPool.globalInstance().start(self.worker)
+
+  # Imports report bytes read from the file, exports report rows written out of the total,
+  # batch updates and deletes report records processed out of the selection
+  def updateProgress(self, progress):
+    if "processed" in progress:
+      if progress.get("total"):
+        self.setValue(int(progress["processed"] * self.PROGRESS_STEPS / progress["total"]))
+
+      self.setLabelText(f"{self.labelText}\n{progress['processed']:,} of {progress['total']:,} done, {progress['failed']:,} failed")
+      return
+
+    if "rowsWritten" in progress:
+      if progress.get("totalRows"):
+        self.setValue(int(progress["rowsWritten"] * self.PROGRESS_STEPS / progress["totalRows"]))
+
+      self.setLabelText(f"{self.labelText}\n{progress['rowsWritten']:,} of {progress['totalRows']:,} rows written")
+      return
+
+    if progress.get("totalBytes"):
+      self.setValue(int(progress["bytesRead"] * self.PROGRESS_STEPS / progress["totalBytes"]))
+
+    self.setLabelText(f"{self.labelText}\n{progress['rowsRead']:,} rows read, {progress['imported']:,} imported, {progress['rejected']:,} rejected")
+
+  def cancelTransfer(self):
+    self.cancelEvent.set()
+
+  def handleFinished(self, summary):
+    self.close()
+    self.transferFinishedSignal.emit(summary)
+
+  def handleFailed(self, message):
+    self.close()
+    self.transferFailedSignal.emit(message)
@@ -1,13 +1,15 @@
 from PyQt6 import QtWidgets, QtCore, QtGui
-from controllers.programControllers import getPrograms
-from controllers.collegeControllers import getColleges
-from controllers.studentControllers import batchUpdateStudents
+from controllers.programControllers import getProgramCodesByCollege
+from controllers.collegeControllers import getCollegeCodes
+from controllers.studentControllers import batchUpdateStudents, updateMatchingStudents
+from views.components.TransferProgressDialog import TransferProgressDialog
 
 class UpdateBatchStudentDialog(QtWidgets.QDialog):
   studentUpdatedTableSignal = QtCore.pyqtSignal(list)
   statusMessageSignal = QtCore.pyqtSignal(str, int)
 
-  def __init__(self, parent=None, studentsData=None):
+  # matchingSearch (searchField, searchTerm, count) applies the update to every student matching that search instead of the selection
+  def __init__(self, parent=None, studentsData=None, matchingSearch=None):
     super().__init__(parent)
     self.setWindowTitle("Update Multiple Students")
     self.setModal(True)
@@ -16,6 +18,7 @@ class UpdateBatchStudentDialog(QtWidgets.QDialog):
     self.studentsData = studentsData
     self.studentLastNames = [student[2] for student in studentsData]
     self.studentIDs = [student[0] for student in studentsData]
+    self.matchingSearch = matchingSearch
 
     self.setupUI()
 
@@ -58,7 +61,7 @@ class UpdateBatchStudentDialog(QtWidgets.QDialog):
     formLayout = QtWidgets.QFormLayout()
 
     # Only show selected student IDs
-    studentNames = ", ".join(str(student[2]) for student in self.studentsData) if len(self.studentsData) <= 5 else f"{len(self.studentsData)} students selected"
+    studentNames = self.describeStudents()
     self.idLabel = QtWidgets.QLabel(studentNames)
     
     # Year Level
@@ -75,8 +78,7 @@ class UpdateBatchStudentDialog(QtWidgets.QDialog):
     self.collegeCodeInput = QtWidgets.QComboBox(self)
     self.programCodeInput = QtWidgets.QComboBox(self)
 
-    colleges, _ = getColleges()
-    collegeCodeList = [college["college_code"] for college in colleges]
+    collegeCodeList = getCollegeCodes()
     self.collegeCodeInput.addItems([""] + collegeCodeList)
 
     # Update programs when college changes
@@ -115,8 +117,7 @@ class UpdateBatchStudentDialog(QtWidgets.QDialog):
 
   def updateProgramOptions(self):
     selectedCollege = self.collegeCodeInput.currentText()
-    programs, _ = getPrograms(searchField="college_code", searchTerm=selectedCollege)
-    programCodeList = [program["program_code"] for program in programs]
+    programCodeList = getProgramCodesByCollege(selectedCollege)
 
     self.programCodeInput.clear()
     self.programCodeInput.addItems(programCodeList)
@@ -125,32 +126,49 @@ class UpdateBatchStudentDialog(QtWidgets.QDialog):
     if not self.showUpdateConfirmation(self):
       return
     
-    updatedStudents = []
-    
     yearLevel = self.yearLevelInput.currentText() if self.yearLevelInput.currentText() != "" else None
     gender = self.genderInput.currentText() if self.genderInput.currentText() != "" else None
     collegeCode = self.collegeCodeInput.currentText() if self.collegeCodeInput.currentText() != "" else None
     programCode = self.programCodeInput.currentText() if self.programCodeInput.currentText() != "" else None
 
     if collegeCode is not None:
-      programsInCollege, _ = getPrograms(searchField="college_code", searchTerm=collegeCode)
-      if len(programsInCollege) == 0:
+      if not getProgramCodesByCollege(collegeCode):
         self.showStatusMessage("Selected College has no Programs")
         return
 
-    result = batchUpdateStudents(self.studentIDs, yearLevel, gender, programCode, collegeCode, False)
-    
-    if result != "Students updated successfully.":
-      self.showStatusMessage(result)
+    if self.matchingSearch is not None:
+      searchField, searchTerm, matchingCount = self.matchingSearch
+      self.batchDialog = TransferProgressDialog(self, "Update Students", f"Updating {matchingCount:,} students...", updateMatchingStudents, searchField, searchTerm, matchingCount, yearLevel, gender, programCode, collegeCode, False)
+      self.batchDialog.transferFinishedSignal.connect(self.handleUpdateFinished)
+      self.batchDialog.transferFailedSignal.connect(self.showStatusMessage)
+      self.batchDialog.start()
+      return
+
+    # Runs in chunks behind a progress dialog; large selections no longer go out as one statement
+    self.batchDialog = TransferProgressDialog(self, "Update Students", f"Updating {len(self.studentIDs):,} students...", batchUpdateStudents, self.studentIDs, yearLevel, gender, programCode, collegeCode, False)
+    self.batchDialog.transferFinishedSignal.connect(self.handleUpdateFinished)
+    self.batchDialog.transferFailedSignal.connect(self.showStatusMessage)
+    self.batchDialog.start()
+
+  def handleUpdateFinished(self, summary):
+    # Nothing was written, e.g. the program was rejected, so the dialog stays open
+    if not summary.get("affected", len(summary.get("succeeded", []))):
+      self.showStatusMessage(summary["message"])
       return
-      
+
     # THIS IS OUTDATED! ITS JUST FOR THE SIGNAL TO WORK
-    self.studentUpdatedTableSignal.emit(updatedStudents)
-    self.statusMessageSignal.emit("Students Updated", 3000)
+    self.studentUpdatedTableSignal.emit([])
+    self.statusMessageSignal.emit(summary["message"], 5000)
     self.accept()
 
+  def describeStudents(self):
+    if self.matchingSearch is not None:
+      return f"all {self.matchingSearch[2]:,} students matching the search"
+
+    return ", ".join(str(lastName) for lastName in self.studentLastNames) if len(self.studentLastNames) <= 5 else f"{len(self.studentsData)} students selected"
+
   def showUpdateConfirmation(self, parent):
-    studentNames = ", ".join(self.studentLastNames) if len(self.studentLastNames) <= 5 else f"{len(self.studentsData)} students selected"
+    studentNames = self.describeStudents()
 
     msgBox = QtWidgets.QMessageBox(parent)
     msgBox.setWindowTitle("Confirm Update")
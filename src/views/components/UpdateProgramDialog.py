@@ -1,7 +1,7 @@
 from PyQt6 import QtWidgets, QtCore, QtGui
 
 from controllers.programControllers import updateProgram
-from controllers.collegeControllers import getColleges
+from controllers.collegeControllers import getCollegeCodes
 
 class UpdateProgramDialog(QtWidgets.QDialog):
   programUpdatedTableSignal = QtCore.pyqtSignal(list)
@@ -62,8 +62,7 @@ class UpdateProgramDialog(QtWidgets.QDialog):
 
     self.collegeCodeInput = QtWidgets.QComboBox(self)
 
-    colleges, _ = getColleges()
-    collegeCodeList = [college["college_code"] for college in colleges]
+    collegeCodeList = getCollegeCodes()
     self.collegeCodeInput.addItems(collegeCodeList)
 
     if programData[2] != None:
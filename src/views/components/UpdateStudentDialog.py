@@ -2,8 +2,8 @@
 from PyQt6 import QtWidgets, QtCore, QtGui
 from PyQt6.QtCore import Qt
 
-from controllers.programControllers import getPrograms
-from controllers.collegeControllers import getColleges
+from controllers.programControllers import getProgramCodesByCollege
+from controllers.collegeControllers import getCollegeCodes
 from controllers.studentControllers import updateStudent
 
 class UpdateStudentDialog(QtWidgets.QDialog):
@@ -82,8 +82,7 @@ class UpdateStudentDialog(QtWidgets.QDialog):
     self.programCodeInput = QtWidgets.QComboBox(self)
     self.collegeCodeInput = QtWidgets.QComboBox(self)
 
-    colleges, _ = getColleges()
-    collegeCodeList = [college["college_code"] for college in colleges]
+    collegeCodeList = getCollegeCodes()
     self.collegeCodeInput.addItems(collegeCodeList)
     
     if studentData[6] != None:
@@ -175,8 +174,7 @@ class UpdateStudentDialog(QtWidgets.QDialog):
     self.programCodeInput.clear()
 
     # Add new program options
-    programs, _ = getPrograms(searchField="college_code", searchTerm=selectedCollege)
-    programCodeList = [program["program_code"] for program in programs]
+    programCodeList = getProgramCodesByCollege(selectedCollege)
     self.programCodeInput.addItems(programCodeList)
 
     return programCodeList
@@ -0,0 +1,211 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+
+from PyQt6.QtCore import Qt, QModelIndex, QThreadPool, pyqtSignal
+
+from utils.QueryWorker import QueryWorker
+from views.components.RecordTableModel import RecordTableModel
+
+# A record model that can also be filled a window of rows at a time as the view scrolls, for continuous scrolling
+# Rows stay in one list by position; rows that were evicted (or not loaded yet) are None and are loaded again in the
+# background once the view asks for them
+class WindowedRecordModel(RecordTableModel):
+  WINDOW_SIZE = 200
+  MAX_WINDOWS = 10
+  # The next window starts loading once the view shows a row this close to the end of the loaded rows
+  PREFETCH_ROWS = 100
+
+  windowFailed = pyqtSignal(str)
+
+  def __init__(self, columns, centeredColumns=(), parent=None, threadPool=None):
+    super().__init__(columns, centeredColumns, parent)
+    self.threadPool = threadPool or QThreadPool.globalInstance()
+
+    # fetchWindow(window, windowSize, previousRecord) runs on the thread pool and returns the window's records
+    self.fetchWindow: Optional[Callable[[int, int, Optional[Dict[str, Any]]], List[Dict[str, Any]]]] = None
+
+    # Windows in memory, least recently shown first
+    self.windows: "OrderedDict[int, None]" = OrderedDict()
+    self.pendingWindows: Dict[int, QueryWorker] = {}
+    self.failedWindows: Set[int] = set()
+    self.reachedEnd = False
+    self.viewportWindow = 0
+
+    # Rows the view still needs (its selection), whose windows are never evicted
+    self.pinnedRows: Callable[[], Sequence[int]] = lambda: ()
+
+  def isWindowed(self) -> bool:
+    return self.fetchWindow is not None
+
+  # Switches to windows fetched in the background, starting with the first
+  # previousRecord is the row just before a window when it is in memory, so the fetch can seek from it instead of using OFFSET
+  def startWindows(self, fetchWindow: Callable[[int, int, Optional[Dict[str, Any]]], List[Dict[str, Any]]]) -> None:
+    self.beginResetModel()
+    self.cancelWindows()
+    self.fetchWindow = fetchWindow
+    self.rows = []
+    self.rowOffset = 0
+    self.reachedEnd = False
+    self.viewportWindow = 0
+    self.endResetModel()
+
+    self.loadWindow(0)
+
+  # Showing a plain page leaves continuous scrolling
+  def setRecords(self, records: List[Dict[str, Any]], rowOffset: int = 0) -> None:
+    self.cancelWindows()
+    self.fetchWindow = None
+    super().setRecords(records, rowOffset)
+
+  def cancelWindows(self) -> None:
+    for worker in self.pendingWindows.values():
+      worker.withdraw(self.threadPool)
+
+    self.pendingWindows.clear()
+    self.windows.clear()
+    self.failedWindows.clear()
+
+  def isRowLoaded(self, row: int) -> bool:
+    return 0 <= row < len(self.rows) and self.rows[row] is not None
+
+  def findRow(self, field: str, value: Any) -> int:
+    if field not in self.fields:
+      return -1
+
+    fieldIndex = self.fields.index(field)
+    for row, values in enumerate(self.rows):
+      if values is not None and values[fieldIndex] == value:
+        return row
+
+    return -1
+
+  #----------------------------------------------------------
+
+  def nextWindow(self) -> int:
+    return len(self.rows) // self.WINDOW_SIZE
+
+  def canFetchMore(self, parent=QModelIndex()) -> bool:
+    if parent.isValid() or not self.isWindowed() or self.reachedEnd:
+      return False
+
+    window = self.nextWindow()
+    return window not in self.pendingWindows and window not in self.failedWindows
+
+  def fetchMore(self, parent=QModelIndex()) -> None:
+    if self.canFetchMore(parent):
+      self.loadWindow(self.nextWindow())
+
+  def loadWindow(self, window: int) -> None:
+    if window in self.pendingWindows or window in self.failedWindows:
+      return
+
+    start = window * self.WINDOW_SIZE
+    previousRecord = self.record(start - 1) if self.isRowLoaded(start - 1) else None
+    fetchWindow, windowSize = self.fetchWindow, self.WINDOW_SIZE
+
+    worker = QueryWorker(lambda: (window, fetchWindow(window, windowSize, previousRecord)))
+    worker.signals.finished.connect(self.handleWindowLoaded)
+    worker.signals.failed.connect(self.handleWindowFailed)
+
+    self.pendingWindows[window] = worker
+    self.threadPool.start(worker)
+
+  def senderWindow(self) -> Optional[int]:
+    # Results of windows asked for before a reset can still be queued on the event loop
+    for window, worker in self.pendingWindows.items():
+      if self.sender() is worker.signals:
+        return window
+    return None
+
+  def handleWindowLoaded(self, result) -> None:
+    window, records = result
+    if self.senderWindow() != window:
+      return
+
+    del self.pendingWindows[window]
+
+    if records:
+      self.setFields(records[0].keys())
+
+    start = window * self.WINDOW_SIZE
+    values = [tuple(record.values()) for record in records]
+
+    # Rows already listed are refreshed in place and the rest are appended
+    overlap = max(0, min(len(values), len(self.rows) - start))
+    if overlap:
+      self.rows[start:start + overlap] = values[:overlap]
+      self.dataChanged.emit(self.index(start, 0), self.index(start + overlap - 1, self.columnCount() - 1))
+
+    if len(values) > overlap:
+      self.beginInsertRows(QModelIndex(), len(self.rows), start + len(values) - 1)
+      self.rows.extend(values[overlap:])
+      self.endInsertRows()
+
+    # A short window is the end of the result set; rows listed past it were deleted since
+    if len(values) < self.WINDOW_SIZE:
+      self.reachedEnd = True
+      end = start + len(values)
+      if len(self.rows) > end:
+        self.beginRemoveRows(QModelIndex(), end, len(self.rows) - 1)
+        del self.rows[end:]
+        self.endRemoveRows()
+
+    self.windows[window] = None
+    self.windows.move_to_end(window)
+    self.evictWindows()
+
+  def handleWindowFailed(self, message: str) -> None:
+    window = self.senderWindow()
+    if window is None:
+      return
+
+    # Not retried on every repaint; the next reload starts over
+    del self.pendingWindows[window]
+    self.failedWindows.add(window)
+    self.windowFailed.emit(message)
+
+  # Drops the least recently shown windows over MAX_WINDOWS, except the ones on screen, next to it or selected
+  def evictWindows(self) -> None:
+    if len(self.windows) <= self.MAX_WINDOWS:
+      return
+
+    pinnedWindows = {row // self.WINDOW_SIZE for row in self.pinnedRows()}
+
+    for window in list(self.windows):
+      if len(self.windows) <= self.MAX_WINDOWS:
+        break
+      if abs(window - self.viewportWindow) <= 1 or window in pinnedWindows:
+        continue
+
+      start = window * self.WINDOW_SIZE
+      end = min(start + self.WINDOW_SIZE, len(self.rows))
+      self.rows[start:end] = [None] * (end - start)
+      del self.windows[window]
+
+  # The view only asks for the rows it shows, so this is where windows are reloaded and the next one prefetched
+  def showRow(self, row: int) -> None:
+    window = row // self.WINDOW_SIZE
+    self.viewportWindow = window
+
+    if window in self.windows:
+      self.windows.move_to_end(window)
+
+    if self.rows[row] is None:
+      self.loadWindow(window)
+
+    if row >= len(self.rows) - self.PREFETCH_ROWS:
+      self.fetchMore()
+
+  def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+    if not self.isWindowed() or not index.isValid():
+      return super().data(index, role)
+
+    row = index.row()
+    if role == Qt.ItemDataRole.DisplayRole:
+      self.showRow(row)
+
+    # Rows still loading are shown blank
+    if self.rows[row] is None and role != Qt.ItemDataRole.TextAlignmentRole:
+      return None
+
+    return super().data(index, role)
@@ -1,15 +1,22 @@
+import os
+
 from PyQt6 import QtCore, QtGui, QtWidgets
 from PyQt6.QtCore import pyqtSignal, Qt
 
 from utils.PageIntValidator import PageIntValidator
 from views.components.CollegeTable import CollegeTable
 from views.components.AddCollegeDialog import AddCollegeDialog
+from views.components.TransferProgressDialog import TransferProgressDialog
+from controllers.importControllers import importCollegesCsv
+from controllers.exportControllers import exportColleges
 
 class CollegesPage(QtWidgets.QWidget):
   statusMessageSignal = pyqtSignal(str, int)
   spacebarPressedSignal = pyqtSignal()
   updateTablesSignal = pyqtSignal()
 
+  SEARCH_DEBOUNCE_MS = 250
+
   def __init__(self, parent=None):
     super().__init__(parent)
     self.isSearchActive = False
@@ -29,6 +36,8 @@ class CollegesPage(QtWidgets.QWidget):
     self.collegeTable.updateTablesSignal.connect(self.updateTablesSignal)
 
     self.addCollegeButton.clicked.connect(self.openAddCollegeDialog)
+    self.importCollegesButton.clicked.connect(self.openImportDialog)
+    self.exportCollegesButton.clicked.connect(self.openExportDialog)
 
     self.sortByComboBox.currentIndexChanged.connect(lambda: self.statusMessageSignal.emit("Sorting...", 2000))
     self.sortingOrderComboBox.currentIndexChanged.connect(lambda: self.statusMessageSignal.emit("Sorting...", 2000))
@@ -38,6 +47,13 @@ class CollegesPage(QtWidgets.QWidget):
     self.searchByComboBox.currentIndexChanged.connect(self.searchColleges)
     self.spacebarPressedSignal.connect(self.searchColleges)
 
+    # Search as you type once the input has been still for a moment
+    self.searchTimer = QtCore.QTimer(self)
+    self.searchTimer.setSingleShot(True)
+    self.searchTimer.setInterval(self.SEARCH_DEBOUNCE_MS)
+    self.searchTimer.timeout.connect(self.searchColleges)
+    self.searchBarLineEdit.textChanged.connect(self.handleSearchTextChanged)
+
     self.pageLabel.editingFinished.connect(self.handlePageChange)
 
     self.displayMessageToStatusBar("Colleges Page Loaded", 3000)
@@ -405,6 +421,40 @@ class CollegesPage(QtWidgets.QWidget):
     self.addCollegeButton.setStyleSheet("")
     self.addCollegeButton.setObjectName("addCollegeButton")
     self.horizontalLayout.addWidget(self.addCollegeButton)
+    self.importCollegesButton = QtWidgets.QPushButton(parent=self.controlsFrame)
+    sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Preferred)
+    sizePolicy.setHorizontalStretch(0)
+    sizePolicy.setVerticalStretch(0)
+    sizePolicy.setHeightForWidth(self.importCollegesButton.sizePolicy().hasHeightForWidth())
+    self.importCollegesButton.setSizePolicy(sizePolicy)
+    self.importCollegesButton.setMaximumSize(QtCore.QSize(150, 16777215))
+    font = QtGui.QFont()
+    font.setFamily("Inter")
+    font.setPointSize(9)
+    font.setBold(True)
+    font.setItalic(False)
+    self.importCollegesButton.setFont(font)
+    self.importCollegesButton.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
+    self.importCollegesButton.setStyleSheet("")
+    self.importCollegesButton.setObjectName("importCollegesButton")
+    self.horizontalLayout.addWidget(self.importCollegesButton)
+    self.exportCollegesButton = QtWidgets.QPushButton(parent=self.controlsFrame)
+    sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Preferred)
+    sizePolicy.setHorizontalStretch(0)
+    sizePolicy.setVerticalStretch(0)
+    sizePolicy.setHeightForWidth(self.exportCollegesButton.sizePolicy().hasHeightForWidth())
+    self.exportCollegesButton.setSizePolicy(sizePolicy)
+    self.exportCollegesButton.setMaximumSize(QtCore.QSize(150, 16777215))
+    font = QtGui.QFont()
+    font.setFamily("Inter")
+    font.setPointSize(9)
+    font.setBold(True)
+    font.setItalic(False)
+    self.exportCollegesButton.setFont(font)
+    self.exportCollegesButton.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
+    self.exportCollegesButton.setStyleSheet("")
+    self.exportCollegesButton.setObjectName("exportCollegesButton")
+    self.horizontalLayout.addWidget(self.exportCollegesButton)
 
     self.sortByComboBox = QtWidgets.QComboBox(parent=self.controlsFrame)
     self.sortByComboBox.setEnabled(True)
@@ -550,6 +600,8 @@ class CollegesPage(QtWidgets.QWidget):
     self.searchBarLineEdit.setPlaceholderText(_translate("mainWindow", "Search College"))
     self.collegeLabel.setText(_translate("mainWindow", "Colleges"))
     self.addCollegeButton.setText(_translate("mainWindow", "Add College"))
+    self.importCollegesButton.setText(_translate("mainWindow", "Import CSV"))
+    self.exportCollegesButton.setText(_translate("mainWindow", "Export"))
     self.searchButton.setText(_translate("mainWindow", "Search"))
     self.searchByComboBox.setItemText(1, _translate("mainWindow", "Any"))
     self.searchByComboBox.setItemText(2, _translate("mainWindow", "College Code"))
@@ -570,6 +622,50 @@ class CollegesPage(QtWidgets.QWidget):
     self.addDialog.collegeAddedWindowSignal.connect(self.displayMessageToStatusBar)
     self.addDialog.exec()
 
+  def openImportDialog(self):
+    filePath, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Import Colleges", "", "CSV Files (*.csv)")
+    if not filePath:
+      return
+
+    self.importDialog = TransferProgressDialog(self, "Import Colleges", f"Importing {os.path.basename(filePath)}...", importCollegesCsv, filePath)
+    self.importDialog.transferFinishedSignal.connect(self.handleImportFinished)
+    self.importDialog.transferFailedSignal.connect(self.handleImportFailed)
+    self.importDialog.start()
+
+  def handleImportFinished(self, summary):
+    message = f"Imported {summary['imported']:,} colleges."
+    if summary["rejected"]:
+      message += f" {summary['rejected']:,} rejected rows written to {summary['rejectsPath']}."
+    if summary["cancelled"]:
+      message = f"Import cancelled. {message}"
+
+    self.displayMessageToStatusBar(message, 8000)
+    self.collegeTable.refreshDisplayColleges()
+
+  def handleImportFailed(self, message):
+    self.displayMessageToStatusBar(f"Import failed: {message}", 5000)
+
+  # Exports everything matching the current search in the current sort order, not just the page on display
+  def openExportDialog(self):
+    filePath, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Export Colleges", "colleges.csv", "CSV Files (*.csv);;JSON Lines (*.jsonl)")
+    if not filePath:
+      return
+
+    self.exportDialog = TransferProgressDialog(self, "Export Colleges", f"Exporting to {os.path.basename(filePath)}...", exportColleges, filePath, **self.collegeTable.exportParameters())
+    self.exportDialog.transferFinishedSignal.connect(self.handleExportFinished)
+    self.exportDialog.transferFailedSignal.connect(self.handleExportFailed)
+    self.exportDialog.start()
+
+  def handleExportFinished(self, summary):
+    if summary["cancelled"]:
+      self.displayMessageToStatusBar("Export cancelled.", 5000)
+      return
+
+    self.displayMessageToStatusBar(f"Exported {summary['rowsWritten']:,} colleges to {summary['filePath']}.", 8000)
+
+  def handleExportFailed(self, message):
+    self.displayMessageToStatusBar(f"Export failed: {message}", 5000)
+
   def keyPressEvent(self, event):
     if self.searchBarLineEdit.hasFocus():
       if event.key() == Qt.Key.Key_Return:
@@ -577,13 +673,21 @@ class CollegesPage(QtWidgets.QWidget):
 
   def handleRefresh(self):
     self.searchBarLineEdit.clear()
+    self.searchTimer.stop()
     self.page = 1
     self.pageLabel.setText(str(self.page))
     self.collegeTable.refreshDisplayColleges()
     self.refreshButton.setVisible(False)
     self.isSearchActive = False
 
+  def handleSearchTextChanged(self):
+    # Whatever is still loading was asked for with the old text
+    self.collegeTable.pageQuery.cancel()
+    self.searchTimer.start()
+
   def searchColleges(self):
+    self.searchTimer.stop()
+
     if self.searchBarLineEdit.text().strip():
       self.displayMessageToStatusBar("Searching...", 3000)
       self.refreshButton.setVisible(True)
@@ -593,7 +697,7 @@ class CollegesPage(QtWidgets.QWidget):
     else:
       self.refreshButton.setVisible(False)
 
-    self.collegeTable.refreshDisplayColleges()
+    self.collegeTable.searchDisplayColleges()
 
   def prevPage(self):
     if self.page > 1:
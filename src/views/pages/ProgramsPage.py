@@ -1,15 +1,22 @@
+import os
+
 from PyQt6 import QtCore, QtGui, QtWidgets
 from PyQt6.QtCore import pyqtSignal, Qt
 
 from utils.PageIntValidator import PageIntValidator
 from views.components.ProgramTable import ProgramTable
 from views.components.AddProgramDialog import AddProgramDialog
+from views.components.TransferProgressDialog import TransferProgressDialog
+from controllers.importControllers import importProgramsCsv
+from controllers.exportControllers import exportPrograms
 
 class ProgramsPage(QtWidgets.QWidget):
   statusMessageSignal = pyqtSignal(str, int)
   enterPressedSignal = pyqtSignal()
   updateTablesSignal = pyqtSignal()
 
+  SEARCH_DEBOUNCE_MS = 250
+
   def __init__(self, parent=None):
     super().__init__(parent)
     self.isSearchActive = False
@@ -29,6 +36,8 @@ class ProgramsPage(QtWidgets.QWidget):
     self.programTable.updateTablesSignal.connect(self.updateTablesSignal)
 
     self.addProgramButton.clicked.connect(self.openAddProgramDialog)
+    self.importProgramsButton.clicked.connect(self.openImportDialog)
+    self.exportProgramsButton.clicked.connect(self.openExportDialog)
 
     self.sortByComboBox.currentIndexChanged.connect(lambda: self.statusMessageSignal.emit("Sorting...", 500))
     self.sortingOrderComboBox.currentIndexChanged.connect(lambda: self.statusMessageSignal.emit("Sorting...", 500))
@@ -38,6 +47,13 @@ class ProgramsPage(QtWidgets.QWidget):
     self.searchByComboBox.currentIndexChanged.connect(self.searchPrograms)
     self.enterPressedSignal.connect(self.searchPrograms)
 
+    # Search as you type once the input has been still for a moment
+    self.searchTimer = QtCore.QTimer(self)
+    self.searchTimer.setSingleShot(True)
+    self.searchTimer.setInterval(self.SEARCH_DEBOUNCE_MS)
+    self.searchTimer.timeout.connect(self.searchPrograms)
+    self.searchBarLineEdit.textChanged.connect(self.handleSearchTextChanged)
+
     self.pageLabel.editingFinished.connect(self.handlePageChange)
 
     self.displayMessageToStatusBar("Programs Page Loaded", 3000)
@@ -409,6 +425,40 @@ class ProgramsPage(QtWidgets.QWidget):
     self.addProgramButton.setStyleSheet("")
     self.addProgramButton.setObjectName("addProgramButton")
     self.horizontalLayout.addWidget(self.addProgramButton)
+    self.importProgramsButton = QtWidgets.QPushButton(parent=self.controlsFrame)
+    sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Preferred)
+    sizePolicy.setHorizontalStretch(0)
+    sizePolicy.setVerticalStretch(0)
+    sizePolicy.setHeightForWidth(self.importProgramsButton.sizePolicy().hasHeightForWidth())
+    self.importProgramsButton.setSizePolicy(sizePolicy)
+    self.importProgramsButton.setMaximumSize(QtCore.QSize(150, 16777215))
+    font = QtGui.QFont()
+    font.setFamily("Inter")
+    font.setPointSize(9)
+    font.setBold(True)
+    font.setItalic(False)
+    self.importProgramsButton.setFont(font)
+    self.importProgramsButton.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
+    self.importProgramsButton.setStyleSheet("")
+    self.importProgramsButton.setObjectName("importProgramsButton")
+    self.horizontalLayout.addWidget(self.importProgramsButton)
+    self.exportProgramsButton = QtWidgets.QPushButton(parent=self.controlsFrame)
+    sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Preferred)
+    sizePolicy.setHorizontalStretch(0)
+    sizePolicy.setVerticalStretch(0)
+    sizePolicy.setHeightForWidth(self.exportProgramsButton.sizePolicy().hasHeightForWidth())
+    self.exportProgramsButton.setSizePolicy(sizePolicy)
+    self.exportProgramsButton.setMaximumSize(QtCore.QSize(150, 16777215))
+    font = QtGui.QFont()
+    font.setFamily("Inter")
+    font.setPointSize(9)
+    font.setBold(True)
+    font.setItalic(False)
+    self.exportProgramsButton.setFont(font)
+    self.exportProgramsButton.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
+    self.exportProgramsButton.setStyleSheet("")
+    self.exportProgramsButton.setObjectName("exportProgramsButton")
+    self.horizontalLayout.addWidget(self.exportProgramsButton)
 
     self.sortByComboBox = QtWidgets.QComboBox(parent=self.controlsFrame)
     self.sortByComboBox.setEnabled(True)
@@ -556,6 +606,8 @@ class ProgramsPage(QtWidgets.QWidget):
     self.searchBarLineEdit.setPlaceholderText(_translate("mainWindow", "Search Program"))
     self.programLabel.setText(_translate("mainWindow", "Programs"))
     self.addProgramButton.setText(_translate("mainWindow", "Add Program"))
+    self.importProgramsButton.setText(_translate("mainWindow", "Import CSV"))
+    self.exportProgramsButton.setText(_translate("mainWindow", "Export"))
     self.searchButton.setText(_translate("mainWindow", "Search"))
     self.searchByComboBox.setItemText(1, _translate("mainWindow", "Any"))
     self.searchByComboBox.setItemText(2, _translate("mainWindow", "Program Code"))
@@ -578,6 +630,50 @@ class ProgramsPage(QtWidgets.QWidget):
     self.addDialog.programAddedWindowSignal.connect(self.displayMessageToStatusBar)
     self.addDialog.exec()
   
+  def openImportDialog(self):
+    filePath, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Import Programs", "", "CSV Files (*.csv)")
+    if not filePath:
+      return
+
+    self.importDialog = TransferProgressDialog(self, "Import Programs", f"Importing {os.path.basename(filePath)}...", importProgramsCsv, filePath)
+    self.importDialog.transferFinishedSignal.connect(self.handleImportFinished)
+    self.importDialog.transferFailedSignal.connect(self.handleImportFailed)
+    self.importDialog.start()
+
+  def handleImportFinished(self, summary):
+    message = f"Imported {summary['imported']:,} programs."
+    if summary["rejected"]:
+      message += f" {summary['rejected']:,} rejected rows written to {summary['rejectsPath']}."
+    if summary["cancelled"]:
+      message = f"Import cancelled. {message}"
+
+    self.displayMessageToStatusBar(message, 8000)
+    self.programTable.refreshDisplayPrograms()
+
+  def handleImportFailed(self, message):
+    self.displayMessageToStatusBar(f"Import failed: {message}", 5000)
+
+  # Exports everything matching the current search in the current sort order, not just the page on display
+  def openExportDialog(self):
+    filePath, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Export Programs", "programs.csv", "CSV Files (*.csv);;JSON Lines (*.jsonl)")
+    if not filePath:
+      return
+
+    self.exportDialog = TransferProgressDialog(self, "Export Programs", f"Exporting to {os.path.basename(filePath)}...", exportPrograms, filePath, **self.programTable.exportParameters())
+    self.exportDialog.transferFinishedSignal.connect(self.handleExportFinished)
+    self.exportDialog.transferFailedSignal.connect(self.handleExportFailed)
+    self.exportDialog.start()
+
+  def handleExportFinished(self, summary):
+    if summary["cancelled"]:
+      self.displayMessageToStatusBar("Export cancelled.", 5000)
+      return
+
+    self.displayMessageToStatusBar(f"Exported {summary['rowsWritten']:,} programs to {summary['filePath']}.", 8000)
+
+  def handleExportFailed(self, message):
+    self.displayMessageToStatusBar(f"Export failed: {message}", 5000)
+
   def keyPressEvent(self, event):
     if self.searchBarLineEdit.hasFocus():
       if event.key() == Qt.Key.Key_Return:
@@ -585,13 +681,21 @@ class ProgramsPage(QtWidgets.QWidget):
 
   def handleRefresh(self):
     self.searchBarLineEdit.clear()
+    self.searchTimer.stop()
     self.page = 1
     self.pageLabel.setText(str(self.page))
     self.programTable.refreshDisplayPrograms()
     self.refreshButton.setVisible(False)
     self.isSearchActive = False
 
+  def handleSearchTextChanged(self):
+    # Whatever is still loading was asked for with the old text
+    self.programTable.pageQuery.cancel()
+    self.searchTimer.start()
+
   def searchPrograms(self):
+    self.searchTimer.stop()
+
     if self.searchBarLineEdit.text().strip():
       self.displayMessageToStatusBar("Searching...", 3000)
       self.refreshButton.setVisible(True)
@@ -601,7 +705,7 @@ class ProgramsPage(QtWidgets.QWidget):
     else:
       self.refreshButton.setVisible(False)
 
-    self.programTable.refreshDisplayPrograms()
+    self.programTable.searchDisplayPrograms()
 
   def prevPage(self):
     if self.page > 1:
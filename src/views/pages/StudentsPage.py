@@ -1,14 +1,21 @@
+import os
+
 from PyQt6 import QtCore, QtGui, QtWidgets
 from PyQt6.QtCore import pyqtSignal, Qt
 
 from utils.PageIntValidator import PageIntValidator
 from views.components.StudentTable import StudentTable
 from views.components.AddStudentDialog import AddStudentDialog
+from views.components.TransferProgressDialog import TransferProgressDialog
+from controllers.importControllers import importStudentsCsv
+from controllers.exportControllers import exportStudents
 
 class StudentsPage(QtWidgets.QWidget):
     statusMessageSignal = pyqtSignal(str, int)
     enterPressedSignal = pyqtSignal()
 
+    SEARCH_DEBOUNCE_MS = 250
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.isSearchActive = False
@@ -27,6 +34,8 @@ class StudentsPage(QtWidgets.QWidget):
         self.studentTable.statusMessageSignal.connect(self.displayMessageToStatusBar)
 
         self.addStudentButton.clicked.connect(self.openAddStudentDialog)
+        self.importStudentsButton.clicked.connect(self.openImportDialog)
+        self.exportStudentsButton.clicked.connect(self.openExportDialog)
 
         self.sortByComboBox.currentIndexChanged.connect(lambda: self.statusMessageSignal.emit("Sorting...", 500))
         self.sortingOrderComboBox.currentIndexChanged.connect(lambda: self.statusMessageSignal.emit("Sorting...", 500))
@@ -36,6 +45,13 @@ class StudentsPage(QtWidgets.QWidget):
         self.searchByComboBox.currentIndexChanged.connect(self.searchStudents)
         self.enterPressedSignal.connect(self.searchStudents)
 
+        # Search as you type once the input has been still for a moment
+        self.searchTimer = QtCore.QTimer(self)
+        self.searchTimer.setSingleShot(True)
+        self.searchTimer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self.searchTimer.timeout.connect(self.searchStudents)
+        self.searchBarLineEdit.textChanged.connect(self.handleSearchTextChanged)
+
         self.pageLabel.editingFinished.connect(self.handlePageChange)
 
         self.displayMessageToStatusBar("Students Page Loaded", 3000)
@@ -407,6 +423,40 @@ class StudentsPage(QtWidgets.QWidget):
         self.addStudentButton.setStyleSheet("")
         self.addStudentButton.setObjectName("addStudentButton")
         self.horizontalLayout.addWidget(self.addStudentButton)
+        self.importStudentsButton = QtWidgets.QPushButton(parent=self.controlsFrame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.importStudentsButton.sizePolicy().hasHeightForWidth())
+        self.importStudentsButton.setSizePolicy(sizePolicy)
+        self.importStudentsButton.setMaximumSize(QtCore.QSize(150, 16777215))
+        font = QtGui.QFont()
+        font.setFamily("Inter")
+        font.setPointSize(9)
+        font.setBold(True)
+        font.setItalic(False)
+        self.importStudentsButton.setFont(font)
+        self.importStudentsButton.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
+        self.importStudentsButton.setStyleSheet("")
+        self.importStudentsButton.setObjectName("importStudentsButton")
+        self.horizontalLayout.addWidget(self.importStudentsButton)
+        self.exportStudentsButton = QtWidgets.QPushButton(parent=self.controlsFrame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.exportStudentsButton.sizePolicy().hasHeightForWidth())
+        self.exportStudentsButton.setSizePolicy(sizePolicy)
+        self.exportStudentsButton.setMaximumSize(QtCore.QSize(150, 16777215))
+        font = QtGui.QFont()
+        font.setFamily("Inter")
+        font.setPointSize(9)
+        font.setBold(True)
+        font.setItalic(False)
+        self.exportStudentsButton.setFont(font)
+        self.exportStudentsButton.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
+        self.exportStudentsButton.setStyleSheet("")
+        self.exportStudentsButton.setObjectName("exportStudentsButton")
+        self.horizontalLayout.addWidget(self.exportStudentsButton)
 
         self.sortByComboBox = QtWidgets.QComboBox(parent=self.controlsFrame)
         self.sortByComboBox.setEnabled(True)
@@ -502,6 +552,15 @@ class StudentsPage(QtWidgets.QWidget):
         self.nextPageButton.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
         self.nextPageButton.clicked.connect(self.nextPage)
         self.horizontalLayout.addWidget(self.nextPageButton)
+
+        # Continuous Scroll Toggle
+        self.scrollModeButton = QtWidgets.QPushButton("\u221e", parent=self.controlsFrame)
+        self.scrollModeButton.setMaximumSize(QtCore.QSize(40, 40))
+        self.scrollModeButton.setCheckable(True)
+        self.scrollModeButton.setToolTip("Scroll through all students instead of paging")
+        self.scrollModeButton.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
+        self.scrollModeButton.toggled.connect(self.toggleScrollMode)
+        self.horizontalLayout.addWidget(self.scrollModeButton)
         
         self.horizontalLayout.setStretch(0, 1)
         self.horizontalLayout.setStretch(1, 1)
@@ -561,6 +620,8 @@ class StudentsPage(QtWidgets.QWidget):
         self.searchBarLineEdit.setPlaceholderText(_translate("mainWindow", "Search Student"))
         self.studentLabel.setText(_translate("mainWindow", "Students"))
         self.addStudentButton.setText(_translate("mainWindow", "Add Student"))
+        self.importStudentsButton.setText(_translate("mainWindow", "Import CSV"))
+        self.exportStudentsButton.setText(_translate("mainWindow", "Export"))
         self.searchButton.setText(_translate("mainWindow", "Search"))
         self.searchByComboBox.setToolTip(_translate("mainWindow", "Search by"))
         self.searchByComboBox.setPlaceholderText(_translate("mainWindow", "Search by"))
@@ -593,6 +654,50 @@ class StudentsPage(QtWidgets.QWidget):
         self.addDialog.studentAddedWindowSignal.connect(self.displayMessageToStatusBar)
         self.addDialog.exec()
 
+    def openImportDialog(self):
+        filePath, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Import Students", "", "CSV Files (*.csv)")
+        if not filePath:
+            return
+
+        self.importDialog = TransferProgressDialog(self, "Import Students", f"Importing {os.path.basename(filePath)}...", importStudentsCsv, filePath)
+        self.importDialog.transferFinishedSignal.connect(self.handleImportFinished)
+        self.importDialog.transferFailedSignal.connect(self.handleImportFailed)
+        self.importDialog.start()
+
+    def handleImportFinished(self, summary):
+        message = f"Imported {summary['imported']:,} students."
+        if summary["rejected"]:
+            message += f" {summary['rejected']:,} rejected rows written to {summary['rejectsPath']}."
+        if summary["cancelled"]:
+            message = f"Import cancelled. {message}"
+
+        self.displayMessageToStatusBar(message, 8000)
+        self.studentTable.refreshDisplayStudents()
+
+    def handleImportFailed(self, message):
+        self.displayMessageToStatusBar(f"Import failed: {message}", 5000)
+
+    # Exports everything matching the current search in the current sort order, not just the page on display
+    def openExportDialog(self):
+        filePath, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Export Students", "students.csv", "CSV Files (*.csv);;JSON Lines (*.jsonl)")
+        if not filePath:
+            return
+
+        self.exportDialog = TransferProgressDialog(self, "Export Students", f"Exporting to {os.path.basename(filePath)}...", exportStudents, filePath, **self.studentTable.exportParameters())
+        self.exportDialog.transferFinishedSignal.connect(self.handleExportFinished)
+        self.exportDialog.transferFailedSignal.connect(self.handleExportFailed)
+        self.exportDialog.start()
+
+    def handleExportFinished(self, summary):
+        if summary["cancelled"]:
+            self.displayMessageToStatusBar("Export cancelled.", 5000)
+            return
+
+        self.displayMessageToStatusBar(f"Exported {summary['rowsWritten']:,} students to {summary['filePath']}.", 8000)
+
+    def handleExportFailed(self, message):
+        self.displayMessageToStatusBar(f"Export failed: {message}", 5000)
+
     def keyPressEvent(self, event):
         if self.searchBarLineEdit.hasFocus():
             if event.key() == Qt.Key.Key_Return:
@@ -600,13 +705,21 @@ class StudentsPage(QtWidgets.QWidget):
 
     def handleRefresh(self):
         self.searchBarLineEdit.clear()
+        self.searchTimer.stop()
         self.page = 1
         self.pageLabel.setText(str(self.page))
         self.studentTable.refreshDisplayStudents()
         self.refreshButton.setVisible(False)
         self.isSearchActive = False
 
+    def handleSearchTextChanged(self):
+        # Whatever is still loading was asked for with the old text
+        self.studentTable.pageQuery.cancel()
+        self.searchTimer.start()
+
     def searchStudents(self):
+        self.searchTimer.stop()
+
         if self.searchBarLineEdit.text().strip():
             self.displayMessageToStatusBar("Searching...", 3000)
             self.refreshButton.setVisible(True)
@@ -616,22 +729,32 @@ class StudentsPage(QtWidgets.QWidget):
         else:
             self.refreshButton.setVisible(False)
             
-        self.studentTable.refreshDisplayStudents()
+        self.studentTable.searchDisplayStudents()
 
     def prevPage(self):
         if self.page > 1:
             self.page -= 1
             self.pageLabel.setText(str(self.page))
-            self.studentTable.refreshDisplayStudents()
+            self.studentTable.seekDisplayStudents("prev")
             self.studentTable.verticalScrollBar().setValue(0)
     
     def nextPage(self):
         if self.page < self.lastPage:
             self.page += 1
             self.pageLabel.setText(str(self.page))
-            self.studentTable.refreshDisplayStudents()
+            self.studentTable.seekDisplayStudents("next")
             self.studentTable.verticalScrollBar().setValue(0)
     
+    # The pager has nothing to do while the table loads more students as it scrolls
+    def toggleScrollMode(self, enabled):
+        for widget in (self.prevPageButton, self.nextPageButton, self.pageLabel, self.lastPageInfo):
+            widget.setVisible(not enabled)
+
+        self.page = 1
+        self.pageLabel.setText(str(self.page))
+        self.studentTable.setScrollMode(enabled)
+
+    # Jumping straight to a typed page number is the only path that still pages by OFFSET
     def handlePageChange(self):
         self.page = int(self.pageLabel.text())
         self.studentTable.refreshDisplayStudents()